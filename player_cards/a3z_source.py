@@ -9,6 +9,8 @@ import sys
 from pathlib import Path
 from typing import Any
 
+from .timing import timed
+
 DEFAULT_A3Z_SEASON = "2025-26"
 
 CONTEXT_ALIASES: dict[str, list[str]] = {
@@ -136,6 +138,7 @@ def _pick_metrics(profile: dict[str, Any], limit: int = 8) -> list[dict[str, Any
     return out
 
 
+@timed("a3z")
 def fetch_a3z_profile(
     player_name: str,
     team: str,
@@ -2,16 +2,32 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
+import os
+import threading
+import time
+from datetime import date
 from pathlib import Path
+from typing import Any
 
+import httpx
+
+from .disk_cache import cache_path, load_json, save_json
 from .instat_pbp_fetch import team_pbp_dir, try_fast_pbp_cache
 from .leagues import LEAGUES, instat_season_id, team_full_name
-from .pbp_team_cache import warm_team_pbp
-from .qoc_qot import compute_league_context
 
 logger = logging.getLogger(__name__)
 
+NHL_API = "https://api-web.nhle.com/v1"
+_REQUEST_COUNTS_PATH = cache_path("warm", "request_counts.json")
+# Weight of "plays today" relative to one recorded request.
+_TODAY_BONUS = 50.0
+_COUNT_HALF_LIFE = 7 * 86_400
+# Request counts are written by the warm thread at most this often.
+_SAVE_INTERVAL = 30.0
+
 
 def warm_team(team: str, *, league: str = "nhl", season: str | None = None) -> bool:
     """Load PBP + league QOC context for one team if CSVs exist on disk."""
@@ -29,6 +45,9 @@ def warm_team(team: str, *, league: str = "nhl", season: str | None = None) -> b
     files = [Path(p) for p in fast.get("files", [])]
     if not files:
         return False
+    from .pbp_team_cache import warm_team_pbp
+    from .qoc_qot import compute_league_context
+
     warm_team_pbp(files)
     compute_league_context(files, team_full_name(league, tri))
     logger.info("API warm complete for %s/%s (%s games)", league, tri, len(files))
@@ -36,7 +55,10 @@ def warm_team(team: str, *, league: str = "nhl", season: str | None = None) -> b
 
 
 def warm_all_cached_teams(*, season: str | None = None) -> int:
-    """Warm every team that already has Desktop PBP cache (NHL + PWHL)."""
+    """Warm every team that already has Desktop PBP cache (NHL + PWHL).
+
+    Blocking; the API uses :class:`WarmScheduler` instead.
+    """
     warmed = 0
     for league_key, cfg in LEAGUES.items():
         for tri in cfg.teams:
@@ -47,3 +69,236 @@ def warm_all_cached_teams(*, season: str | None = None) -> int:
                 logger.warning("Warm failed for %s/%s: %s", league_key, tri, exc)
     logger.info("API warmed %s teams with cached PBP", warmed)
     return warmed
+
+
+def _todays_nhl_teams(day: date | None = None) -> set[str]:
+    """Tri-codes with an NHL game today; empty on any API failure."""
+    day = day or date.today()
+    try:
+        resp = httpx.get(
+            f"{NHL_API}/schedule/{day.isoformat()}",
+            timeout=10.0,
+            headers={"User-Agent": "PlayerCards/1.0"},
+        )
+        resp.raise_for_status()
+        data = resp.json()
+    except Exception as exc:
+        logger.debug("Schedule lookup failed: %s", exc)
+        return set()
+    teams: set[str] = set()
+    for week in data.get("gameWeek") or []:
+        if week.get("date") != day.isoformat():
+            continue
+        for game in week.get("games") or []:
+            for side in ("awayTeam", "homeTeam"):
+                abbrev = (game.get(side) or {}).get("abbrev")
+                if abbrev:
+                    teams.add(str(abbrev).upper())
+    return teams
+
+
+class WarmScheduler:
+    """Warm teams in priority order on a background thread.
+
+    Priority is recent request frequency (persisted across restarts) plus a
+    bonus for teams playing today. ``promote`` moves a team to the front of the
+    queue so requests for not-yet-warm teams are served next; teams that had no
+    cached PBP are retried, since a live build may have fetched it since.
+
+    ``start`` only spawns the thread: the schedule lookup, initial queue and
+    request-count persistence all happen on it, off the request path.
+    """
+
+    def __init__(self, *, season: str | None = None) -> None:
+        self.season = season
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._heap: list[tuple[float, int, str, str]] = []
+        self._seq = itertools.count()
+        self._queued: dict[tuple[str, str], int] = {}
+        self._state: dict[tuple[str, str], str] = {}
+        self._counts: dict[str, float] = {}
+        self._counts_saved_at = 0.0
+        self._counts_dirty = False
+        self._thread: threading.Thread | None = None
+        self._started_at: float | None = None
+        self._finished_at: float | None = None
+        self._current: tuple[str, str] | None = None
+
+    @staticmethod
+    def _key(league: str, team: str) -> tuple[str, str]:
+        return (league or "nhl").lower(), team.upper()
+
+    def _push(self, key: tuple[str, str], priority: float) -> None:
+        seq = next(self._seq)
+        self._queued[key] = seq
+        heapq.heappush(self._heap, (priority, seq, *key))
+
+    def _load_counts(self) -> dict[str, float]:
+        raw = load_json(_REQUEST_COUNTS_PATH)
+        if not isinstance(raw, dict) or not isinstance(raw.get("counts"), dict):
+            return {}
+        # Exponential decay so "recent" frequency wins over last month's traffic.
+        age = max(0.0, time.time() - float(raw.get("saved_at") or 0))
+        decay = 0.5 ** (age / _COUNT_HALF_LIFE)
+        return {str(k): float(v) * decay for k, v in raw["counts"].items()}
+
+    def _save_counts(self) -> None:
+        """Persist request counts (throttled); runs on the warm thread only."""
+        now = time.time()
+        with self._lock:
+            if not self._counts_dirty or now - self._counts_saved_at < _SAVE_INTERVAL:
+                return
+            self._counts_saved_at = now
+            self._counts_dirty = False
+            payload = {"saved_at": now, "counts": dict(self._counts)}
+        try:
+            save_json(_REQUEST_COUNTS_PATH, payload)
+        except OSError as exc:
+            logger.debug("Could not persist warm request counts: %s", exc)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name="player-cards-warm", daemon=True)
+        self._thread.start()
+
+    def _seed(self) -> None:
+        """Queue every team by recorded demand plus today's NHL schedule."""
+        saved = self._load_counts()
+        today = _todays_nhl_teams()
+        with self._lock:
+            for name, count in saved.items():
+                self._counts[name] = self._counts.get(name, 0.0) + count
+            for league_key, cfg in LEAGUES.items():
+                for tri in cfg.teams:
+                    key = self._key(league_key, tri)
+                    if key in self._queued or self._state.get(key) not in (None, "queued"):
+                        continue  # already promoted by a request
+                    score = self._counts.get(f"{key[0]}/{key[1]}", 0.0)
+                    if league_key == "nhl" and tri in today:
+                        score += _TODAY_BONUS
+                    self._state[key] = "queued"
+                    self._push(key, -score)
+            self._finished_at = None
+            queued = len(self._queued)
+        logger.info("Warm scheduler started (%s teams, %s playing today)", queued, len(today))
+
+    def record_request(self, team: str | None, *, league: str = "nhl") -> None:
+        """Count a request for ``team`` and promote it if it is not warm yet.
+
+        Cheap enough for the event loop: counts are saved by the warm thread.
+        """
+        if not team or self._thread is None:
+            return
+        key = self._key(league, team)
+        with self._lock:
+            name = f"{key[0]}/{key[1]}"
+            self._counts[name] = self._counts.get(name, 0.0) + 1.0
+            self._counts_dirty = True
+        self.promote(team, league=league)
+
+    def promote(self, team: str, *, league: str = "nhl") -> None:
+        key = self._key(league, team)
+        with self._lock:
+            if self._thread is None:
+                return  # warming disabled or not started
+            if self._state.get(key) not in (None, "queued", "no_cache"):
+                return
+            if key[0] not in LEAGUES or key[1] not in LEAGUES[key[0]].teams:
+                return
+            self._state[key] = "queued"
+            self._push(key, float("-inf"))
+            self._finished_at = None
+            self._wake.notify()
+
+    def _next(self) -> tuple[str, str] | None:
+        with self._lock:
+            while self._heap:
+                _prio, seq, league_key, tri = heapq.heappop(self._heap)
+                key = (league_key, tri)
+                if self._queued.get(key) != seq:
+                    continue  # superseded by a promotion
+                del self._queued[key]
+                self._state[key] = "warming"
+                self._current = key
+                return key
+            self._current = None
+            return None
+
+    def _run(self) -> None:
+        try:
+            self._seed()
+        except Exception as exc:
+            logger.warning("Warm scheduler seeding failed: %s", exc)
+        while True:
+            self._save_counts()
+            key = self._next()
+            if key is None:
+                with self._lock:
+                    if self._queued:
+                        continue  # promoted between _next and here
+                    if self._finished_at is None:
+                        self._finished_at = time.time()
+                        logger.info("Warm scheduler idle after %.1fs", self._finished_at - (self._started_at or 0))
+                    self._wake.wait(_SAVE_INTERVAL if self._counts_dirty else None)
+                continue
+            league_key, tri = key
+            try:
+                ok = warm_team(tri, league=league_key, season=self.season or LEAGUES[league_key].default_season)
+                state = "warm" if ok else "no_cache"
+            except Exception as exc:
+                logger.warning("Warm failed for %s/%s: %s", league_key, tri, exc)
+                state = "failed"
+            with self._lock:
+                self._state[key] = state
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            states = dict(self._state)
+            current = self._current
+            queue = sorted(
+                (prio, seq, lg, tri)
+                for prio, seq, lg, tri in self._heap
+                if self._queued.get((lg, tri)) == seq
+            )
+        totals: dict[str, int] = {}
+        for state in states.values():
+            totals[state] = totals.get(state, 0) + 1
+        done = sum(n for s, n in totals.items() if s not in ("queued", "warming"))
+        return {
+            "running": self._thread is not None,
+            "started_at": self._started_at,
+            "finished_at": self._finished_at,
+            "teams": len(states),
+            "done": done,
+            "progress_pct": round(100.0 * done / len(states), 1) if states else 0.0,
+            "states": totals,
+            "current": f"{current[0]}/{current[1]}" if current else None,
+            "next": [f"{lg}/{tri}" for _p, _s, lg, tri in queue[:10]],
+        }
+
+    def is_warm(self, team: str, *, league: str = "nhl") -> bool:
+        with self._lock:
+            return self._state.get(self._key(league, team)) == "warm"
+
+
+_scheduler: WarmScheduler | None = None
+
+
+def get_scheduler() -> WarmScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = WarmScheduler()
+    return _scheduler
+
+
+def start_background_warm() -> WarmScheduler | None:
+    """Start the shared scheduler unless ``PLAYER_CARDS_WARM=0``."""
+    if os.getenv("PLAYER_CARDS_WARM", "1").lower() in ("0", "false", "no"):
+        return None
+    scheduler = get_scheduler()
+    scheduler.start()
+    return scheduler
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import hashlib
 import json
 import logging
 import os
@@ -15,8 +16,8 @@ from typing import Any
 import httpx
 
 from .a3z_source import resolve_a3z_season
-from .card_store import DEFAULT_STORE_PATH, open_store
-from .disk_cache import pbp_files_fingerprint
+from .card_store import DEFAULT_STORE_PATH, metric_populations, open_store
+from .disk_cache import cache_path, pbp_files_fingerprint
 from .html_renderer import prewarm_photo
 from .instat_pbp_fetch import (
     batch_download_team_pbp,
@@ -25,18 +26,24 @@ from .instat_pbp_fetch import (
     try_fast_pbp_cache,
 )
 from .leagues import LEAGUES, get_league, instat_season_id, list_teams, team_full_name
-from .pbp_display import _pbp_values, compute_team_metric_percentiles
+from .pbp_display import _pbp_values
 from .pbp_metrics import aggregate_player_pbp
+from .pbp_shared_store import prune_store
 from .pbp_team_cache import warm_team_pbp
 from .profile import build_player_card_profile
 from .pwhl_bio import roster_from_pbp
 from .qoc_qot import compute_league_context
+from .timing import collect, log_timings, span
 
 logger = logging.getLogger(__name__)
 
 NHL_API = "https://api-web.nhle.com/v1"
 ROSTER_SEASON = "20252026"
 
+# Incremental builds still refresh every profile at least this often so bio,
+# photo and EliteProspects data never drift further than the EP cache TTL.
+INCREMENTAL_MAX_AGE = 7 * 86_400
+
 
 def _cache_skips_download(cached: dict[str, Any] | None, *, refresh: bool) -> bool:
     """Only skip InStat downloads when the on-disk season cache is complete."""
@@ -68,6 +75,7 @@ def fetch_nhl_roster(team: str) -> list[dict[str, Any]]:
                     "name": name,
                     "team": tri,
                     "league": "nhl",
+                    "bio_stamp": hashlib.sha1(json.dumps(p, sort_keys=True).encode()).hexdigest()[:16],
                 }
             )
     return players
@@ -80,14 +88,80 @@ def fetch_roster(league: str, team: str, pbp_files: list[Path]) -> list[dict[str
     return roster_from_pbp(pbp_files, team, league=league)
 
 
-def _team_pbp_percentiles(
+def _roster_key(entry: dict[str, Any]) -> str:
+    return str(entry.get("player_id") or entry["name"])
+
+
+def roster_hash(roster: list[dict[str, Any]]) -> str:
+    keys = sorted(_roster_key(e) for e in roster)
+    return hashlib.sha1("|".join(keys).encode()).hexdigest()[:16]
+
+
+def _upstream_cache_stamp(entry: dict[str, Any]) -> str:
+    """Cap cache mtime (NHL) plus the roster's bio stamp.
+
+    The cap file changes whenever the server refetches it. Bios have no disk
+    cache; ``bio_stamp`` hashes the bio fields the NHL roster returns, and
+    rosters without one (PBP-derived PWHL) rely on ``max_age`` for bio changes.
+    """
+    stamp = ""
+    if entry.get("league") == "nhl" and entry.get("player_id"):
+        path = cache_path("cap", f"{entry['player_id']}.json")
+        stamp = f"{path.stat().st_mtime:.0f}" if path.is_file() else ""
+    return f"{stamp},{entry.get('bio_stamp') or ''}"
+
+
+def player_input_fingerprint(entry: dict[str, Any], pbp_fingerprint: str | None) -> str:
+    payload = "|".join(
+        (
+            str(pbp_fingerprint or ""),
+            str(entry.get("team") or ""),
+            str(entry.get("name") or ""),
+            _upstream_cache_stamp(entry),
+        )
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+def _dirty_players(
+    store,
+    roster: list[dict[str, Any]],
+    *,
+    league: str,
+    team: str,
+    season: str,
+    pbp_fingerprint: str | None,
+    max_age: float,
+) -> list[dict[str, Any]]:
+    """Roster entries whose inputs changed (or aged out) since the last build."""
+    previous = store.player_inputs(team, season, league=league)
+    now = time.time()
+    dirty: list[dict[str, Any]] = []
+    for entry in roster:
+        prev = previous.get(_roster_key(entry))
+        if (
+            prev is None
+            or prev["input_fingerprint"] != player_input_fingerprint(entry, pbp_fingerprint)
+            or now - prev["built_at"] > max_age
+        ):
+            dirty.append(entry)
+    return dirty
+
+
+def _current_player_count(store, roster: list[dict[str, Any]], team: str, season: str, *, league: str) -> int:
+    """Built players still on the roster (departed players keep their stored profiles)."""
+    built = store.player_inputs(team, season, league=league)
+    return sum(1 for entry in roster if _roster_key(entry) in built)
+
+
+def _team_pbp_metrics(
     roster: list[dict[str, Any]],
     pbp_files: list[Path],
     team: str,
     *,
     league: str,
     team_games: int | None,
-) -> dict[str, dict[str, float | None]]:
+) -> dict[str, dict[str, float]]:
     metrics: dict[str, dict[str, float]] = {}
     for entry in roster:
         name = entry["name"]
@@ -96,7 +170,7 @@ def _team_pbp_percentiles(
             continue
         vals = _pbp_values(pbp.get("per_game") or {})
         metrics[name] = {k: v for k, v in vals.items() if not str(k).startswith("_")}
-    return compute_team_metric_percentiles(metrics)
+    return metrics
 
 
 def build_team(
@@ -109,6 +183,8 @@ def build_team(
     skip_pbp_download: bool = False,
     refresh_pbp: bool = False,
     players_only: bool = False,
+    incremental: bool = False,
+    max_age: float = INCREMENTAL_MAX_AGE,
 ) -> dict[str, Any]:
     cfg = get_league(league)
     tri = team.upper()
@@ -142,58 +218,106 @@ def build_team(
         )
         pbp_files = [Path(p) for p in pbp_meta.get("files", [])]
 
-    if pbp_files:
-        warm_team_pbp(pbp_files)
-        team_full = team_full_name(league, tri)
-        logger.info("Precomputing league QOC/QOT for %s/%s (%s games)", league, tri, len(pbp_files))
-        compute_league_context(pbp_files, team_full)
-
     fingerprint = pbp_files_fingerprint(pbp_files) if pbp_files else None
     match_ids = pbp_meta.get("match_ids") or []
     team_game_count = len(match_ids) if pbp_meta.get("complete") and match_ids else None
     roster = fetch_roster(league, tri, pbp_files)
-    logger.info("Building %s %s — %s players", league, tri, len(roster))
-
-    pct_by_player: dict[str, dict[str, float | None]] = {}
-    if not cfg.uses_a3z and pbp_files:
-        pct_by_player = _team_pbp_percentiles(roster, pbp_files, tri, league=league, team_games=team_game_count)
-
-    built = 0
-    skipped = 0
-    skip_reasons: list[str] = []
-    for entry in roster:
-        name = entry["name"]
-        try:
-            profile = build_player_card_profile(
-                name,
-                team=tri,
+    current_roster_hash = roster_hash(roster)
+
+    to_build = roster
+    if incremental:
+        prev = store.get_team_build(tri, season, league=league) or {}
+        roster_changed = prev.get("roster_hash") != current_roster_hash
+        if not cfg.uses_a3z and roster_changed:
+            # Team-relative PBP percentiles shift whenever membership changes.
+            to_build = roster
+        else:
+            to_build = _dirty_players(
+                store,
+                roster,
                 league=league,
-                a3z_season=season,
-                instat_season_id=instat_sid,
-                pbp_dir=pbp_dir,
-                refresh_pbp=refresh_pbp,
-                use_store=False,
-                pbp_percentiles=pct_by_player.get(name),
+                team=tri,
+                season=season,
+                pbp_fingerprint=fingerprint,
+                max_age=max_age,
+            )
+        if not to_build and not roster_changed and prev.get("pbp_fingerprint") == fingerprint:
+            logger.info("%s/%s unchanged — skipping", league, tri)
+            return {
+                "league": league,
+                "team": tri,
+                "season": season,
+                "built": 0,
+                "skipped": 0,
+                "unchanged": True,
+                "roster": len(roster),
+                "pbp_games": len(pbp_files),
+                "seconds": round(time.perf_counter() - t0, 1),
+            }
+
+    with collect(f"{league}/{tri}") as timings:
+        if pbp_files and to_build:
+            with span("pbp_warm"):
+                warm_team_pbp(pbp_files)
+            team_full = team_full_name(league, tri)
+            logger.info("Precomputing league QOC/QOT for %s/%s (%s games)", league, tri, len(pbp_files))
+            with span("league_context"):
+                compute_league_context(pbp_files, team_full)
+
+        logger.info("Building %s %s — %s/%s players", league, tri, len(to_build), len(roster))
+
+        pct_by_player: dict[str, dict[str, float | None]] = {}
+        if not cfg.uses_a3z and pbp_files and to_build:
+            metrics = _team_pbp_metrics(roster, pbp_files, tri, league=league, team_games=team_game_count)
+            # Persist the sorted team populations so live card builds rank by bisection.
+            index = store.replace_percentiles(
+                league, season, f"team:{tri}", metric_populations(metrics), pbp_fingerprint=fingerprint
             )
-            if os.environ.get("SKIP_PHOTO_PREWARM", "").lower() not in ("1", "true", "yes"):
-                url = (profile.get("bio") or {}).get("card_photo_url")
-                if url:
-                    prewarm_photo(url)
-            store.upsert_profile(profile, season=season, pbp_fingerprint=fingerprint)
-            built += 1
-            logger.info("  [%s/%s] %s", built, len(roster), name)
-        except Exception as exc:
-            skipped += 1
-            skip_reasons.append(f"{name}: {exc}")
-            logger.warning("  skip %s: %s", name, exc)
-
-    if roster and skipped / len(roster) > 0.25:
+            pct_by_player = {name: index.ranks(vals) for name, vals in metrics.items()}
+
+        built = 0
+        skipped = 0
+        skip_reasons: list[str] = []
+        for entry in to_build:
+            name = entry["name"]
+            try:
+                profile = build_player_card_profile(
+                    name,
+                    team=tri,
+                    league=league,
+                    a3z_season=season,
+                    instat_season_id=instat_sid,
+                    pbp_dir=pbp_dir,
+                    refresh_pbp=refresh_pbp,
+                    use_store=False,
+                    pbp_percentiles=pct_by_player.get(name),
+                )
+                if os.environ.get("SKIP_PHOTO_PREWARM", "").lower() not in ("1", "true", "yes"):
+                    url = (profile.get("bio") or {}).get("card_photo_url")
+                    if url:
+                        prewarm_photo(url)
+                store.upsert_profile(profile, season=season, pbp_fingerprint=fingerprint)
+                store.set_player_input(
+                    tri,
+                    season,
+                    _roster_key(entry),
+                    player_input_fingerprint(entry, fingerprint),
+                    league=league,
+                )
+                built += 1
+                logger.info("  [%s/%s] %s", built, len(to_build), name)
+            except Exception as exc:
+                skipped += 1
+                skip_reasons.append(f"{name}: {exc}")
+                logger.warning("  skip %s: %s", name, exc)
+
+    if to_build and skipped / len(to_build) > 0.25:
         logger.error(
             "High skip rate for %s/%s: %s/%s players (%s)",
             league,
             tri,
             skipped,
-            len(roster),
+            len(to_build),
             "; ".join(skip_reasons[:5]),
         )
 
@@ -204,8 +328,10 @@ def build_team(
         pbp_fingerprint=fingerprint,
         pbp_dir=str(pbp_dir),
         match_count=team_game_count or len(pbp_files),
-        player_count=built,
+        player_count=_current_player_count(store, roster, tri, season, league=league) if incremental else built,
+        roster_hash=current_roster_hash,
     )
+    log_timings(timings, built=built, skipped=skipped)
 
     return {
         "league": league,
@@ -216,6 +342,7 @@ def build_team(
         "roster": len(roster),
         "pbp_games": len(pbp_files),
         "seconds": round(time.perf_counter() - t0, 1),
+        "stages_ms": timings.as_dict()["stages_ms"],
     }
 
 
@@ -229,6 +356,8 @@ def build_store(
     skip_pbp_download: bool = False,
     refresh_pbp: bool = False,
     players_only: bool = False,
+    incremental: bool = False,
+    max_age: float = INCREMENTAL_MAX_AGE,
 ) -> dict[str, Any]:
     league_keys = [lk.lower() for lk in (leagues or ["nhl"])]
     results: list[dict[str, Any]] = []
@@ -321,6 +450,8 @@ def build_store(
                     skip_pbp_download=use_skip,
                     refresh_pbp=False,
                     players_only=players_only,
+                    incremental=incremental,
+                    max_age=max_age,
                 )
                 results.append(summary)
             except Exception as exc:
@@ -331,6 +462,11 @@ def build_store(
             season_tag = resolve_a3z_season(season or get_league(league_key).default_season, instat_season_id_override)
             total_players += store.count_players(season_tag, league=league_key)
 
+    # Shared-store entries for re-downloaded or deleted games are never read again.
+    pruned = prune_store()
+    if pruned:
+        logger.info("Pruned %s stale shared PBP entries", pruned)
+
     failed = [r for r in results if "error" in r]
     return {
         "store": str(store_path or DEFAULT_STORE_PATH),
@@ -339,6 +475,7 @@ def build_store(
         "seconds": round(time.perf_counter() - t0, 1),
         "results": results,
         "failed_teams": [(r["league"], r["team"], r["error"]) for r in failed],
+        "unchanged_teams": [(r["league"], r["team"]) for r in results if r.get("unchanged")],
     }
 
 
@@ -360,6 +497,17 @@ def main(argv: list[str] | None = None) -> None:
     parser.add_argument("--skip-pbp-download", action="store_true")
     parser.add_argument("--refresh-pbp", action="store_true")
     parser.add_argument("--players-only", action="store_true")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rebuild teams/players whose PBP, roster, bio or cap inputs changed",
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=INCREMENTAL_MAX_AGE / 86_400,
+        help="With --incremental, still rebuild profiles older than this",
+    )
     parser.add_argument("-v", "--verbose", action="store_true")
     args = parser.parse_args(argv)
 
@@ -384,6 +532,8 @@ def main(argv: list[str] | None = None) -> None:
         skip_pbp_download=args.skip_pbp_download,
         refresh_pbp=args.refresh_pbp,
         players_only=args.players_only,
+        incremental=args.incremental,
+        max_age=args.max_age_days * 86_400,
     )
     print(json.dumps(summary, indent=2))
 
@@ -12,6 +12,7 @@ import httpx
 
 from .disk_cache import cache_path, load_json, save_json
 from .nhl_bio import _first_name_matches
+from .timing import timed
 
 logger = logging.getLogger(__name__)
 
@@ -169,6 +170,7 @@ def _normalize_cap(page_props: dict[str, Any], *, player_id: int | None) -> dict
     }
 
 
+@timed("cap")
 def fetch_cap_info(player_name: str, player_id: int | None = None) -> dict[str, Any] | None:
     """Return current contract / cap summary for a player."""
     if player_id:
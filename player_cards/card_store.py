@@ -7,11 +7,15 @@ import os
 import sqlite3
 import time
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from .a3z_source import resolve_a3z_season
 from .disk_cache import CACHE_ROOT
 from .nhl_bio import _first_name_matches, _norm
+from .timing import timed
+
+if TYPE_CHECKING:
+    from .percentile_index import PercentileIndex
 
 
 def _name_match_score(query_norm: str, stored_norm: str) -> int:
@@ -37,6 +41,17 @@ def _name_match_score(query_norm: str, stored_norm: str) -> int:
         return 40
     return 0
 
+
+def metric_populations(player_metrics: dict[str, dict[str, float]]) -> dict[str, list[float]]:
+    """Per-metric value lists from player → metric → value (players missing a metric are left out)."""
+    pops: dict[str, list[float]] = {}
+    for metrics in player_metrics.values():
+        for key, val in metrics.items():
+            if val is not None:
+                pops.setdefault(key, []).append(float(val))
+    return pops
+
+
 DEFAULT_STORE_PATH = Path(
     os.getenv("PLAYER_CARDS_STORE", str(CACHE_ROOT / "card_store.db"))
 )
@@ -55,10 +70,21 @@ CREATE TABLE IF NOT EXISTS team_builds (
     pbp_dir TEXT,
     match_count INTEGER,
     player_count INTEGER DEFAULT 0,
+    roster_hash TEXT,
     built_at REAL,
     PRIMARY KEY (league, team, season)
 );
 
+CREATE TABLE IF NOT EXISTS player_inputs (
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    team TEXT NOT NULL,
+    roster_key TEXT NOT NULL,
+    input_fingerprint TEXT NOT NULL,
+    built_at REAL NOT NULL,
+    PRIMARY KEY (league, season, team, roster_key)
+);
+
 CREATE TABLE IF NOT EXISTS player_profiles (
     league TEXT NOT NULL DEFAULT 'nhl',
     player_id INTEGER NOT NULL,
@@ -72,6 +98,18 @@ CREATE TABLE IF NOT EXISTS player_profiles (
     PRIMARY KEY (league, player_id, season)
 );
 
+CREATE TABLE IF NOT EXISTS percentiles (
+    league TEXT NOT NULL,
+    season TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    position_group TEXT NOT NULL DEFAULT 'all',
+    metric TEXT NOT NULL,
+    pbp_fingerprint TEXT,
+    values_json TEXT NOT NULL,
+    built_at REAL NOT NULL,
+    PRIMARY KEY (league, season, scope, position_group, metric)
+);
+
 CREATE INDEX IF NOT EXISTS idx_player_profiles_name ON player_profiles(league, name_norm);
 CREATE INDEX IF NOT EXISTS idx_player_profiles_team_season ON player_profiles(league, team, season);
 """
@@ -94,6 +132,9 @@ class CardStore:
                 self._conn.execute(
                     f"ALTER TABLE {table} ADD COLUMN league TEXT NOT NULL DEFAULT 'nhl'"
                 )
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(team_builds)")}
+        if "roster_hash" not in cols:
+            self._conn.execute("ALTER TABLE team_builds ADD COLUMN roster_hash TEXT")
 
     def close(self) -> None:
         self._conn.close()
@@ -125,16 +166,19 @@ class CardStore:
         pbp_dir: str | None,
         match_count: int | None,
         player_count: int,
+        roster_hash: str | None = None,
     ) -> None:
         self._conn.execute(
             """
-            INSERT INTO team_builds(league, team, season, pbp_fingerprint, pbp_dir, match_count, player_count, built_at)
-            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO team_builds(
+                league, team, season, pbp_fingerprint, pbp_dir, match_count, player_count, roster_hash, built_at
+            ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(league, team, season) DO UPDATE SET
                 pbp_fingerprint = excluded.pbp_fingerprint,
                 pbp_dir = excluded.pbp_dir,
                 match_count = excluded.match_count,
                 player_count = excluded.player_count,
+                roster_hash = excluded.roster_hash,
                 built_at = excluded.built_at
             """,
             (
@@ -145,6 +189,7 @@ class CardStore:
                 pbp_dir,
                 match_count,
                 player_count,
+                roster_hash,
                 time.time(),
             ),
         )
@@ -157,6 +202,52 @@ class CardStore:
         ).fetchone()
         return str(row["pbp_fingerprint"]) if row and row["pbp_fingerprint"] else None
 
+    def get_team_build(self, team: str, season: str, *, league: str = "nhl") -> dict[str, Any] | None:
+        row = self._conn.execute(
+            "SELECT * FROM team_builds WHERE league = ? AND team = ? AND season = ?",
+            (league, team.upper(), season),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def player_inputs(self, team: str, season: str, *, league: str = "nhl") -> dict[str, dict[str, Any]]:
+        """Per-player input fingerprints from the last build, keyed by roster key."""
+        rows = self._conn.execute(
+            """
+            SELECT roster_key, input_fingerprint, built_at
+            FROM player_inputs
+            WHERE league = ? AND season = ? AND team = ?
+            """,
+            (league, season, team.upper()),
+        ).fetchall()
+        return {
+            str(row["roster_key"]): {
+                "input_fingerprint": str(row["input_fingerprint"]),
+                "built_at": float(row["built_at"]),
+            }
+            for row in rows
+        }
+
+    def set_player_input(
+        self,
+        team: str,
+        season: str,
+        roster_key: str,
+        input_fingerprint: str,
+        *,
+        league: str = "nhl",
+    ) -> None:
+        self._conn.execute(
+            """
+            INSERT INTO player_inputs(league, season, team, roster_key, input_fingerprint, built_at)
+            VALUES(?, ?, ?, ?, ?, ?)
+            ON CONFLICT(league, season, team, roster_key) DO UPDATE SET
+                input_fingerprint = excluded.input_fingerprint,
+                built_at = excluded.built_at
+            """,
+            (league, season, team.upper(), roster_key, input_fingerprint, time.time()),
+        )
+        self._conn.commit()
+
     def list_teams(self, season: str) -> list[sqlite3.Row]:
         return list(
             self._conn.execute(
@@ -284,6 +375,71 @@ class CardStore:
             ).fetchone()
         return int(row["n"]) if row else 0
 
+    def count_team_players(self, team: str, season: str, *, league: str = "nhl") -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS n FROM player_profiles WHERE league = ? AND season = ? AND team = ?",
+            (league, season, team.upper()),
+        ).fetchone()
+        return int(row["n"]) if row else 0
+
+    def replace_percentiles(
+        self,
+        league: str,
+        season: str,
+        scope: str,
+        populations: dict[str, list[float]],
+        *,
+        position_group: str = "all",
+        pbp_fingerprint: str | None = None,
+    ) -> PercentileIndex:
+        """Store sorted per-metric populations for one scope (``team:TOR``)."""
+        from .percentile_index import PercentileIndex
+
+        index = PercentileIndex(metrics=populations, pool_size=max((len(v) for v in populations.values()), default=0))
+        now = time.time()
+        self._conn.execute(
+            "DELETE FROM percentiles WHERE league = ? AND season = ? AND scope = ? AND position_group = ?",
+            (league, season, scope, position_group),
+        )
+        self._conn.executemany(
+            """
+            INSERT INTO percentiles(league, season, scope, position_group, metric, pbp_fingerprint, values_json, built_at)
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (league, season, scope, position_group, metric, pbp_fingerprint, json.dumps(pop.tolist()), now)
+                for metric, pop in index.metrics.items()
+            ],
+        )
+        self._conn.commit()
+        return index
+
+    def percentile_index(
+        self,
+        league: str,
+        season: str,
+        scope: str,
+        *,
+        position_group: str = "all",
+        pbp_fingerprint: str | None = None,
+    ) -> PercentileIndex | None:
+        """Stored populations for a scope; None when missing or built from other PBP files."""
+        rows = self._conn.execute(
+            """
+            SELECT metric, pbp_fingerprint, values_json FROM percentiles
+            WHERE league = ? AND season = ? AND scope = ? AND position_group = ?
+            """,
+            (league, season, scope, position_group),
+        ).fetchall()
+        if not rows:
+            return None
+        if pbp_fingerprint is not None and any(r["pbp_fingerprint"] != pbp_fingerprint for r in rows):
+            return None
+        from .percentile_index import PercentileIndex
+
+        pops = {str(r["metric"]): json.loads(str(r["values_json"])) for r in rows}
+        return PercentileIndex(metrics=pops, pool_size=max((len(v) for v in pops.values()), default=0))
+
     def find_profile(
         self,
         player_name: str,
@@ -343,6 +499,7 @@ def open_store(path: Path | str | None = None) -> CardStore:
     return CardStore(path)
 
 
+@timed("store_load")
 def load_stored_profile(
     player_name: str,
     *,
@@ -13,6 +13,13 @@ from typing import Any
 
 from .goalie_source import _build_summary, _fetch_team_goalie_rows
 from .leagues import NHL_INSTAT_TEAM_IDS
+from .percentile_index import (
+    PercentileIndex,
+    build_percentile_index,
+    metric_value,
+    percentile_index,
+    rows_fingerprint,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,13 +57,30 @@ async def fetch_league_goalie_rows(season_id: int = 36) -> list[dict[str, Any]]:
     return out
 
 
-def _percentile_rank(value: float, population: list[float]) -> float | None:
-    if value is None or not population:
-        return None
-    below = sum(1 for v in population if v < value)
-    tied = sum(1 for v in population if v == value)
-    # Standard "mean rank" percentile: ties split the credit.
-    return round((below + 0.5 * tied) / len(population), 3)
+GOALIE_PERCENTILE_METRICS: dict[str, tuple[str, ...]] = {
+    "sv_pct_overall": ("total", "sv_pct"),
+    "es_sv_pct": ("es", "sv_pct"),
+    "scoring_chance_sv_pct": ("total", "scoring_chance_sv_pct"),
+    "gsax": ("gsax",),
+}
+
+
+def goalie_percentile_index(
+    league_rows: list[dict[str, Any]],
+    *,
+    min_gp: int = 10,
+    league: str = "nhl",
+    season: str = "current",
+) -> PercentileIndex:
+    """Sorted league goalie populations, built once per season and population."""
+    pool = [r for r in league_rows if r.get("games_played", 0) >= min_gp]
+    return percentile_index(
+        f"goalies-gp{min_gp}",
+        season,
+        rows_fingerprint(pool),
+        lambda: build_percentile_index(pool, GOALIE_PERCENTILE_METRICS),
+        league=league,
+    )
 
 
 def compute_goalie_percentiles(
@@ -64,36 +88,14 @@ def compute_goalie_percentiles(
     league_rows: list[dict[str, Any]],
     *,
     min_gp: int = 10,
+    league: str = "nhl",
+    season: str = "current",
 ) -> dict[str, float | None]:
     """Percentile rank of `target` (a goalie_source summary dict) within
     `league_rows`, restricted to goalies with at least `min_gp` games played
     (so a 3-game call-up backup doesn't skew the population)."""
-    pool = [r for r in league_rows if r.get("games_played", 0) >= min_gp]
-
-    def pop(metric_path: tuple[str, ...]) -> list[float]:
-        vals = []
-        for r in pool:
-            v: Any = r
-            for key in metric_path:
-                v = (v or {}).get(key) if isinstance(v, dict) else None
-            if isinstance(v, (int, float)):
-                vals.append(float(v))
-        return vals
-
-    def val(metric_path: tuple[str, ...]) -> float | None:
-        v: Any = target
-        for key in metric_path:
-            v = (v or {}).get(key) if isinstance(v, dict) else None
-        return float(v) if isinstance(v, (int, float)) else None
-
-    metrics = {
-        "sv_pct_overall": ("total", "sv_pct"),
-        "es_sv_pct": ("es", "sv_pct"),
-        "scoring_chance_sv_pct": ("total", "scoring_chance_sv_pct"),
-        "gsax": ("gsax",),
-    }
-    percentiles: dict[str, float | None] = {"pool_size": len(pool)}
-    for label, path in metrics.items():
-        v = val(path)
-        percentiles[label] = _percentile_rank(v, pop(path)) if v is not None else None
+    index = goalie_percentile_index(league_rows, min_gp=min_gp, league=league, season=season)
+    percentiles: dict[str, float | None] = {"pool_size": index.pool_size}
+    for label, path in GOALIE_PERCENTILE_METRICS.items():
+        percentiles[label] = index.rank(label, metric_value(target, path))
     return percentiles
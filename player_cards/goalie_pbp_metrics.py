@@ -14,10 +14,12 @@ from pathlib import Path
 from typing import Any
 
 import httpx
+import numpy as np
 import pandas as pd
 
 from .instat_source import _match_player_name
 from .pbp_metrics import DZ_LIMIT, NET_X, NET_Y, NZ_LIMIT, _xg
+from .pbp_team_cache import select_team_frames
 
 HD_DIST = 15.0
 HD_XG = 0.08
@@ -32,12 +34,6 @@ ENTRY_SHOT_ACTIONS = frozenset({
 })
 
 
-def _sequence_neutral(action: str) -> bool:
-    a = str(action or "")
-    al = a.lower()
-    return any(h in al for h in SHIFT_OR_FACEOFF_HINTS)
-
-
 def _pct(num: float, den: float) -> float | None:
     if den <= 0:
         return None
@@ -110,63 +106,83 @@ def _attack_type(x: float, y: float, xg: float) -> str:
     return "Long Range"
 
 
-def _is_rush_shot(actions: list[str], teams: list[str], i: int) -> bool:
-    team_i = teams[i]
-    for j in range(i - 1, max(i - 6, -1), -1):
-        if _sequence_neutral(actions[j]):
-            continue
-        if teams[j] != team_i:
-            break
-        if actions[j] in RUSH_ENTRY_ACTIONS:
-            return True
-    return False
-
-
-def _is_cycle_shot(actions: list[str], teams: list[str], i: int) -> bool:
-    team_i = teams[i]
-    for j in range(i - 1, max(i - 6, -1), -1):
-        if _sequence_neutral(actions[j]):
-            continue
-        if teams[j] != team_i:
-            break
-        if actions[j] == CYCLE_ACTION:
-            return True
-    return False
-
-
-def _is_royal_road(actions: list[str], teams: list[str], pos_y: list[float], starts: list[float], i: int) -> bool:
-    """Same-team pass whose origin crosses the royal road (center-ice y=NET_Y)
-    within ~4s before this shot."""
-    team_i = teams[i]
-    cy = pos_y[i]
-    t_i = starts[i]
-    if cy is None or (isinstance(cy, float) and math.isnan(cy)):
-        return False
-    for j in range(i - 1, max(i - 8, -1), -1):
-        if teams[j] != team_i:
-            break
-        if _sequence_neutral(actions[j]) or actions[j] == "Shots":
-            continue
-        if actions[j] != "Passes":
-            continue
-        ly = pos_y[j]
-        if ly is None or (isinstance(ly, float) and math.isnan(ly)):
-            continue
-        t_j = starts[j]
-        if t_i is not None and t_j is not None and not math.isnan(t_i) and not math.isnan(t_j) and (t_i - t_j) > 4.0:
-            break
-        if (ly > NET_Y >= cy) or (ly < NET_Y <= cy):
-            return True
-    return False
-
-
-def _is_rebound_after(actions: list[str], teams: list[str], goalie_team: str, i: int) -> bool:
-    if actions[i] == "Goals":
-        return False
-    for j in range(i + 1, min(i + 9, len(actions))):
-        if teams[j] != goalie_team and actions[j] in SHOT_RESULT_ACTIONS:
-            return True
-    return False
+RUSH_LOOKBACK = 5
+ROYAL_ROAD_LOOKBACK = 7
+ROYAL_ROAD_WINDOW = 4.0
+REBOUND_LOOKAHEAD = 8
+
+
+def _lookback_hit(neutral: np.ndarray, same_team: Any, hit: np.ndarray, depth: int) -> np.ndarray:
+    """Per row: walking back up to ``depth`` rows, skipping neutral ones, does a
+    ``hit`` row come before the first row of another team?"""
+    n = len(hit)
+    found = np.zeros(n, dtype=bool)
+    alive = np.ones(n, dtype=bool)
+    for k in range(1, min(depth, n - 1) + 1):
+        j = np.arange(k, n)  # rows that have a row k back
+        i = j - k
+        live = alive[j] & ~neutral[i]
+        other = live & ~same_team(j, i)
+        alive[j[other]] = False
+        found[j[live & ~other & hit[i]]] = True
+        alive[j[live & ~other & hit[i]]] = False
+    return found
+
+
+def shot_context_flags(
+    actions: np.ndarray,
+    teams: np.ndarray,
+    pos_y: np.ndarray,
+    starts: np.ndarray,
+    goalie_team: str,
+) -> dict[str, np.ndarray]:
+    """Rush / cycle / royal-road / rebound-after flags for every row of one game.
+
+    Rows must be in play order. Rush and cycle look back up to five rows,
+    skipping shift/faceoff rows and stopping at a possession change. Royal
+    road needs a same-team pass crossing y=NET_Y within ~4s (seven rows).
+    Rebound-after is any opponent shot in the next eight rows, except on goals.
+    """
+    n = len(actions)
+    al = np.char.lower(actions.astype(str))
+    neutral = np.zeros(n, dtype=bool)
+    for hint in SHIFT_OR_FACEOFF_HINTS:
+        neutral |= np.char.find(al, hint) >= 0
+
+    def same_team(j: np.ndarray, i: np.ndarray) -> np.ndarray:
+        return teams[j] == teams[i]
+
+    rush = _lookback_hit(neutral, same_team, np.isin(actions, list(RUSH_ENTRY_ACTIONS)), RUSH_LOOKBACK)
+    cycle = _lookback_hit(neutral, same_team, actions == CYCLE_ACTION, RUSH_LOOKBACK)
+
+    # Royal road: team change stops the walk even on neutral rows; a pass
+    # more than the window before the shot stops it too.
+    royal = np.zeros(n, dtype=bool)
+    alive = ~np.isnan(pos_y)
+    skip = neutral | (actions == "Shots")
+    is_pass = (actions == "Passes") & ~np.isnan(pos_y)
+    for k in range(1, min(ROYAL_ROAD_LOOKBACK, n - 1) + 1):
+        j = np.arange(k, n)
+        i = j - k
+        live = alive[j]
+        stop = live & (teams[i] != teams[j])
+        alive[j[stop]] = False
+        cand = live & ~stop & ~skip[i] & is_pass[i]
+        with np.errstate(invalid="ignore"):
+            late = cand & ((starts[j] - starts[i]) > ROYAL_ROAD_WINDOW)
+        alive[j[late]] = False
+        cand &= ~late
+        cy, ly = pos_y[j], pos_y[i]
+        cross = cand & (((ly > NET_Y) & (NET_Y >= cy)) | ((ly < NET_Y) & (NET_Y <= cy)))
+        royal[j[cross]] = True
+        alive[j[cross]] = False
+
+    rebound = np.zeros(n, dtype=bool)
+    opp_shot = (teams != goalie_team) & np.isin(actions, list(SHOT_RESULT_ACTIONS))
+    for k in range(1, min(REBOUND_LOOKAHEAD, n - 1) + 1):
+        rebound[: n - k] |= opp_shot[k:]
+    rebound &= actions != "Goals"
+    return {"is_rush": rush, "is_cycle": cycle, "is_royal_road": royal, "is_rebound": rebound}
 
 
 def _style_of_play_estimate(is_rush: bool, dist: float, ang: float) -> str:
@@ -181,10 +197,32 @@ def _style_of_play_estimate(is_rush: bool, dist: float, ang: float) -> str:
     return "In Motion"
 
 
+def _counted_shot_rows(actions: np.ndarray, starts: np.ndarray, players: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Rows counted as shots on goal, and whether each row is a goal.
+
+    "Shots on goal" rows count; a "Goals" row counts only when no SOG row shares
+    its (start, player). A counted SOG row is a goal when a "Goals" row shares
+    its (start, player) — a goal's own SOG twin has action "Shots on goal".
+    Rows with no start never match another row.
+    """
+    sog = actions == "Shots on goal"
+    goal = actions == "Goals"
+    keyed = ~np.isnan(starts)
+    keys = pd.MultiIndex.from_arrays([starts, players])
+    sog_keys = keys[sog & keyed]
+    goal_keys = keys[goal & keyed]
+    goal_has_sog = keyed & np.asarray(keys.isin(sog_keys))
+    counted = sog | (goal & ~goal_has_sog)
+    is_goal = goal | (keyed & np.asarray(keys.isin(goal_keys)))
+    return counted, is_goal
+
+
 def build_goalie_shots(
     files: list[Path],
     team: str,
     goalie_name: str | None = None,
+    *,
+    all_files: list[Path] | None = None,
 ) -> list[dict[str, Any]]:
     """All opponent shot-on-goal events against this goalie's team across the given games.
 
@@ -194,61 +232,45 @@ def build_goalie_shots(
     share a (start, player) with one are counted, mirroring pwhl-analytics'
     shot_attempt_rows(). Bare "Shots" is a separate, broader action (includes missed/
     blocked attempts) and is excluded — SV% is saves ÷ shots *on goal*, by definition.
+
+    Frames come from ``pbp_team_cache``; pass the team's full file list as
+    ``all_files`` so a goalie subset reuses the team's warm frames.
     """
     shots: list[dict[str, Any]] = []
-    for path in files:
-        try:
-            df = pd.read_csv(path)
-        except Exception:
+    for path, df in select_team_frames(files, all_files or files):
+        if df.empty or "team" not in df.columns:
             continue
-        if df.empty or "action" not in df.columns:
+        actions = df["action"].astype(str).to_numpy()
+        teams_col = df["team"].astype(str).to_numpy()
+        players_col = (
+            df["player"].astype(str).to_numpy() if "player" in df.columns else np.full(len(df), "")
+        )
+        pos_x = df["pos_x"].to_numpy(dtype=float)
+        pos_y = df["pos_y"].to_numpy(dtype=float)
+        starts = (
+            pd.to_numeric(df["start"], errors="coerce").to_numpy(dtype=float)
+            if "start" in df.columns else np.full(len(df), np.nan)
+        )
+
+        counted, is_goal = _counted_shot_rows(actions, starts, players_col)
+        rows = np.flatnonzero(counted & (teams_col != team) & ~np.isnan(pos_x) & ~np.isnan(pos_y))
+        if not len(rows):
             continue
-        df = df.sort_values([c for c in ("half", "start") if c in df.columns]).reset_index(drop=True)
-        actions = df["action"].astype(str).tolist()
-        teams_col = df["team"].astype(str).tolist()
-        players_col = df["player"].astype(str).tolist() if "player" in df.columns else [""] * len(df)
-        pos_x = pd.to_numeric(df.get("pos_x"), errors="coerce").tolist()
-        pos_y = pd.to_numeric(df.get("pos_y"), errors="coerce").tolist()
-        starts = pd.to_numeric(df.get("start"), errors="coerce").tolist()
-
-        sog_keys = {
-            (starts[i], players_col[i])
-            for i, act in enumerate(actions)
-            if act == "Shots on goal"
-        }
-        # A goal's own "Shots on goal" twin has action == "Shots on goal", not
-        # "Goals" — so whether a *counted* row is a goal has to come from
-        # membership in goal_keys, not from that row's own action string.
-        goal_keys = {
-            (starts[i], players_col[i])
-            for i, act in enumerate(actions)
-            if act == "Goals"
-        }
+        flags = {k: v[rows] for k, v in shot_context_flags(actions, teams_col, pos_y, starts, team).items()}
 
-        for i, act in enumerate(actions):
-            if act == "Shots on goal":
-                pass
-            elif act == "Goals" and (starts[i], players_col[i]) not in sog_keys:
-                pass  # a goal not already represented by its own SOG row
-            else:
-                continue
-            if teams_col[i] == team:
-                continue  # this is our own team's shot, not a shot against
-            x, y = pos_x[i], pos_y[i]
-            if x is None or y is None or math.isnan(x) or math.isnan(y):
-                continue
+        for k, i in enumerate(rows):
+            x, y = float(pos_x[i]), float(pos_y[i])
             xg = round(_xg(x, y), 3)
-            is_goal = (starts[i], players_col[i]) in goal_keys
             dist = math.hypot(NET_X - x, abs(NET_Y - y))
             ang = math.atan2(abs(NET_Y - y), max(0.0, NET_X - x) + 1e-9)
-            is_rush = _is_rush_shot(actions, teams_col, i)
+            is_rush = bool(flags["is_rush"][k])
             shots.append({
-                "x": round(x, 2), "y": round(y, 2), "xg": xg, "is_goal": is_goal,
+                "x": round(x, 2), "y": round(y, 2), "xg": xg, "is_goal": bool(is_goal[i]),
                 "attack_type": _attack_type(x, y, xg),
                 "is_rush": is_rush,
-                "is_cycle": _is_cycle_shot(actions, teams_col, i),
-                "is_royal_road": _is_royal_road(actions, teams_col, pos_y, starts, i),
-                "is_rebound": _is_rebound_after(actions, teams_col, team, i),
+                "is_cycle": bool(flags["is_cycle"][k]),
+                "is_royal_road": bool(flags["is_royal_road"][k]),
+                "is_rebound": bool(flags["is_rebound"][k]),
                 "ice_side": "Left" if y < NET_Y else "Right",
                 "style_estimate": _style_of_play_estimate(is_rush, dist, ang),
                 "game_file": path.name,
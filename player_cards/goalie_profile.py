@@ -108,7 +108,7 @@ def build_goalie_card_profile(
         goalie_dates = fetch_goalie_game_dates(player_id, season)
         other_dates = fetch_goalie_game_dates(other_goalie_player_id, season) if other_goalie_player_id else {}
         files = games_for_goalie(all_files, goalie_dates, other_dates)
-        shots = build_goalie_shots(files, _team_full_name(team), bio["name"])
+        shots = build_goalie_shots(files, _team_full_name(team), bio["name"], all_files=all_files)
         situational = aggregate_goalie_situational(shots)
     except Exception as e:
         logger.warning("Situational goalie split build failed for %s: %s", player_name, e)
@@ -116,7 +116,9 @@ def build_goalie_card_profile(
     percentiles: dict[str, Any] = {}
     if instat_summary and league_goalie_rows:
         try:
-            percentiles = compute_goalie_percentiles(instat_summary, league_goalie_rows, min_gp=10)
+            percentiles = compute_goalie_percentiles(
+                instat_summary, league_goalie_rows, min_gp=10, league=league, season=season,
+            )
         except Exception as e:
             logger.warning("Goalie percentile computation failed for %s: %s", player_name, e)
 
@@ -42,8 +42,8 @@ from .disk_cache import photo_data_url, photo_dimensions, store_photo_data_url
 from .leagues import LEAGUES, team_full_name
 from .photo_layout import embed_photo, photo_frame
 from .pwhl_vitals import format_shoots_label
-from .shot_map import render_shot_map_html
 from .team_colors import get_team_colors
+from .timing import timed
 
 
 def prewarm_photo(url: str) -> str:
@@ -977,6 +977,7 @@ h1 {{
 """
 
 
+@timed("html")
 def render_player_card_html(profile: dict[str, Any]) -> str:
     bio = profile["bio"]
     league = (profile.get("league") or bio.get("league") or "nhl").lower()
@@ -1367,6 +1368,8 @@ def render_player_card_html(profile: dict[str, Any]) -> str:
         _map_sub = f"Card generated from {_pbp_gp} games of PBP"
         if _ep_gp and abs(_ep_gp - _pbp_gp) > 1:
             _map_sub += f" · season {_ep_gp} GP"
+    from .shot_map import render_shot_map_html
+
     shot_html = render_shot_map_html(
         pbp.get("shots") or [],
         primary=primary,
@@ -4,15 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import glob
+import hashlib
 import json
 import os
 import logging
 import re
+import sqlite3
 import sys
 from pathlib import Path
 from typing import Any
 
 from .leagues import get_league, instat_season_id, min_season_games, pbp_cache_dir, resolve_instat_team_id, team_full_name
+from .pbp_game_index import game_teams, open_game_index, record_download
 
 logger = logging.getLogger(__name__)
 
@@ -94,6 +97,57 @@ def _load_manifest(output_dir: Path, season_id: int) -> dict[str, Any] | None:
         return None
 
 
+def _verify_manifest_default() -> bool:
+    return os.getenv("PLAYER_CARDS_PBP_VERIFY", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _manifest_games(paths: list[Path]) -> dict[str, dict[str, Any]] | None:
+    """Per-match manifest entries (file, teams, date, size, hash) from the PBP game index.
+
+    None when the index can't be read; the fast cache path then globs as before.
+    """
+    games: dict[str, dict[str, Any]] = {}
+    if not paths:
+        return games
+    try:
+        with open_game_index() as index:
+            for path in paths:
+                mid = _match_id_from_filename(path.name)
+                row = index.game(path) if mid is not None else None
+                if row is None:
+                    continue
+                games[str(mid)] = {
+                    "file": path.name,
+                    "teams": game_teams(row),
+                    "date": row["game_date"],
+                    "bytes": row["bytes"],
+                    "sha1": row["sha1"],
+                }
+    except sqlite3.Error as exc:
+        logger.warning("PBP game index unavailable, manifest written without games: %s", exc)
+        return None
+    return games
+
+
+def _with_manifest_games(manifest: dict[str, Any], paths: list[Path]) -> dict[str, Any]:
+    games = _manifest_games(paths)
+    return manifest if games is None else {**manifest, "games": games}
+
+
+def _verify_manifest_entry(path: Path, entry: dict[str, Any]) -> bool:
+    """File on disk still has the manifest's size and hash."""
+    try:
+        if path.stat().st_size != entry.get("bytes"):
+            return False
+        digest = hashlib.sha1()
+        with path.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return False
+    return digest.hexdigest() == entry.get("sha1")
+
+
 def _save_manifest(output_dir: Path, season_id: int, payload: dict[str, Any]) -> None:
     output_dir.mkdir(parents=True, exist_ok=True)
     _manifest_path(output_dir, season_id).write_text(
@@ -124,12 +178,10 @@ def _bootstrap_manifest_from_disk(
     if not match_ids:
         return None
     match_ids = sorted(set(match_ids))
-    manifest = {
-        "team": tri,
-        "season_id": season_id,
-        "match_ids": match_ids,
-        "bootstrapped": True,
-    }
+    manifest = _with_manifest_games(
+        {"team": tri, "season_id": season_id, "match_ids": match_ids, "bootstrapped": True},
+        files,
+    )
     _save_manifest(output_dir, season_id, manifest)
     logger.info("Bootstrapped PBP manifest for %s (%s games on disk)", tri, len(match_ids))
     return manifest
@@ -140,15 +192,31 @@ def _complete_cache_meta(
     tri: str,
     season_id: int,
     manifest: dict[str, Any],
+    *,
+    verify: bool = False,
 ) -> dict[str, Any] | None:
+    """Cache metadata when every manifest game is on disk.
+
+    Games with a manifest entry are trusted by file name without touching the
+    disk; ``verify`` re-checks their size and hash. Entries missing from older
+    manifests fall back to a glob.
+    """
     match_ids = manifest.get("match_ids") or []
     if not match_ids:
         return None
+    games = manifest.get("games") or {}
     all_paths: list[Path] = []
     for mid in match_ids:
-        path = _find_cached_pbp(output_dir, mid)
-        if not path:
-            return None
+        entry = games.get(str(mid))
+        if entry and entry.get("file"):
+            path = output_dir / entry["file"]
+            if verify and not _verify_manifest_entry(path, entry):
+                logger.warning("PBP manifest entry for match %s no longer matches %s", mid, path.name)
+                return None
+        else:
+            path = _find_cached_pbp(output_dir, mid)
+            if not path:
+                return None
         all_paths.append(path)
     return {
         "team": tri,
@@ -175,16 +243,28 @@ def try_fast_pbp_cache(
     league: str = "nhl",
     a3z_season: str | None = None,
     season_id: int | None = None,
+    verify: bool | None = None,
 ) -> dict[str, Any] | None:
-    """Return metadata when every season game CSV is already on disk (no Playwright)."""
+    """Return metadata when every season game CSV is already on disk (no Playwright).
+
+    The manifest is trusted as written; ``verify`` (default: env
+    ``PLAYER_CARDS_PBP_VERIFY``) re-hashes every listed file first.
+    """
     tri = team_abbrev.upper()
     sid = season_id if season_id is not None else instat_season_id(a3z_season, league)
+    if verify is None:
+        verify = _verify_manifest_default()
     manifest = _load_manifest(output_dir, sid)
     if manifest is None:
         manifest = _bootstrap_manifest_from_disk(output_dir, sid, tri, league=league)
     if manifest is not None:
-        complete = _complete_cache_meta(output_dir, tri, sid, manifest)
+        complete = _complete_cache_meta(output_dir, tri, sid, manifest, verify=verify)
         if complete:
+            if "games" not in manifest:
+                # One-time upgrade of a manifest written before per-game entries.
+                upgraded = _with_manifest_games(manifest, complete["files"])
+                if "games" in upgraded:
+                    _save_manifest(output_dir, sid, upgraded)
             return complete
 
     from .instat_source import discover_team_pbp_files
@@ -271,6 +351,7 @@ async def _download_team_pbp_with_api(
         path = _pbp_path_for_match(out, mid, date or None)
         ok = await api.export_pbp_csv(mid, str(path), team_id=team_id)
         if ok:
+            record_download(path)
             logger.info("[%s/%s] PBP %s", i, len(to_fetch), mid)
             return True, mid
         else:
@@ -295,14 +376,17 @@ async def _download_team_pbp_with_api(
     _save_manifest(
         out,
         sid,
-        {
-            "team": tri,
-            "team_id": team_id,
-            "season_id": sid,
-            "a3z_season": a3z_season,
-            "match_ids": match_ids,
-            "league": league,
-        },
+        _with_manifest_games(
+            {
+                "team": tri,
+                "team_id": team_id,
+                "season_id": sid,
+                "a3z_season": a3z_season,
+                "match_ids": match_ids,
+                "league": league,
+            },
+            all_paths,
+        ),
     )
 
     return {
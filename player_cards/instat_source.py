@@ -4,8 +4,10 @@ from __future__ import annotations
 
 import csv
 import glob
+import logging
 import os
 import re
+import sqlite3
 import sys
 import unicodedata
 from collections import Counter
@@ -16,6 +18,8 @@ HUDL_ROOT = Path(__file__).resolve().parents[1] / "hudl-scraping"
 if str(HUDL_ROOT) not in sys.path:
     sys.path.insert(0, str(HUDL_ROOT))
 
+logger = logging.getLogger(__name__)
+
 NHL_TEAM_SEARCH: dict[str, str] = {
     "ANA": "Anaheim Ducks",
     "BOS": "Boston Bruins",
@@ -103,17 +107,17 @@ def _instat_name(nhl_name: str) -> str:
     return f"{parts[-1]} {' '.join(parts[:-1])}"
 
 
+def _clean_player_name(n: str) -> str:
+    n = re.sub(r'\(.*?\)', '', n)
+    n = re.sub(r'[^a-zA-Z\s]', '', n)
+    return n.lower().strip()
+
+
 def _match_player_name(row_name: str, nhl_name: str) -> bool:
-    import re
     import difflib
-    
-    def clean(n):
-        n = re.sub(r'\(.*?\)', '', n)
-        n = re.sub(r'[^a-zA-Z\s]', '', n)
-        return n.lower().strip()
-        
-    row_clean = clean(row_name)
-    nhl_clean = clean(nhl_name)
+
+    row_clean = _clean_player_name(row_name)
+    nhl_clean = _clean_player_name(nhl_name)
     
     if row_clean == nhl_clean:
         return True
@@ -160,7 +164,12 @@ def _norm_tri(team: str) -> str:
     return normalize_team_abbrev("nhl", team)
 
 
-def _team_search_roots(team: str, *, league: str = "nhl") -> list[Path]:
+def _team_search_roots(team: str, *, league: str = "nhl", index: Any = None) -> list[Path]:
+    """Existing search roots for a team, refreshed in the PBP game index.
+
+    Team-named subdirectories come from the index's directory table rather
+    than an ``os.walk`` of every root (see ``_root_subdirs``).
+    """
     from .leagues import player_cards_work_root
 
     work = player_cards_work_root()
@@ -172,6 +181,8 @@ def _team_search_roots(team: str, *, league: str = "nhl") -> list[Path]:
         prospect_root = Path.home() / "Desktop" / "My Analytics Work" / "Prospects" / team.upper()
         roots = [prospect_root / "Instat_API_Downloads", prospect_root]
         found = [r for r in roots if r.is_dir()]
+        if index is not None:
+            index.rescan(found)
         return list(dict.fromkeys(found))
 
     tri = _norm_tri(team)
@@ -187,19 +198,39 @@ def _team_search_roots(team: str, *, league: str = "nhl") -> list[Path]:
         Path.home() / "Desktop" / "Instat_API_Downloads",
         Path.home() / "Desktop" / f"My Analytics Work/{full}/Instat_API_Downloads",
     ]
+    bases = [r for r in roots if r.is_dir()]
     found: list[Path] = []
-    for root in roots:
-        if not root.is_dir():
-            continue
+    for root, subdirs in _root_subdirs(bases, index).items():
         found.append(root)
-        for dirpath, dirnames, _ in os.walk(root):
-            for d in dirnames:
-                dl = d.lower()
-                if nickname.lower() in dl or full.lower() in dl:
-                    found.append(Path(dirpath) / d)
+        for d in subdirs:
+            dl = d.name.lower()
+            if nickname.lower() in dl or full.lower() in dl:
+                found.append(d)
     return list(dict.fromkeys(found))
 
 
+def _root_subdirs(bases: list[Path], index: Any = None) -> dict[Path, list[Path]]:
+    """Every directory under each of ``bases``.
+
+    Read from ``index`` when given (errors propagate to the caller). Otherwise
+    a private index is opened; if SQLite fails, the roots are walked directly.
+    """
+    if index is not None:
+        index.rescan(bases)
+        return {root: index.subdirs(root) for root in bases}
+    from .pbp_game_index import open_game_index
+
+    try:
+        with open_game_index() as own:
+            return _root_subdirs(bases, own)
+    except sqlite3.Error as exc:
+        logger.warning("PBP game index unavailable (%s); walking %s search roots", exc, len(bases))
+    return {
+        root: [Path(dirpath) / d for dirpath, dirnames, _ in os.walk(root) for d in dirnames]
+        for root in bases
+    }
+
+
 def is_pbp_game_csv(path: Path) -> bool:
     """True for InStat per-game play-by-play exports (not season stat sheets)."""
     return path.name.endswith("_pbp.csv")
@@ -219,8 +250,56 @@ def _is_team_game_file(path: Path, team: str) -> bool:
     return False
 
 
+def _file_mentions_team(path: Path, team: str, teams_present: list[str]) -> bool:
+    """Whether a game_* PBP file involves ``team`` (by its team column when known)."""
+    full_name = NHL_TEAM_SEARCH.get(_norm_tri(team), "")
+    search_term = full_name.split()[0].lower() if full_name else team.lower()
+    if teams_present:
+        sample = " | ".join(teams_present)
+    else:
+        try:
+            with path.open(encoding="utf-8") as f:
+                sample = f.read(4096)
+        except Exception:
+            return False
+    return search_term in sample.lower() or _norm_tri(team) in sample.upper()
+
+
 def discover_team_pbp_files(team: str, *, league: str = "nhl") -> list[Path]:
-    """All PBP CSV files for a team (recursive)."""
+    """All PBP CSV files for a team (recursive), resolved from the PBP game index.
+
+    Falls back to globbing the search roots when the index can't be used
+    (locked or corrupt database).
+    """
+    from .pbp_game_index import game_teams, open_game_index
+
+    try:
+        with open_game_index() as index:
+            roots = _team_search_roots(team, league=league, index=index)
+            rows = index.games(roots=roots) if roots else []
+    except sqlite3.Error as exc:
+        logger.warning("PBP game index unavailable (%s); scanning %s files on disk", exc, team)
+        return _walk_team_pbp_files(team, league=league)
+
+    files: list[Path] = []
+    seen: set[tuple[str, str]] = set()
+    for row in rows:
+        path = Path(row["path"])
+        # Same bytes under two roots (overlapping or symlinked dirs) is one game.
+        key = (path.name, row["sha1"])
+        if key in seen:
+            continue
+        if not _is_team_game_file(path, team):
+            continue
+        if path.name.startswith("game_") and not _file_mentions_team(path, team, game_teams(row)):
+            continue
+        seen.add(key)
+        files.append(path)
+    return sorted(files, key=lambda p: p.name)
+
+
+def _walk_team_pbp_files(team: str, *, league: str = "nhl") -> list[Path]:
+    """``discover_team_pbp_files`` without the game index: glob every search root."""
     files: list[Path] = []
     seen: set[str] = set()
     for root in _team_search_roots(team, league=league):
@@ -229,22 +308,10 @@ def discover_team_pbp_files(team: str, *, league: str = "nhl") -> list[Path]:
                 if not path.is_file():
                     continue
                 key = str(path.resolve())
-                if key in seen:
+                if key in seen or not _is_team_game_file(path, team):
                     continue
-                if not _is_team_game_file(path, team):
+                if path.name.startswith("game_") and not _file_mentions_team(path, team, []):
                     continue
-                # game_*_pbp must mention team in contents
-                if path.name.startswith("game_"):
-                    try:
-                        with path.open(encoding="utf-8") as f:
-                            sample = f.read(4096)
-                        full_name = NHL_TEAM_SEARCH.get(_norm_tri(team), "")
-                        search_term = full_name.split()[0].lower() if full_name else team.lower()
-                        if search_term not in sample.lower():
-                            if _norm_tri(team) not in sample.upper():
-                                continue
-                    except Exception:
-                        continue
                 seen.add(key)
                 files.append(path)
     return sorted(files, key=lambda p: p.name)
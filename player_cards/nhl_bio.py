@@ -9,6 +9,8 @@ from typing import Any
 
 import httpx
 
+from .timing import timed
+
 logger = logging.getLogger(__name__)
 
 NHL_API = "https://api-web.nhle.com/v1"
@@ -418,6 +420,7 @@ def refresh_nhl_card_photo(bio: dict[str, Any]) -> dict[str, Any]:
     return out
 
 
+@timed("bio")
 def fetch_nhl_bio(player_name: str, team: str | None = None) -> dict[str, Any]:
     hit = search_player(player_name, team=team)
     if not hit:
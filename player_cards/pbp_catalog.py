@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import logging
 import re
+import sqlite3
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
@@ -12,7 +14,11 @@ import pandas as pd
 
 from .instat_source import discover_team_pbp_files
 from .leagues import LEAGUES, player_cards_work_root
-from .pbp_team_cache import get_team_frames, warm_team_pbp
+from .pbp_game_index import open_game_index
+from .pbp_loader import compact_frame, concat_frames, load_pbp, with_constants
+from .pbp_team_cache import cached_team_frames
+
+logger = logging.getLogger(__name__)
 
 _PBP_NAME = re.compile(
     r"^game_(?:(?P<game_date>\d{4}-\d{2}-\d{2})_)?(?P<match_id>\d+)_pbp\.csv$",
@@ -73,12 +79,8 @@ def _team_from_path(path: Path, work_root: Path) -> tuple[str | None, str | None
     return tri, full, league or "nhl"
 
 
-def catalog_games(*, work_root: Path | None = None) -> list[GameRecord]:
-    """Index every `*_pbp.csv` under PLAYER_CARDS_WORK_ROOT."""
-    root = work_root or player_cards_work_root()
+def _glob_games(root: Path) -> list[GameRecord]:
     rows: list[GameRecord] = []
-    if not root.is_dir():
-        return rows
     for path in sorted(root.glob("**/Instat_API_Downloads/*_pbp.csv")):
         if not path.is_file():
             continue
@@ -98,6 +100,36 @@ def catalog_games(*, work_root: Path | None = None) -> list[GameRecord]:
     return rows
 
 
+def catalog_games(*, work_root: Path | None = None) -> list[GameRecord]:
+    """Index every `*_pbp.csv` in an `Instat_API_Downloads` dir under PLAYER_CARDS_WORK_ROOT."""
+    root = work_root or player_cards_work_root()
+    rows: list[GameRecord] = []
+    if not root.is_dir():
+        return rows
+    try:
+        with open_game_index() as index:
+            index.rescan([root])
+            entries = index.games(roots=[root], dir_name="Instat_API_Downloads")
+    except sqlite3.Error as exc:
+        logger.warning("PBP game index unavailable (%s); globbing %s", exc, root)
+        return _glob_games(root)
+    for entry in sorted(entries, key=lambda r: Path(r["path"])):
+        path = Path(entry["path"])
+        tri, full, league = _team_from_path(path, root)
+        rows.append(
+            GameRecord(
+                path=path,
+                match_id=entry["match_id"],
+                game_date=date.fromisoformat(entry["game_date"]) if entry["game_date"] else None,
+                team=tri,
+                team_full=full,
+                league=league,
+                bytes=entry["bytes"],
+            )
+        )
+    return rows
+
+
 def _parse_iso(d: str | date | None) -> date | None:
     if d is None:
         return None
@@ -196,8 +228,13 @@ def load_dataframe(
     date_to: str | date | None = None,
     match_ids: Iterable[str | int] | None = None,
     dedupe_games: bool = True,
+    columns: Iterable[str] | None = None,
 ) -> pd.DataFrame:
-    """Load filtered PBP into one DataFrame with game_id + source_file columns."""
+    """Load filtered PBP into one DataFrame with game_id + source_file columns.
+
+    Compact dtypes and optional column projection come from ``pbp_loader``;
+    frames already warm in ``pbp_team_cache`` are reused instead of re-read.
+    """
     paths = files or resolve_files(
         league=league,
         team=team,
@@ -210,21 +247,23 @@ def load_dataframe(
     if not paths:
         return pd.DataFrame()
 
-    warm_team_pbp(paths)
-    parts: list[pd.DataFrame] = []
-    for path, df in get_team_frames(paths):
-        if df.empty:
-            continue
-        chunk = df.copy()
+    def constants(path: Path) -> dict[str, str | None]:
         mid, gd = parse_pbp_path(path)
-        chunk["game_id"] = mid
-        chunk["game_date"] = gd.isoformat() if gd else None
-        chunk["source_file"] = path.name
-        parts.append(chunk)
+        return {"game_id": mid, "game_date": gd.isoformat() if gd else None, "source_file": path.name}
 
-    if not parts:
-        return pd.DataFrame()
-    out = pd.concat(parts, ignore_index=True)
+    warm = cached_team_frames(paths)
+    if warm is None:
+        out = load_pbp([(p, constants(p)) for p in paths], columns=columns, require=("player", "action"))
+    else:
+        wanted = None if columns is None else set(columns)
+        parts = [
+            with_constants(compact_frame(df if wanted is None else df[[c for c in df.columns if c in wanted]]), **constants(path))
+            for path, df in warm
+            if not df.empty
+        ]
+        out = concat_frames(parts)
+    if out.empty:
+        return out
     sort_cols = [c for c in ("game_date", "game_id", "half", "start") if c in out.columns]
     if sort_cols:
         out = out.sort_values(sort_cols)
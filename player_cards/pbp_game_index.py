@@ -0,0 +1,379 @@
+"""SQLite catalog of on-disk InStat PBP game CSVs.
+
+One row per ``*_pbp.csv`` (match id, date, teams present, size, mtime, content
+hash, row count), one row per distinct (player, team) appearing in it, plus
+every directory seen under the scanned roots with its mtime. ``rescan``
+re-lists only directories whose mtime changed and walks the rest through their
+recorded children, so repeat discovery is a handful of ``stat`` calls and one
+indexed query. The downloader records files as it writes them
+(``record_download``), which also covers in-place re-downloads that leave the
+directory mtime untouched. Player appearances are keyed by ``player_key``
+(accent-free, order-free name tokens), so "First Last" and "Last First"
+resolve to the same games with one indexed lookup.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from .disk_cache import CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path(
+    os.getenv("PLAYER_CARDS_PBP_INDEX", str(CACHE_ROOT / "pbp_games.db"))
+)
+PBP_SUFFIX = "_pbp.csv"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime REAL NOT NULL,
+    scanned_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS games (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    match_id TEXT NOT NULL,
+    game_date TEXT,
+    bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha1 TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    teams_json TEXT NOT NULL,
+    players_indexed INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS game_teams (
+    path TEXT NOT NULL,
+    team_norm TEXT NOT NULL,
+    PRIMARY KEY (path, team_norm)
+);
+
+CREATE TABLE IF NOT EXISTS game_players (
+    path TEXT NOT NULL,
+    match_id TEXT NOT NULL,
+    team TEXT NOT NULL,
+    player TEXT NOT NULL,
+    player_key TEXT NOT NULL,
+    PRIMARY KEY (path, player, team)
+);
+
+CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent);
+CREATE INDEX IF NOT EXISTS idx_games_dir ON games(dir);
+CREATE INDEX IF NOT EXISTS idx_games_match ON games(match_id);
+CREATE INDEX IF NOT EXISTS idx_game_teams_team ON game_teams(team_norm);
+CREATE INDEX IF NOT EXISTS idx_game_players_key ON game_players(player_key);
+"""
+
+
+def player_key(name: str) -> str:
+    """Order-free, accent-free lookup key: "Dupont Émile" and "Emile Dupont" → "dupont emile"."""
+    s = re.sub(r"\(.*?\)", " ", str(name))
+    s = unicodedata.normalize("NFD", s)
+    s = "".join(c for c in s if unicodedata.category(c) != "Mn")
+    return " ".join(sorted(re.sub(r"[^a-z\s]", "", s.lower()).split()))
+
+
+def _file_facts(path: Path) -> dict[str, Any]:
+    """Hash, row count, distinct teams and (player, team) pairs, in one pass over the file."""
+    digest = hashlib.sha1()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    teams: dict[str, None] = {}
+    players: dict[tuple[str, str], None] = {}
+    rows = 0
+    with path.open(encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        col = header.index("team") if "team" in header else None
+        pcol = header.index("player") if "player" in header else None
+        for row in reader:
+            rows += 1
+            team = row[col].strip() if col is not None and col < len(row) else ""
+            if team:
+                teams.setdefault(team, None)
+            if pcol is not None and pcol < len(row):
+                player = row[pcol].strip()
+                if player:
+                    players.setdefault((player, team), None)
+    return {
+        "sha1": digest.hexdigest(),
+        "row_count": rows,
+        "teams": list(teams),
+        "players": list(players),
+    }
+
+
+class PbpGameIndex:
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path or DEFAULT_INDEX_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        # Readers (server workers) don't block on a rescan or download writing.
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self) -> None:
+        cols = {r[1] for r in self._conn.execute("PRAGMA table_info(games)")}
+        if "players_indexed" not in cols:
+            # Catalog written before player appearances were indexed: make the
+            # next rescan re-list every directory and re-read every file.
+            self._conn.execute("ALTER TABLE games ADD COLUMN players_indexed INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("UPDATE games SET mtime = -1")
+            self._conn.execute("UPDATE dirs SET mtime = -1")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> PbpGameIndex:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    # ── ingest ───────────────────────────────────────────────────────────
+
+    def record_file(self, path: Path, *, st: os.stat_result | None = None, commit: bool = True) -> bool:
+        """(Re)catalog one PBP CSV; False when it can't be read."""
+        from .pbp_catalog import parse_pbp_path
+
+        path = Path(path)
+        try:
+            st = st or path.stat()
+            facts = _file_facts(path)
+        except OSError as exc:
+            logger.warning("Skip PBP catalog entry %s: %s", path.name, exc)
+            return False
+        match_id, game_date = parse_pbp_path(path)
+        key = str(path)
+        self._conn.execute(
+            """
+            INSERT INTO games(
+                path, dir, name, match_id, game_date, bytes, mtime, sha1, row_count, teams_json, players_indexed
+            )
+            VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT(path) DO UPDATE SET
+                match_id = excluded.match_id, game_date = excluded.game_date,
+                bytes = excluded.bytes, mtime = excluded.mtime, sha1 = excluded.sha1,
+                row_count = excluded.row_count, teams_json = excluded.teams_json,
+                players_indexed = 1
+            """,
+            (
+                key, str(path.parent), path.name, match_id,
+                game_date.isoformat() if game_date else None,
+                st.st_size, st.st_mtime, facts["sha1"], facts["row_count"], json.dumps(facts["teams"]),
+            ),
+        )
+        self._conn.execute("DELETE FROM game_teams WHERE path = ?", (key,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO game_teams(path, team_norm) VALUES(?, ?)",
+            [(key, t.lower()) for t in facts["teams"]],
+        )
+        self._conn.execute("DELETE FROM game_players WHERE path = ?", (key,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO game_players(path, match_id, team, player, player_key) VALUES(?, ?, ?, ?, ?)",
+            [(key, match_id, team, player, player_key(player)) for player, team in facts["players"]],
+        )
+        if commit:
+            self._conn.commit()
+        return True
+
+    def _forget(self, path: str) -> None:
+        """Drop a directory subtree (or a single file) from the catalog."""
+        prefix = path.rstrip(os.sep) + os.sep
+        for table in ("game_players", "game_teams", "games", "dirs"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE path = ? OR substr(path, 1, ?) = ?",
+                (path, len(prefix), prefix),
+            )
+
+    def rescan(self, roots: Iterable[Path], *, full: bool = False) -> dict[str, int]:
+        """Bring the catalog up to date under ``roots``.
+
+        Directories whose mtime is unchanged are not listed again; their
+        recorded subdirectories are still visited. ``full`` re-lists every
+        directory and re-stats every file.
+        """
+        stats = {"dirs_listed": 0, "dirs_skipped": 0, "files_recorded": 0, "files_removed": 0}
+        now = time.time()
+        stack = [Path(r) for r in roots]
+        seen: set[str] = set()
+        while stack:
+            d = stack.pop()
+            key = str(d)
+            if key in seen:
+                continue
+            seen.add(key)
+            try:
+                mtime = d.stat().st_mtime
+            except OSError:
+                self._forget(key)
+                continue
+            row = self._conn.execute("SELECT mtime FROM dirs WHERE path = ?", (key,)).fetchone()
+            if row is not None and row["mtime"] == mtime and not full:
+                stats["dirs_skipped"] += 1
+                stack.extend(
+                    Path(r["path"]) for r in self._conn.execute("SELECT path FROM dirs WHERE parent = ?", (key,))
+                )
+                continue
+            stats["dirs_listed"] += 1
+            subdirs: list[Path] = []
+            files: dict[str, os.DirEntry] = {}
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir():
+                                subdirs.append(Path(entry.path))
+                            elif entry.name.endswith(PBP_SUFFIX) and entry.is_file():
+                                files[entry.path] = entry
+                        except OSError:
+                            continue
+            except OSError as exc:
+                logger.warning("Skip PBP catalog dir %s: %s", d, exc)
+                continue
+            known = {
+                r["path"]: (r["mtime"], r["bytes"])
+                for r in self._conn.execute("SELECT path, mtime, bytes FROM games WHERE dir = ?", (key,))
+            }
+            for gone in set(known) - set(files):
+                self._forget(gone)
+                stats["files_removed"] += 1
+            for fpath, entry in files.items():
+                st = entry.stat()
+                if known.get(fpath) == (st.st_mtime, st.st_size):
+                    continue
+                if self.record_file(Path(fpath), st=st, commit=False):
+                    stats["files_recorded"] += 1
+            live = {str(s) for s in subdirs}
+            for r in self._conn.execute("SELECT path FROM dirs WHERE parent = ?", (key,)).fetchall():
+                if r["path"] not in live:
+                    self._forget(r["path"])
+            self._conn.execute(
+                """
+                INSERT INTO dirs(path, parent, mtime, scanned_at) VALUES(?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime, scanned_at = excluded.scanned_at
+                """,
+                (key, str(d.parent), mtime, now),
+            )
+            stack.extend(subdirs)
+        self._conn.commit()
+        return stats
+
+    # ── queries ──────────────────────────────────────────────────────────
+
+    def game(self, path: Path) -> sqlite3.Row | None:
+        """Catalog row for one file, (re)recorded first when missing or stale."""
+        path = Path(path)
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        sql = "SELECT * FROM games WHERE path = ?"
+        row = self._conn.execute(sql, (str(path),)).fetchone()
+        if row is None or (row["mtime"], row["bytes"]) != (st.st_mtime, st.st_size):
+            if not self.record_file(path, st=st):
+                return None
+            row = self._conn.execute(sql, (str(path),)).fetchone()
+        return row
+
+    def subdirs(self, root: Path) -> list[Path]:
+        """Every catalogued directory under ``root`` (after a ``rescan`` of it)."""
+        prefix = str(root).rstrip(os.sep) + os.sep
+        rows = self._conn.execute(
+            "SELECT path FROM dirs WHERE substr(path, 1, ?) = ? ORDER BY path", (len(prefix), prefix)
+        )
+        return [Path(r["path"]) for r in rows]
+
+    def games(
+        self,
+        *,
+        roots: Iterable[Path] | None = None,
+        dir_name: str | None = None,
+        team: str | None = None,
+    ) -> list[sqlite3.Row]:
+        """Catalog rows, optionally under ``roots``, in directories named
+        ``dir_name``, or with ``team`` (case-insensitive, exact) present."""
+        sql = "SELECT g.* FROM games g"
+        where: list[str] = []
+        args: list[Any] = []
+        if team is not None:
+            sql += " JOIN game_teams t ON t.path = g.path"
+            where.append("t.team_norm = ?")
+            args.append(team.lower())
+        if roots is not None:
+            clauses = []
+            for r in roots:
+                key = str(r).rstrip(os.sep)
+                clauses.append("(g.dir = ? OR substr(g.dir, 1, ?) = ?)")
+                args.extend([key, len(key) + 1, key + os.sep])
+            if not clauses:
+                return []
+            where.append("(" + " OR ".join(clauses) + ")")
+        if dir_name is not None:
+            where.append("substr(g.dir, -?) = ?")
+            args.extend([len(dir_name) + 1, os.sep + dir_name])
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return self._conn.execute(sql + " ORDER BY g.path", args).fetchall()
+
+    def appearances(
+        self,
+        keys: Iterable[str] | None = None,
+        *,
+        paths: Iterable[Path] | None = None,
+    ) -> list[sqlite3.Row]:
+        """(path, match_id, team, player) rows for ``player_key`` values or for
+        every player in ``paths``, in path order and, within a file,
+        first-appearance order."""
+        if keys is not None:
+            column, values = "player_key", sorted({k for k in keys if k})
+        else:
+            column, values = "path", sorted({str(p) for p in paths or ()})
+        rows: list[sqlite3.Row] = []
+        for i in range(0, len(values), 500):
+            chunk = values[i : i + 500]
+            rows.extend(
+                self._conn.execute(
+                    f"SELECT rowid, path, match_id, team, player FROM game_players"
+                    f" WHERE {column} IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return sorted(rows, key=lambda r: (r["path"], r["rowid"]))
+
+
+def open_game_index(path: Path | str | None = None) -> PbpGameIndex:
+    return PbpGameIndex(path)
+
+
+def record_download(path: Path) -> None:
+    """Catalog a freshly written PBP CSV; never fails the download."""
+    try:
+        with open_game_index() as index:
+            index.record_file(path)
+    except Exception as exc:
+        logger.warning("PBP catalog update failed for %s: %s", Path(path).name, exc)
+
+
+def game_teams(row: sqlite3.Row) -> list[str]:
+    return list(json.loads(row["teams_json"] or "[]"))
@@ -3,17 +3,19 @@
 For dual-roster / heavily-scouted juniors (Schultz, Pue, Dupont), opponent
 folders already hold many of their games. Harvesting by player name +
 deduping on match id is seconds, not minutes — no InStat session required.
+Appearances come from the PBP game index (``pbp_game_index``), so no external
+grep tool is needed and repeat harvests only re-read new or changed files.
 """
 
 from __future__ import annotations
 
-import csv
 import logging
 import os
 import re
 import shutil
-import subprocess
+import sqlite3
 from collections import defaultdict
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
@@ -52,6 +54,65 @@ def _player_needles(player_name: str) -> list[str]:
     return out
 
 
+def player_appearances(
+    player_name: str,
+    *,
+    roots: list[Path] | None = None,
+    files: list[Path] | None = None,
+) -> list[tuple[Path, str, str]]:
+    """``(path, team, row player name)`` for every catalogued game the player
+    appears in, from the PBP game index.
+
+    With ``roots`` (rescanned first), candidates come from the order-free name
+    keys of every needle spelling; with ``files``, every player in those files
+    is a candidate. Either way rows are confirmed with the same fuzzy name
+    match the card builders use. When the index can't be opened the candidate
+    files (``files``, or every PBP CSV under ``roots``) are read directly.
+    """
+    from .pbp_game_index import PBP_SUFFIX, open_game_index, player_key
+
+    try:
+        with open_game_index() as index:
+            if files is not None:
+                rows = index.appearances(paths=files)
+            else:
+                if roots:
+                    index.rescan(roots)
+                rows = index.appearances({player_key(n) for n in _player_needles(player_name)})
+    except sqlite3.Error as exc:
+        logger.warning("PBP game index unavailable, scanning files for %s: %s", player_name, exc)
+        if files is None:
+            files = [p for r in roots or () for p in Path(r).rglob(f"*{PBP_SUFFIX}")]
+        rows = _scan_appearances(files)
+    prefixes = tuple(str(r).rstrip(os.sep) + os.sep for r in roots or ())
+    checked: dict[str, bool] = {}
+    out: list[tuple[Path, str, str]] = []
+    for row in rows:
+        if prefixes and not row["path"].startswith(prefixes):
+            continue
+        name = row["player"]
+        if name not in checked:
+            checked[name] = _match_player_name(name, player_name)
+        if checked[name]:
+            out.append((Path(row["path"]), row["team"], name))
+    return out
+
+
+def _scan_appearances(files: Iterable[Path]) -> list[dict[str, str]]:
+    """``PbpGameIndex.appearances`` rows read straight from the CSVs."""
+    from .pbp_game_index import _file_facts
+
+    rows: list[dict[str, str]] = []
+    for path in sorted({str(p) for p in files}):
+        try:
+            facts = _file_facts(Path(path))
+        except OSError as exc:
+            logger.warning("Skip PBP harvest file %s: %s", Path(path).name, exc)
+            continue
+        rows.extend({"path": path, "team": team, "player": player} for player, team in facts["players"])
+    return rows
+
+
 def find_player_pbp_files(
     player_name: str,
     *,
@@ -62,40 +123,15 @@ def find_player_pbp_files(
     if not root.is_dir():
         return {}
 
-    needles = _player_needles(player_name)
-    # ripgrep is far faster than walking every CSV in Python.
-    found: set[Path] = set()
-    for needle in needles:
-        try:
-            proc = subprocess.run(
-                ["rg", "-l", "--glob", "game_*_pbp.csv", needle, str(root)],
-                capture_output=True,
-                text=True,
-                timeout=60,
-            )
-        except Exception as exc:
-            logger.warning("rg harvest failed for %s: %s", needle, exc)
-            continue
-        for line in proc.stdout.splitlines():
-            p = Path(line.strip())
-            if p.is_file():
-                found.add(p)
-
     by_team: dict[str, dict[str, Path]] = defaultdict(dict)
-    for path in found:
-        mid = _match_id_from_path(path) or path.name
-        try:
-            with path.open(encoding="utf-8", errors="ignore") as fh:
-                for row in csv.DictReader(fh):
-                    pname = str(row.get("player") or "")
-                    team = str(row.get("team") or "").strip()
-                    if not team:
-                        continue
-                    if _match_player_name(pname, player_name):
-                        by_team[team][mid] = path
-                        break
-        except Exception:
+    placed: set[Path] = set()
+    for path, team, _ in player_appearances(player_name, roots=[root]):
+        # First team the player shows up for in a file owns that game.
+        if not team or path in placed:
             continue
+        placed.add(path)
+        mid = _match_id_from_path(path) or path.name
+        by_team[team][mid] = path
 
     return {team: sorted(files.values(), key=lambda p: p.name) for team, files in by_team.items()}
 
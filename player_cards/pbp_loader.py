@@ -0,0 +1,153 @@
+"""Memory-lean PBP loading shared by the catalog and the research pipelines.
+
+Reads only the requested columns, stores repeated strings (player, team,
+action and the per-file id columns) as categoricals and coordinates as
+float32, and concatenates per-file parts without intermediate copies.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+CATEGORICAL_COLUMNS = frozenset({"player", "team", "action", "game_id", "game_date", "source_file"})
+COORD_COLUMNS = frozenset({"pos_x", "pos_y", "Net_Goalie_X", "Net_Goalie_Y"})
+NUMERIC_COLUMNS = frozenset({"start", "end", "duration", "xG"})
+_RENAMES = {"Player": "player", "Team": "team", "Action": "action"}
+# Whatever dtype string categories get on this pandas (object on 2.x, str on 3.x).
+_STR_DTYPE = pd.Series([""]).dtype
+
+
+def _canonical(col: str) -> str:
+    col = str(col).strip()
+    return _RENAMES.get(col, col)
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    *,
+    coord_dtype: Any = np.float32,
+    categorical: bool = True,
+) -> pd.DataFrame:
+    """Canonical column names plus compact dtypes; returns a new frame, ``df`` is untouched."""
+    if any(_canonical(c) != c for c in df.columns):
+        df = df.rename(columns=_canonical)
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if col in COORD_COLUMNS:
+            s = pd.to_numeric(s, errors="coerce").astype(coord_dtype)
+        elif col in NUMERIC_COLUMNS:
+            s = pd.to_numeric(s, errors="coerce")
+        elif categorical and col in CATEGORICAL_COLUMNS and not isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.astype("category")
+        out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def read_pbp_csv(
+    path: Path,
+    *,
+    columns: Iterable[str] | None = None,
+    coord_dtype: Any = np.float32,
+    categorical: bool = True,
+) -> pd.DataFrame:
+    """One PBP CSV with only ``columns`` (canonical names; missing ones are skipped)."""
+    wanted = None if columns is None else {_canonical(c) for c in columns}
+    usecols = None if wanted is None else (lambda c: _canonical(c) in wanted)
+    df = pd.read_csv(path, usecols=usecols, low_memory=False)
+    return compact_frame(df, coord_dtype=coord_dtype, categorical=categorical)
+
+
+def concat_frames(parts: list[pd.DataFrame], *, ignore_index: bool = True) -> pd.DataFrame:
+    """``pd.concat`` that keeps categoricals categorical (shared, sorted categories)."""
+    if not parts:
+        return pd.DataFrame()
+    parts = list(parts)
+    cat_cols = {
+        c for p in parts for c in p.columns if isinstance(p[c].dtype, pd.CategoricalDtype)
+    }
+    for col in cat_cols:
+        present = [p[col] for p in parts if col in p.columns]
+        if any(not isinstance(s.dtype, pd.CategoricalDtype) for s in present):
+            continue
+        cats = union_categoricals(present, sort_categories=True).categories
+        dtype = pd.CategoricalDtype(cats)
+        for i, p in enumerate(parts):
+            if col in p.columns and p[col].dtype != dtype:
+                parts[i] = p.assign(**{col: p[col].cat.set_categories(cats)})
+    return pd.concat(parts, ignore_index=ignore_index)
+
+
+def with_constants(df: pd.DataFrame, **values: Any) -> pd.DataFrame:
+    """Add per-file constant columns (game id, source file, ...) as one-category categoricals."""
+    n = len(df)
+    cols = {}
+    for name, value in values.items():
+        if value is None:
+            cols[name] = pd.Categorical.from_codes(np.full(n, -1, dtype=np.int8), pd.Index([], dtype=_STR_DTYPE))
+        else:
+            cols[name] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [value])
+    return df.assign(**cols)
+
+
+def load_pbp(
+    files: Iterable[Path | tuple[Path, dict[str, Any]]],
+    *,
+    columns: Iterable[str] | None = None,
+    coord_dtype: Any = np.float32,
+    categorical: bool = True,
+    require: Iterable[str] = (),
+) -> pd.DataFrame:
+    """Concatenate many PBP CSVs; ``(path, constants)`` items add per-file columns.
+
+    Files lacking any ``require`` column are skipped as non-PBP CSVs.
+    """
+    require = [_canonical(c) for c in require]
+    wanted = None if columns is None else [_canonical(c) for c in columns]
+    read_cols = None if wanted is None else list(dict.fromkeys(wanted + require))
+    extra = [] if wanted is None else [c for c in require if c not in wanted]
+    parts: list[pd.DataFrame] = []
+    for item in files:
+        path, constants = item if isinstance(item, tuple) else (item, {})
+        try:
+            df = read_pbp_csv(path, columns=read_cols, coord_dtype=coord_dtype, categorical=categorical)
+        except Exception as exc:
+            logger.warning("Skip PBP file %s: %s", Path(path).name, exc)
+            continue
+        missing = [c for c in require if c not in df.columns]
+        if missing:
+            logger.warning("Skip non-PBP CSV %s (missing %s)", Path(path).name, "/".join(missing))
+            continue
+        if extra:
+            df = df.drop(columns=extra)
+        if df.empty:
+            continue
+        parts.append(with_constants(df, **constants) if constants else df)
+    out = concat_frames(parts)
+    if len(out):
+        report = memory_report(out)
+        logger.info(
+            "Loaded %s PBP rows from %s files: %.1f MB", report["rows"], len(parts), report["total_mb"]
+        )
+    return out
+
+
+def memory_report(df: pd.DataFrame) -> dict[str, Any]:
+    """Deep memory use of a frame, in MB, overall and per column (largest first)."""
+    usage = df.memory_usage(deep=True, index=True)
+    per_col = {str(k): round(v / 1e6, 2) for k, v in usage.items() if k != "Index"}
+    return {
+        "rows": len(df),
+        "total_mb": round(usage.sum() / 1e6, 2),
+        "columns": dict(sorted(per_col.items(), key=lambda kv: -kv[1])),
+        "dtypes": {str(c): str(t) for c, t in df.dtypes.items()},
+    }
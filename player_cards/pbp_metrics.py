@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from .instat_source import NHL_TEAM_SEARCH, _match_player_name, discover_team_pbp_files
+from .instat_source import NHL_TEAM_SEARCH, discover_team_pbp_files
 from .leagues import team_full_name
-from .pbp_team_cache import get_team_frames, warm_team_pbp
+from .player_identity import player_rows
+from .pbp_catalog import parse_pbp_path
+from .pbp_team_cache import cached_team_frames, get_team_frames, warm_team_pbp
 from .pwhl_bio import _is_team_match
 from .qoc_qot import compute_microstat_game_score
 
@@ -154,6 +158,7 @@ def _count_chance_assists(
     actions = game["action"].astype(str).tolist()
     teams = game["team"].astype(str).tolist()
     players = game["player"].astype(str).tolist()
+    is_player = player_rows(game["player"], player_name).tolist()
     pos_x = game["pos_x"].tolist()
     pos_y = game["pos_y"].tolist()
     if "xG_final" in game.columns:
@@ -168,7 +173,7 @@ def _count_chance_assists(
     for i, action in enumerate(actions):
         if not _is_assist_shot(action):
             continue
-        if _match_player_name(players[i], player_name):
+        if is_player[i]:
             continue
         if teams[i] != tm:
             continue
@@ -186,7 +191,7 @@ def _count_chance_assists(
         for j in range(i - 1, max(i - 4, -1), -1):
             if teams[j] != teams[i]:
                 break
-            if actions[j] in PASS_ACTIONS and _match_player_name(players[j], player_name) and teams[j] == tm:
+            if actions[j] in PASS_ACTIONS and is_player[j] and teams[j] == tm:
                 assists += 1
                 break
             if _is_turnover(actions[j]) or _is_assist_shot(actions[j]):
@@ -211,14 +216,14 @@ def _count_one_timers(
         game = game.sort_values(["half", "start"]).reset_index(drop=True)
     actions = game["action"].astype(str).tolist()
     teams = game["team"].astype(str).tolist()
-    players = game["player"].astype(str).tolist()
+    is_player = player_rows(game["player"], player_name).tolist()
     starts = game["start"].tolist() if "start" in game.columns else [None] * len(game)
 
     one_timers = 0
     for i, action in enumerate(actions):
         if not _is_assist_shot(action) or action == "Blocked shots":
             continue
-        if not _match_player_name(players[i], player_name) or teams[i] != tm:
+        if not is_player[i] or teams[i] != tm:
             continue
         shot_time = starts[i]
         for j in range(i - 1, max(i - 5, -1), -1):
@@ -227,7 +232,7 @@ def _count_one_timers(
             if _is_turnover(actions[j]):
                 break
             if actions[j] in PASS_ACTIONS:
-                if _match_player_name(players[j], player_name):
+                if is_player[j]:
                     break
                 if shot_time is not None and starts[j] is not None:
                     if float(shot_time) - float(starts[j]) <= max_seconds:
@@ -240,11 +245,18 @@ def _count_one_timers(
     return one_timers
 
 
+@lru_cache(maxsize=1)
+def _analytics_metrics_dir() -> Path | None:
+    """The sibling analytics-metrics checkout, looked up once per process."""
+    path = Path(__file__).resolve().parents[2] / "analytics-metrics"
+    return path if path.is_dir() else None
+
+
 def _xg(px: float, py: float, row: dict[str, Any] | None = None) -> float:
     """Canonical xG via v3 pipeline when available; legacy logistic fallback."""
     try:
-        analytics_metrics = Path(__file__).resolve().parents[2] / "analytics-metrics"
-        if analytics_metrics.is_dir():
+        analytics_metrics = _analytics_metrics_dir()
+        if analytics_metrics is not None:
             import sys
             if str(analytics_metrics) not in sys.path:
                 sys.path.insert(0, str(analytics_metrics))
@@ -271,11 +283,9 @@ def _play_df(df: pd.DataFrame) -> pd.DataFrame:
 def _player_mask(df: pd.DataFrame, player_name: str, team_full: str) -> pd.Series:
     if df.empty or "player" not in df.columns:
         return pd.Series(False, index=df.index)
-    raw_names = df["player"].dropna().unique()
-    matching_names = [n for n in raw_names if _match_player_name(str(n), player_name)]
-    if not matching_names:
+    pm = pd.Series(player_rows(df["player"], player_name), index=df.index)
+    if not pm.any():
         return pd.Series(False, index=df.index)
-    pm = df["player"].isin(matching_names)
     if team_full and "team" in df.columns:
         tm = df["team"].astype(str).str.contains(team_full.split()[-1], case=False, na=False)
         if (pm & tm).any():
@@ -468,14 +478,40 @@ def _game_microstat_gs(
     if not tm:
         return 0.0, 0.0, 0.0
     gs_df = compute_microstat_game_score(df, tm)
-    for _, row in gs_df.iterrows():
-        if _match_player_name(str(row["player"]), player_name):
-            return (
-                float(row["game_score"]),
-                float(row["offense_gs"]),
-                float(row["defense_gs"]),
-            )
-    return 0.0, 0.0, 0.0
+    if gs_df.empty:
+        return 0.0, 0.0, 0.0
+    hits = np.flatnonzero(player_rows(gs_df["player"], player_name))
+    if not len(hits):
+        return 0.0, 0.0, 0.0
+    row = gs_df.iloc[hits[0]]
+    return (
+        float(row["game_score"]),
+        float(row["offense_gs"]),
+        float(row["defense_gs"]),
+    )
+
+
+def _player_game(
+    path: Path,
+    df: pd.DataFrame,
+    player_name: str,
+    team_full: str,
+) -> tuple[dict[str, Any], dict[str, float] | None, list[dict]]:
+    """One game for one skater: its ``game_files`` entry, stat totals (None
+    when the player did not play) and shot candidates."""
+    entry: dict[str, Any] = {"file": path.name, "path": str(path), "played": False, "events": 0}
+    mask = _player_mask(df, player_name, team_full)
+    entry["events"] = int(mask.sum())
+    result = _analyze_game(df, player_name, team_full)
+    if not result:
+        return entry, None, []
+    entry["played"] = True
+    totals = {k: float(v) for k, v in result["stats"].items()}
+    gs, off_gs, def_gs = _game_microstat_gs(df, player_name, team_full)
+    totals["Microstat Game Score"] = gs
+    totals["Microstat Offense"] = off_gs
+    totals["Microstat Defense"] = def_gs
+    return entry, totals, result["shots"]
 
 
 def aggregate_player_pbp(
@@ -491,31 +527,31 @@ def aggregate_player_pbp(
     if not files:
         return None
     team_full = team_full_name(league, team)
+    games = team_games if team_games is not None else len(files)
+    warm_team_pbp(files)
+    return _finish_player_aggregate(
+        [_player_game(path, df, player_name, team_full) for path, df in get_team_frames(files)],
+        games,
+    )
+
+
+def _finish_player_aggregate(
+    results: list[tuple[dict[str, Any], dict[str, float] | None, list[dict]]],
+    games: int,
+) -> dict[str, Any] | None:
+    """Season aggregate from per-game ``_player_game`` results, in game order."""
     totals: dict[str, float] = {}
     all_shots: list[dict] = []
     game_files: list[dict[str, Any]] = []
-    games = team_games if team_games is not None else len(files)
     games_played = 0
-
-    warm_team_pbp(files)
-    for path, df in get_team_frames(files):
-        entry: dict[str, Any] = {"file": path.name, "path": str(path), "played": False, "events": 0}
-        mask = _player_mask(df, player_name, team_full)
-        entry["events"] = int(mask.sum())
-        result = _analyze_game(df, player_name, team_full)
-        if not result:
-            game_files.append(entry)
+    for entry, game_totals, shots in results:
+        game_files.append(entry)
+        if game_totals is None:
             continue
-        entry["played"] = True
         games_played += 1
-        for k, v in result["stats"].items():
-            totals[k] = totals.get(k, 0) + float(v)
-        gs, off_gs, def_gs = _game_microstat_gs(df, player_name, team_full)
-        totals["Microstat Game Score"] = totals.get("Microstat Game Score", 0) + gs
-        totals["Microstat Offense"] = totals.get("Microstat Offense", 0) + off_gs
-        totals["Microstat Defense"] = totals.get("Microstat Defense", 0) + def_gs
-        all_shots.extend(result["shots"])
-        game_files.append(entry)
+        for k, v in game_totals.items():
+            totals[k] = totals.get(k, 0) + v
+        all_shots.extend(shots)
 
     if games_played == 0:
         return None
@@ -566,13 +602,58 @@ def aggregate_player_pbp(
     }
 
 
+def aggregate_player_pbp_clubs(
+    player_name: str,
+    teams: list[tuple[str, list[Path], int | None]],
+    *,
+    league: str | None = "nhl",
+) -> dict[str, Any]:
+    """Per-club and combined PBP aggregates for a multi-club player in one pass.
+
+    Each unique match is loaded once, even when several clubs' file lists hold
+    it (or copies of it), and is analysed once per club that lists it; the
+    club's team name attributes rows through the team column. Per-club results
+    equal ``aggregate_player_pbp`` on that club's files, and ``combined`` equals
+    ``aggregate_player_pbp_multi``.
+    """
+    groups = [(club, files, tg) for club, files, tg in teams if files]
+    union = list(dict.fromkeys(p for _, files, _ in groups for p in files))
+    by_path = dict(cached_team_frames(union) or [])
+    if union and not by_path:
+        # Copies of one match (opponent folders, materialized harvests) load once.
+        first: dict[str, Path] = {}
+        for p in union:
+            first.setdefault(parse_pbp_path(p)[0], p)
+        loaded = dict(get_team_frames(list(first.values())))
+        for p in union:
+            src = first[parse_pbp_path(p)[0]]
+            if src in loaded:
+                by_path[p] = loaded[src]
+
+    by_club: dict[str, dict[str, Any]] = {}
+    for club, files, tg in groups:
+        team_full = team_full_name(league, club)
+        agg = _finish_player_aggregate(
+            [_player_game(p, by_path[p], player_name, team_full) for p in files if p in by_path],
+            tg if tg is not None else len(files),
+        )
+        if agg:
+            by_club[club] = agg
+    return {"combined": _merge_club_aggregates(list(by_club.values())), "by_club": by_club}
+
+
 def aggregate_player_pbp_multi(
     player_name: str,
     teams: list[tuple[str, list[Path], int | None]],
     *,
     league: str | None = "nhl",
 ) -> dict[str, Any] | None:
-    """Merge PBP across teams for players traded mid-season / dual-roster juniors.
+    """Merge PBP across teams for players traded mid-season / dual-roster juniors."""
+    return aggregate_player_pbp_clubs(player_name, teams, league=league)["combined"]
+
+
+def _merge_club_aggregates(aggs: list[dict[str, Any]]) -> dict[str, Any] | None:
+    """Combine per-club ``aggregate_player_pbp`` results.
 
     Absolute counting stats (Goals, Shots, …) are summed from each club's
     integer totals — never reconstructed from rounded per-game rates (that
@@ -588,18 +669,7 @@ def aggregate_player_pbp_multi(
     assists = 0
     shot_count = 0
 
-    for team_abbrev, files, team_game_count in teams:
-        if not files:
-            continue
-        agg = aggregate_player_pbp(
-            player_name,
-            team_abbrev,
-            files=files,
-            team_games=team_game_count,
-            league=league,
-        )
-        if not agg:
-            continue
+    for agg in aggs:
         gp = int(agg.get("games_played") or 0)
         tg = int(agg.get("games") or 0)
         games_played += gp
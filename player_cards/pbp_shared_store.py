@@ -0,0 +1,169 @@
+"""Read-only, memory-mapped PBP frames shared by every worker process.
+
+Each normalized game frame is written once under the cache root as one
+``.npy`` file per column: numbers as they are, strings as category codes
+with the categories in ``meta.json``. Workers build their frames from
+``np.load(mmap_mode="r")`` arrays, so numeric pages live in the OS page cache
+once however many server workers or pool processes hold the same games, and
+nobody re-parses the CSVs. String columns keep their original dtype; their
+rows point at one string object per distinct value instead of one per row.
+
+Numeric columns of stored frames are read-only. Enable the store with
+``PLAYER_CARDS_PBP_SHARED=1`` or ``enable_shared_frames()`` (e.g. as a
+process-pool initializer).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .disk_cache import cache_path
+from .pbp_loader import _STR_DTYPE
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+# Temp dirs older than this belong to a writer that died mid-store.
+_TMP_MAX_AGE = 3600.0
+_enabled = os.getenv("PLAYER_CARDS_PBP_SHARED", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def shared_frames_enabled() -> bool:
+    return _enabled
+
+
+def enable_shared_frames(on: bool = True) -> None:
+    global _enabled
+    _enabled = on
+
+
+def shared_root() -> Path:
+    override = os.getenv("PLAYER_CARDS_PBP_SHARED_DIR", "").strip()
+    return Path(override) if override else cache_path("pbp_shared")
+
+
+def _entry_dir(path: Path) -> Path | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    key = f"{STORE_VERSION}:{path.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+    return shared_root() / hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+def store_frame(path: Path, df: pd.DataFrame) -> bool:
+    """Persist one normalized frame for ``path``; False when it can't be encoded."""
+    entry = _entry_dir(path)
+    if entry is None:
+        return False
+    if (entry / "meta.json").is_file():
+        return True
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=entry.parent))
+    columns: list[dict[str, Any]] = []
+    try:
+        for i, col in enumerate(df.columns):
+            s = df[col]
+            spec: dict[str, Any] = {"name": str(col), "file": f"c{i}.npy"}
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                codes, cats = s.cat.codes.to_numpy(), s.cat.categories
+            elif s.dtype.kind in "biuf":
+                np.save(tmp / spec["file"], s.to_numpy())
+                columns.append(spec)
+                continue
+            else:
+                codes, cats = pd.factorize(s)
+                spec["dtype"] = str(s.dtype)
+            if len(cats) and not all(isinstance(c, str) for c in cats):
+                return False
+            spec["categories"] = [str(c) for c in cats]
+            # Save codes in the width pandas picks itself so loading never copies them.
+            np.save(tmp / spec["file"], pd.Categorical.from_codes(codes, list(spec["categories"])).codes)
+            columns.append(spec)
+        (tmp / "meta.json").write_text(
+            json.dumps({"source": str(path), "rows": len(df), "columns": columns}), encoding="utf-8"
+        )
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another worker stored the same game first.
+            pass
+        return True
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_frame(path: Path) -> pd.DataFrame | None:
+    """Memory-mapped frame for ``path`` when the store has its current version."""
+    entry = _entry_dir(path)
+    if entry is None:
+        return None
+    try:
+        meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    data: dict[str, Any] = {}
+    try:
+        for spec in meta["columns"]:
+            arr = np.load(entry / spec["file"], mmap_mode="r", allow_pickle=False)
+            if "categories" in spec:
+                cats = pd.Index(spec["categories"], dtype=_STR_DTYPE)
+                arr = pd.Categorical.from_codes(arr, dtype=pd.CategoricalDtype(cats), validate=False)
+                if "dtype" in spec:
+                    # Plain string column: every row points at one shared category string.
+                    arr = pd.array(np.asarray(arr, dtype=object), dtype=pd.api.types.pandas_dtype(spec["dtype"]))
+            data[spec["name"]] = arr
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Shared PBP entry for %s unreadable: %s", path.name, exc)
+        return None
+    return pd.DataFrame(data, copy=False)
+
+
+def prune_store(keep: list[Path] | None = None) -> int:
+    """Drop store entries; returns the number removed.
+
+    With ``keep``, every entry not for one of those files goes. Without it,
+    only stale entries do: the source CSV is gone or has changed since it was
+    stored, or a temp dir was abandoned by a crashed writer.
+    """
+    root = shared_root()
+    if not root.is_dir():
+        return 0
+    wanted = None if keep is None else {e.name for e in (_entry_dir(Path(p)) for p in keep) if e is not None}
+    removed = 0
+    for entry in root.iterdir():
+        if not entry.is_dir():
+            continue
+        if entry.name.startswith(".tmp-"):
+            try:
+                stale = time.time() - entry.stat().st_mtime > _TMP_MAX_AGE
+            except OSError:
+                continue
+        elif wanted is not None:
+            stale = entry.name not in wanted
+        else:
+            stale = _is_stale(entry)
+        if stale:
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _is_stale(entry: Path) -> bool:
+    try:
+        meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return True
+    current = _entry_dir(Path(meta.get("source") or ""))
+    return current is None or current.name != entry.name
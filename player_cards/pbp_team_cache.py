@@ -9,10 +9,14 @@ import pandas as pd
 
 from .disk_cache import pbp_files_fingerprint
 from .instat_source import is_pbp_game_csv
+from .pbp_shared_store import load_frame, shared_frames_enabled, store_frame
+from .single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
 _frames: dict[str, list[tuple[Path, pd.DataFrame]]] = {}
+# Live builds on the API's cpu threads and the warm thread can ask for the same team at once.
+_warm_flights = SingleFlight()
 
 
 def _normalize_df(df: pd.DataFrame) -> pd.DataFrame:
@@ -39,23 +43,61 @@ def warm_team_pbp(files: list[Path]) -> str | None:
     if not files:
         return None
     fp = pbp_files_fingerprint(files)
+    if fp not in _frames:
+        _warm_flights.do(fp, lambda: _load_team(fp, files))
+    return fp
+
+
+def _load_team(fp: str, files: list[Path]) -> None:
     if fp in _frames:
-        return fp
+        return
+    shared = shared_frames_enabled()
     loaded: list[tuple[Path, pd.DataFrame]] = []
     for path in files:
         if not is_pbp_game_csv(path):
             continue
         try:
-            df = _normalize_df(pd.read_csv(path))
-            if "player" not in df.columns or "action" not in df.columns:
-                logger.warning("Skip non-PBP CSV %s (missing player/action)", path.name)
-                continue
+            df = load_frame(path) if shared else None
+            if df is None:
+                df = _read_game(path)
+                if df is None:
+                    continue
+                if shared and store_frame(path, df):
+                    # Map the stored copy so this process shares pages too.
+                    mapped = load_frame(path)
+                    if mapped is not None:
+                        df = mapped
             loaded.append((path, df))
         except Exception as exc:
             logger.warning("Skip PBP file %s: %s", path.name, exc)
     _frames[fp] = loaded
-    logger.info("Warmed %s PBP games in memory (fp=%s)", len(loaded), fp)
-    return fp
+    logger.info("Warmed %s PBP games in memory (fp=%s, shared=%s)", len(loaded), fp, shared)
+
+
+def _read_game(path: Path) -> pd.DataFrame | None:
+    df = _normalize_df(pd.read_csv(path))
+    if "player" not in df.columns or "action" not in df.columns:
+        logger.warning("Skip non-PBP CSV %s (missing player/action)", path.name)
+        return None
+    return df
+
+
+def publish_team_pbp(files: list[Path]) -> int:
+    """Write every game of ``files`` to the shared store without keeping them
+    in this process, so pool workers map them instead of each parsing the CSVs."""
+    published = 0
+    for path in files:
+        if not is_pbp_game_csv(path):
+            continue
+        try:
+            if load_frame(path) is None:
+                df = _read_game(path)
+                if df is None or not store_frame(path, df):
+                    continue
+            published += 1
+        except Exception as exc:
+            logger.warning("Skip PBP file %s: %s", path.name, exc)
+    return published
 
 
 def get_team_frames(files: list[Path]) -> list[tuple[Path, pd.DataFrame]]:
@@ -65,6 +107,34 @@ def get_team_frames(files: list[Path]) -> list[tuple[Path, pd.DataFrame]]:
     return _frames.get(fp, [])
 
 
+def cached_team_frames(files: list[Path]) -> list[tuple[Path, pd.DataFrame]] | None:
+    """Frames for ``files`` if they are already warm, without loading anything."""
+    if not files:
+        return None
+    return _frames.get(pbp_files_fingerprint(files))
+
+
+def select_team_frames(paths: list[Path], files: list[Path]) -> list[tuple[Path, pd.DataFrame]]:
+    """Warm frames of ``files`` restricted to ``paths``, in ``paths`` order.
+
+    Paths outside ``files`` (or skipped while warming) are read directly, so
+    a caller passing the wrong team list still sees every game it asked for.
+    """
+    by_path = {p: df for p, df in get_team_frames(files)}
+    missing = [p for p in paths if p not in by_path]
+    if missing:
+        logger.info("Reading %s PBP files not in the warm team set", len(missing))
+        for path in missing:
+            try:
+                df = _read_game(path)
+            except Exception as exc:
+                logger.warning("Skip PBP file %s: %s", path.name, exc)
+                continue
+            if df is not None:
+                by_path[path] = df
+    return [(p, by_path[p]) for p in paths if p in by_path]
+
+
 def get_frame(path: Path, files: list[Path]) -> pd.DataFrame | None:
     for p, df in get_team_frames(files):
         if p == path or p.name == path.name:
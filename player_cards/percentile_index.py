@@ -0,0 +1,155 @@
+"""Per-season league percentile populations, sorted once and ranked by bisection.
+
+A ``PercentileIndex`` holds one sorted float array per metric. Ranking a value
+is two ``searchsorted`` calls and gives the same tie-splitting "mean rank"
+percentile as ``pbp_display._pct_rank``. Indexes are memoized per
+(league, kind, season, fingerprint), keeping the ``MEMO_SIZE`` most recently
+used, and persisted under the cache root as ``.npz``.
+A new fingerprint, from fresh PBP files or a changed population, replaces the
+season's stale file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .disk_cache import cache_path, pbp_files_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Every fingerprint change (new PBP files, fresh API rows) mints a new key.
+MEMO_SIZE = 32
+
+_indexes: OrderedDict[tuple[str, str, str], PercentileIndex] = OrderedDict()
+
+
+@dataclass(eq=False)
+class PercentileIndex:
+    metrics: dict[str, np.ndarray] = field(default_factory=dict)
+    pool_size: int = 0
+
+    def __post_init__(self) -> None:
+        self.metrics = {k: np.sort(np.asarray(v, dtype=float)) for k, v in self.metrics.items()}
+
+    def population(self, metric: str) -> np.ndarray:
+        return self.metrics.get(metric, np.empty(0))
+
+    def rank(self, metric: str, value: float | None) -> float | None:
+        """Share of the population below ``value``, ties counting half (3 dp)."""
+        pop = self.metrics.get(metric)
+        if value is None or pop is None or not len(pop):
+            return None
+        value = float(value)
+        if np.isnan(value):
+            return 0.0
+        below = int(np.searchsorted(pop, value, side="left"))
+        tied = int(np.searchsorted(pop, value, side="right")) - below
+        return round((below + 0.5 * tied) / len(pop), 3)
+
+    def ranks(self, values: dict[str, float]) -> dict[str, float | None]:
+        """Rank every indexed metric plus any extra keys of ``values`` (None when unranked)."""
+        return {k: self.rank(k, values.get(k)) for k in {*self.metrics, *values}}
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        names = list(self.metrics)
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                names=np.array(names, dtype=str),
+                pool_size=np.array(self.pool_size),
+                **{f"m{i}": self.metrics[n] for i, n in enumerate(names)},
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> PercentileIndex:
+        with np.load(path, allow_pickle=False) as z:
+            names = [str(n) for n in z["names"]]
+            return cls(
+                metrics={n: z[f"m{i}"] for i, n in enumerate(names)},
+                pool_size=int(z["pool_size"]),
+            )
+
+
+def metric_value(row: Any, path: tuple[str, ...]) -> float | None:
+    """Numeric value at a nested dict ``path`` (None when missing or non-numeric)."""
+    v: Any = row
+    for key in path:
+        v = (v or {}).get(key) if isinstance(v, dict) else None
+    return float(v) if isinstance(v, (int, float)) else None
+
+
+def build_percentile_index(
+    rows: Iterable[Any],
+    metrics: dict[str, tuple[str, ...]],
+) -> PercentileIndex:
+    """One population per label from the nested-dict ``metrics`` paths of ``rows``."""
+    rows = list(rows)
+    pops: dict[str, list[float]] = {label: [] for label in metrics}
+    for row in rows:
+        for label, path in metrics.items():
+            v = metric_value(row, path)
+            if v is not None:
+                pops[label].append(v)
+    return PercentileIndex(metrics=pops, pool_size=len(rows))
+
+
+def rows_fingerprint(rows: Any) -> str:
+    """Content digest of a population, for sources without PBP files (APIs)."""
+    blob = json.dumps(rows, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def files_fingerprint(files: Iterable[Path]) -> str:
+    """``pbp_files_fingerprint`` made safe for use in a file name."""
+    return pbp_files_fingerprint(sorted({Path(p) for p in files})).replace(":", "-")
+
+
+def percentile_index(
+    kind: str,
+    season: str,
+    fingerprint: str,
+    build: Callable[[], PercentileIndex],
+    *,
+    league: str,
+) -> PercentileIndex:
+    """Shared index for one population, built once per fingerprint and reused from disk."""
+    kind = f"{league}-{kind}"
+    key = (kind, str(season), fingerprint)
+    hit = _indexes.get(key)
+    if hit is not None:
+        _indexes.move_to_end(key)
+        return hit
+    path = cache_path("percentiles", str(season), f"{kind}-{fingerprint}.npz")
+    index = None
+    if path.is_file():
+        try:
+            index = PercentileIndex.load(path)
+        except Exception as exc:
+            logger.warning("Rebuilding unreadable percentile index %s: %s", path, exc)
+    if index is None:
+        index = build()
+        for stale in path.parent.glob(f"{kind}-*.npz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        try:
+            index.save(path)
+        except OSError as exc:
+            logger.warning("Could not persist percentile index: %s", exc)
+        logger.info("Built %s percentile index for %s: pool=%s (fp=%s)", kind, season, index.pool_size, fingerprint)
+    _indexes[key] = index
+    while len(_indexes) > MEMO_SIZE:
+        _indexes.popitem(last=False)
+    return index
@@ -10,6 +10,7 @@ from typing import Any
 import httpx
 
 from .disk_cache import cache_path, load_json, save_json
+from .timing import timed
 
 
 def _image_size(data: bytes) -> tuple[int, int] | None:
@@ -73,6 +74,7 @@ def fetch_photo(url: str) -> tuple[bytes, str]:
     return resp.content, mime
 
 
+@timed("photo")
 def embed_photo(url: str) -> tuple[str, int | None, int | None]:
     """Return (data URL or original URL, width, height)."""
     if not url:
@@ -0,0 +1,258 @@
+"""Persistent player identity table: one integer id per player across name sources.
+
+Every raw player string seen in PBP frames is interned once as an integer name
+id. A player row carries the external ids we know (NHL id, HockeyTech id, EP
+slug) plus the set of name ids that matched it. The fuzzy
+``_match_player_name`` runs only for names interned since that player was last
+checked (a ``checked_upto`` watermark), so per-card filtering is an integer
+``isin`` over name ids instead of string matching every unique name of every
+frame. The name → id dict and each player's variant ids stay in memory.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .disk_cache import CACHE_ROOT
+from .instat_source import _clean_player_name, _match_player_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDENTITY_PATH = Path(
+    os.getenv("PLAYER_CARDS_IDENTITY_DB", str(CACHE_ROOT / "player_identity.db"))
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS names (
+    name_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS players (
+    player_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    nhl_id INTEGER UNIQUE,
+    hockeytech_id TEXT UNIQUE,
+    ep_slug TEXT UNIQUE,
+    checked_upto INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS player_names (
+    player_id INTEGER NOT NULL,
+    name_id INTEGER NOT NULL,
+    PRIMARY KEY (player_id, name_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_players_key ON players(name_key);
+"""
+
+_EXTERNAL_IDS = ("nhl_id", "hockeytech_id", "ep_slug")
+
+
+def name_key(name: str) -> str:
+    """Order-free key in the matcher's own normalization ("Last First" == "First Last")."""
+    return " ".join(sorted(_clean_player_name(str(name)).split()))
+
+
+class PlayerIdentity:
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path or DEFAULT_IDENTITY_PATH)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            # Server workers share the file; WAL keeps interning from blocking readers.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error as exc:
+            logger.warning("Player identity table unavailable (%s); using an in-memory table", exc)
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.commit()
+        self._lock = threading.RLock()
+        self._name_ids: dict[str, int] = {
+            r["name"]: r["name_id"] for r in self._conn.execute("SELECT name_id, name FROM names")
+        }
+        self._top_id = max(self._name_ids.values(), default=0)
+        self._player_ids: dict[tuple[Any, ...], int] = {}
+        self._variants: dict[int, tuple[int, np.ndarray]] = {}
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ── names ────────────────────────────────────────────────────────────
+
+    def intern(self, names: Iterable[str]) -> list[int]:
+        """Name ids for raw strings, adding unseen ones."""
+        names = [str(n) for n in names]
+        with self._lock:
+            new = [n for n in dict.fromkeys(names) if n not in self._name_ids]
+            if new:
+                self._conn.executemany("INSERT OR IGNORE INTO names(name) VALUES(?)", [(n,) for n in new])
+                marks = ", ".join("?" * len(new))
+                for r in self._conn.execute(f"SELECT name_id, name FROM names WHERE name IN ({marks})", new):
+                    self._name_ids[r["name"]] = r["name_id"]
+                    self._top_id = max(self._top_id, r["name_id"])
+                self._conn.commit()
+            return [self._name_ids[n] for n in names]
+
+    def name_ids(self, values: pd.Series) -> np.ndarray:
+        """Per-row name ids of a player column (-1 for missing)."""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            uniques = values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)
+        lookup = np.asarray(self.intern(uniques), dtype=np.int64)
+        out = np.full(len(codes), -1, dtype=np.int64)
+        present = codes >= 0
+        out[present] = lookup[codes[present]]
+        return out
+
+    # ── players ──────────────────────────────────────────────────────────
+
+    def player_id(self, name: str, **external: Any) -> int:
+        """Canonical id for a player, found by any known external id
+        (``nhl_id``, ``hockeytech_id``, ``ep_slug``) or else by name; created
+        on first sight. New external ids are attached to the found row."""
+        external = {k: v for k, v in external.items() if k in _EXTERNAL_IDS and v not in (None, "")}
+        key = name_key(name)
+        memo = (key, *sorted(external.items()))
+        with self._lock:
+            if memo in self._player_ids:
+                return self._player_ids[memo]
+            self._player_ids[memo] = pid = self._resolve_player(name, key, external)
+            return pid
+
+    def _resolve_player(self, name: str, key: str, external: dict[str, Any]) -> int:
+        with self._lock:
+            row = None
+            for col, value in external.items():
+                row = self._conn.execute(f"SELECT * FROM players WHERE {col} = ?", (value,)).fetchone()
+                if row is not None:
+                    break
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT * FROM players WHERE name_key = ? ORDER BY player_id LIMIT 1", (key,)
+                ).fetchone()
+                # Same name, different external id: a different player.
+                if row is not None and any(row[c] not in (None, external[c]) for c in external):
+                    row = None
+            if row is None:
+                cur = self._conn.execute(
+                    "INSERT INTO players(name, name_key, nhl_id, hockeytech_id, ep_slug) VALUES(?, ?, ?, ?, ?)",
+                    (str(name).strip(), key, *(external.get(c) for c in _EXTERNAL_IDS)),
+                )
+                self._conn.commit()
+                return int(cur.lastrowid)
+            missing = {c: v for c, v in external.items() if row[c] is None}
+            if missing:
+                try:
+                    self._conn.execute(
+                        f"UPDATE players SET {', '.join(f'{c} = ?' for c in missing)} WHERE player_id = ?",
+                        (*missing.values(), row["player_id"]),
+                    )
+                    self._conn.commit()
+                except sqlite3.IntegrityError as exc:
+                    logger.warning("Player identity conflict for %s: %s", name, exc)
+            return int(row["player_id"])
+
+    def variant_ids(self, player_id: int) -> np.ndarray:
+        """Name ids that match the player, checking only names interned since the last call."""
+        with self._lock:
+            top = self._top_id
+            cached = self._variants.get(player_id)
+            if cached is not None and cached[0] >= top:
+                return cached[1]
+            row = self._conn.execute(
+                "SELECT name, checked_upto FROM players WHERE player_id = ?", (player_id,)
+            ).fetchone()
+            if row is None:
+                return np.empty(0, dtype=np.int64)
+            if row["checked_upto"] < top:
+                fresh = self._conn.execute(
+                    "SELECT name_id, name FROM names WHERE name_id > ? AND name_id <= ?",
+                    (row["checked_upto"], top),
+                ).fetchall()
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO player_names(player_id, name_id) VALUES(?, ?)",
+                    [(player_id, r["name_id"]) for r in fresh if _match_player_name(r["name"], row["name"])],
+                )
+                self._conn.execute("UPDATE players SET checked_upto = ? WHERE player_id = ?", (top, player_id))
+                self._conn.commit()
+            ids = np.fromiter(
+                (r[0] for r in self._conn.execute(
+                    "SELECT name_id FROM player_names WHERE player_id = ? ORDER BY name_id", (player_id,)
+                )),
+                dtype=np.int64,
+            )
+            self._variants[player_id] = (top, ids)
+            return ids
+
+    def player_rows(self, values: pd.Series, name: str, **external: Any) -> np.ndarray:
+        """Boolean mask of ``values`` (a player column) belonging to the player."""
+        ids = self.name_ids(values)
+        return np.isin(ids, self.variant_ids(self.player_id(name, **external)))
+
+
+_table: PlayerIdentity | None = None
+_table_lock = threading.Lock()
+
+
+def identity_table() -> PlayerIdentity:
+    """Process-wide identity table (opened on first use)."""
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = PlayerIdentity()
+        return _table
+
+
+def player_rows(values: pd.Series, name: str) -> np.ndarray:
+    """Rows of a player column that belong to ``name``, via the shared table.
+
+    A locked or corrupt identity database must not fail a card: on any SQLite
+    error every distinct name is string-matched instead.
+    """
+    try:
+        return identity_table().player_rows(values, name)
+    except sqlite3.Error as exc:
+        logger.warning("Player identity lookup failed for %s (%s); matching names directly", name, exc)
+    codes, uniques = pd.factorize(values)
+    hits = np.array([_match_player_name(str(u), name) for u in uniques], dtype=bool)
+    out = np.zeros(len(codes), dtype=bool)
+    present = codes >= 0
+    out[present] = hits[codes[present]]
+    return out
+
+
+def register_bio(bio: dict[str, Any], *, league: str | None = None) -> int | None:
+    """Attach a resolved bio's external ids to the player's canonical id."""
+    name = bio.get("name")
+    if not name:
+        return None
+    pid = bio.get("player_id")
+    ids: dict[str, Any] = {"ep_slug": bio.get("ep_slug")}
+    league = str(league or bio.get("league") or "nhl").lower()
+    if pid not in (None, "") and league == "nhl":
+        try:
+            ids["nhl_id"] = int(pid)
+        except (TypeError, ValueError):
+            pass
+    elif pid not in (None, "") and league == "pwhl":
+        ids["hockeytech_id"] = str(pid)
+    try:
+        return identity_table().player_id(name, **ids)
+    except sqlite3.Error as exc:
+        logger.warning("Player identity update failed for %s: %s", name, exc)
+        return None
@@ -5,10 +5,13 @@ from __future__ import annotations
 import threading
 from pathlib import Path
 
+from .timing import timed
+
 # Threading lock to serialize all Playwright calls to prevent thread-safety deadlocks
 _lock = threading.Lock()
 
 
+@timed("png")
 def html_to_png(
     html_path: Path | str,
     png_path: Path | str,
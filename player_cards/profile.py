@@ -6,6 +6,7 @@ import json
 import logging
 import os
 import re
+import sqlite3
 import tempfile
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
@@ -23,12 +24,10 @@ from .leagues import get_league, team_full_name
 from .nhl_bio import MUG_SEASON, fetch_nhl_bio, fetch_player_season_teams, fetch_undrafted_prospect_bio
 from .nhl_instat import instat_season_id as resolve_instat_season_id
 from .pbp_display import _pbp_values, build_pbp_display_profile, compute_team_metric_percentiles
-from .pbp_metrics import aggregate_player_pbp, aggregate_player_pbp_multi
-from .pbp_team_cache import get_team_frames, warm_team_pbp
 from .png_export import html_to_png
 from .pwhl_bio import fetch_pwhl_bio, roster_from_pbp
-from .qoc_qot import compute_player_qoc_qot
 from .team_colors import get_team_colors
+from .timing import propagate, timed
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +51,7 @@ def _lookup_player_pcts(
     return None
 
 
+@timed("percentiles")
 def _team_percentiles_from_pbp(
     team: str,
     pbp_files: list[Path],
@@ -68,6 +68,7 @@ def _team_percentiles_from_pbp(
     from collections import defaultdict
 
     from .pbp_metrics import COUNT_MAP, _resolve_team_name
+    from .pbp_team_cache import get_team_frames, warm_team_pbp
     from .pwhl_bio import _is_team_match
     from .qoc_qot import compute_microstat_game_score
 
@@ -177,6 +178,16 @@ def _team_percentiles_from_pbp(
     return compute_team_metric_percentiles(metrics)
 
 
+def _club_box(agg: dict[str, Any]) -> dict[str, int]:
+    return {
+        "gp": int(agg.get("games_played") or 0),
+        "g": int(agg.get("goals") or 0),
+        "a": int(agg.get("assists") or 0),
+        "tp": int(agg.get("points") or 0),
+    }
+
+
+@timed("pbp_aggregate")
 def _cached_pbp_aggregate(
     player_id: int | None,
     player_name: str,
@@ -208,8 +219,13 @@ def _cached_pbp_aggregate(
     ):
         logger.debug("PBP aggregate cache hit for %s", player_name)
         return hit
+    from .pbp_metrics import aggregate_player_pbp, aggregate_player_pbp_clubs
+
     if file_groups and len(file_groups) > 1:
-        result = aggregate_player_pbp_multi(player_name, file_groups, league=league)
+        clubs = aggregate_player_pbp_clubs(player_name, file_groups, league=league)
+        result = clubs["combined"]
+        if result:
+            result["by_club"] = {club: _club_box(agg) for club, agg in clubs["by_club"].items()}
     else:
         result = aggregate_player_pbp(
             player_name, team, files=files, team_games=team_games, league=league
@@ -238,6 +254,7 @@ def _store_pbp_incomplete(profile: dict[str, Any]) -> bool:
     return actual_gp < expected_gp - 1
 
 
+@timed("qoc_qot")
 def _cached_qoc_qot(
     player_id: int | None,
     player_name: str,
@@ -250,6 +267,8 @@ def _cached_qoc_qot(
     hit = load_json(path, ttl_seconds=AGG_CACHE_TTL)
     if isinstance(hit, dict):
         return hit
+    from .qoc_qot import compute_player_qoc_qot
+
     result = compute_player_qoc_qot(files, player_name, team_full)
     if result:
         save_json(path, result)
@@ -340,6 +359,7 @@ def _files_for_team(
     return files, meta
 
 
+@timed("pbp_files")
 def _resolve_pbp_files(
     team: str,
     pbp_dir: Path,
@@ -383,24 +403,17 @@ def _resolve_pbp_files(
                 discovered = discover_team_pbp_files(club, league=league)
                 if not discovered:
                     continue
-                from .pbp_harvest import _match_id_from_path
-                import csv as _csv
+                from .pbp_harvest import _match_id_from_path, player_appearances
 
+                played = {
+                    path
+                    for path, row_team, _ in player_appearances(player_name, files=discovered)
+                    if not row_team or _club_key_match(club, row_team)
+                }
                 club_files: dict[str, Path] = {}
                 for path in discovered:
-                    mid = _match_id_from_path(path) or path.name
-                    try:
-                        with path.open(encoding="utf-8", errors="ignore") as fh:
-                            for row in _csv.DictReader(fh):
-                                if not _match_player_name(str(row.get("player") or ""), player_name):
-                                    continue
-                                row_team = str(row.get("team") or "").strip()
-                                if row_team and not _club_key_match(club, row_team):
-                                    continue
-                                club_files[mid] = path
-                                break
-                    except Exception:
-                        continue
+                    if path in played:
+                        club_files[_match_id_from_path(path) or path.name] = path
                 if club_files:
                     paths = sorted(club_files.values(), key=lambda p: p.name)
                     file_groups.append((club, paths, len(paths)))
@@ -575,6 +588,35 @@ def _use_card_store() -> bool:
     return os.getenv("PLAYER_CARDS_USE_STORE", "1").strip().lower() not in ("0", "false", "no")
 
 
+@timed("percentiles")
+def _stored_player_percentiles(
+    team: str,
+    season: str,
+    per_game: dict[str, Any],
+    *,
+    league: str = "nhl",
+    pbp_fingerprint: str | None = None,
+    store_path: Path | str | None = None,
+) -> dict[str, float | None] | None:
+    """Rank one player's PBP rates against the team populations ``build_store`` saved.
+
+    None when the store has no table for the team (or, with ``pbp_fingerprint``,
+    one built from other PBP files).
+    """
+    try:
+        with open_store(store_path) as store:
+            index = store.percentile_index(
+                league, season, f"team:{team.upper()}", pbp_fingerprint=pbp_fingerprint
+            )
+    except sqlite3.Error as exc:
+        logger.warning("Stored percentiles unavailable for %s: %s", team, exc)
+        return None
+    if index is None:
+        return None
+    vals = {k: v for k, v in _pbp_values(per_game).items() if not k.startswith("_")}
+    return index.ranks(vals)
+
+
 def _team_percentiles_from_store(
     team: str,
     season: str,
@@ -582,7 +624,10 @@ def _team_percentiles_from_store(
     league: str = "nhl",
     store_path: Path | str | None = None,
 ) -> dict[str, dict[str, float | None]]:
-    """Recompute team PBP metric percentiles from profiles already in the card store."""
+    """Recompute team PBP metric percentiles from profiles already in the card store.
+
+    Fallback for stores built before the ``percentiles`` table existed.
+    """
     metrics: dict[str, dict[str, float]] = {}
     with open_store(store_path) as store:
         rows = store._conn.execute(
@@ -647,15 +692,19 @@ def _enrich_stored_profile(profile: dict[str, Any]) -> dict[str, Any]:
 
     season = str(sources.get("a3z_season") or cfg.default_season)
     store_path = sources.get("store_path")
-    pct_by_name = _team_percentiles_from_store(
-        tri, season, league=league, store_path=store_path
+    pcts = _stored_player_percentiles(
+        tri, season, pbp.get("per_game") or {}, league=league, store_path=store_path
     )
-    name = str(bio.get("name") or "")
+    if pcts is None:
+        pct_by_name = _team_percentiles_from_store(
+            tri, season, league=league, store_path=store_path
+        )
+        pcts = _lookup_player_pcts(pct_by_name, str(bio.get("name") or ""))
     display = build_pbp_display_profile(
         pbp,
         None,
         season=season,
-        percentiles=_lookup_player_pcts(pct_by_name, name),
+        percentiles=pcts,
     )
     if not display:
         return profile
@@ -717,6 +766,11 @@ def build_player_card_profile(
             logger.info("Card store hit for %s", player_name)
             return _enrich_stored_profile(stored)
 
+    # The PBP stack (pandas/numpy) loads only once a card is actually built.
+    from .pbp_metrics import aggregate_player_pbp
+    from .pbp_team_cache import warm_team_pbp
+    from .player_identity import register_bio
+
     if cfg.uses_nhl_api:
         bio = bio or fetch_nhl_bio(player_name, team=team)
     else:
@@ -733,12 +787,12 @@ def build_player_card_profile(
 
     with ThreadPoolExecutor(max_workers=2) as pool:
         cap_future = (
-            pool.submit(fetch_cap_info, bio["name"], player_id=bio.get("player_id"))
+            pool.submit(propagate(fetch_cap_info), bio["name"], player_id=bio.get("player_id"))
             if cfg.uses_cap
             else None
         )
         pbp_future = pool.submit(
-            _resolve_pbp_files,
+            propagate(_resolve_pbp_files),
             tri,
             pbp_dir,
             league=league,
@@ -756,6 +810,7 @@ def build_player_card_profile(
 
     if not cfg.uses_nhl_api:
         bio = fetch_pwhl_bio(player_name, tri, league=league, files=pbp_files)
+    register_bio(bio, league=league)
 
     warm_team_pbp(pbp_files)
     match_ids = pbp_meta.get("match_ids") or []
@@ -774,19 +829,16 @@ def build_player_card_profile(
 
     # Per-club box scores for dual-roster season lines (never use combined PBP).
     pbp_by_club: dict[str, dict[str, int]] = {}
-    if file_groups and len(file_groups) > 1:
+    if pbp and isinstance(pbp.get("by_club"), dict):
+        pbp_by_club = dict(pbp.pop("by_club"))
+    elif file_groups and len(file_groups) > 1:
+        # Aggregate cached before per-club boxes were stored alongside it.
         for club, files, tg in file_groups:
             club_agg = aggregate_player_pbp(
                 bio["name"], club, files=files, team_games=tg, league=league
             )
-            if not club_agg:
-                continue
-            pbp_by_club[club] = {
-                "gp": int(club_agg.get("games_played") or 0),
-                "g": int(club_agg.get("goals") or 0),
-                "a": int(club_agg.get("assists") or 0),
-                "tp": int(club_agg.get("points") or 0),
-            }
+            if club_agg:
+                pbp_by_club[club] = _club_box(club_agg)
     if pbp_by_club:
         pbp_meta = dict(pbp_meta)
         pbp_meta["pbp_by_club"] = pbp_by_club
@@ -797,6 +849,14 @@ def build_player_card_profile(
     a3z_from_api = False
     # Caller may pass per-player metric→pct (build_store) OR leave None for live compute.
     player_pcts: dict[str, float | None] | None = pbp_percentiles
+    if player_pcts is None and pbp and pbp_files and len(file_groups or []) <= 1 and _use_card_store():
+        player_pcts = _stored_player_percentiles(
+            tri,
+            season,
+            pbp.get("per_game") or {},
+            league=league,
+            pbp_fingerprint=pbp_files_fingerprint(pbp_files),
+        )
     if player_pcts is None and pbp_files:
         pct_by_name = _team_percentiles_from_pbp(
             tri,
@@ -14,11 +14,6 @@ import httpx
 from .disk_cache import cache_path, load_json, save_json
 from .photo_layout import fetch_photo
 
-try:
-    from PIL import Image
-except ImportError:  # pragma: no cover
-    Image = None  # type: ignore[misc, assignment]
-
 OSC_PICTURE_BASE = "https://www.oursportscentral.com/graphics/pictures/"
 INDEX_TTL = 86_400 * 7
 
@@ -75,6 +70,10 @@ def _is_headshot_dimensions(width: int | None, height: int | None) -> bool:
 
 def is_studio_portrait(data: bytes, *, width: int | None = None, height: int | None = None) -> bool:
     """Detect media-day portraits (white/grey studio backdrops), not in-game action."""
+    try:
+        from PIL import Image
+    except ImportError:  # pragma: no cover
+        Image = None  # type: ignore[misc, assignment]
     if Image is None:
         return bool(width and height and _is_headshot_dimensions(width, height))
     if width and height and _is_headshot_dimensions(width, height):
@@ -7,8 +7,8 @@ from pathlib import Path
 from typing import Any
 
 from .leagues import PWHL_HOCKEYTECH_TEAM_IDS, _ascii_fold, get_league, team_full_name
-from .pbp_team_cache import get_team_frames, warm_team_pbp
 from .pwhl_photos import _display_name, lookup_pwhl_player, presentation_name, refresh_pwhl_bio, search_pwhl_player
+from .timing import timed
 
 
 def _slug_id(name: str, team: str) -> int:
@@ -48,8 +48,11 @@ def roster_from_pbp(files: list[Path], team_abbrev: str, *, league: str = "pwhl"
     team_full = cfg.teams.get(tri.upper() if league != "prospect" else tri, tri)
     if league == "prospect":
         team_full = team_abbrev
-    warm_team_pbp(files)
     from collections import Counter
+
+    from .pbp_team_cache import get_team_frames, warm_team_pbp
+
+    warm_team_pbp(files)
     player_games = Counter()
     for _path, df in get_team_frames(files):
         if "player" not in df.columns:
@@ -83,6 +86,7 @@ def roster_from_pbp(files: list[Path], team_abbrev: str, *, league: str = "pwhl"
     ]
 
 
+@timed("bio")
 def fetch_pwhl_bio(
     player_name: str,
     team: str | None = None,
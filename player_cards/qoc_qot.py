@@ -17,6 +17,8 @@ NZ_MAX = 38.10
 
 SHIFT_ACTIONS = {"Even strength shifts", "Power play shifts", "Penalty kill shifts"}
 DEPLOYMENT_SHIFT = "Even strength shifts"
+# Bump when QOC/QOT semantics change so cached league contexts are rebuilt.
+_CONTEXT_VERSION = 2
 PLAY_ACTIONS = {
     "Shots", "Shots on goal", "Goals", "Missed shots", "Blocked shots",
     "Passes", "Entries via stickhandling", "Entries via pass", "Entries via dump in",
@@ -199,57 +201,55 @@ def _lookup_gs(player: str, game_id: str, gs_game: dict[tuple[str, str], float],
     return gs_season.get(player, float("nan"))
 
 
+def _probable_goalies(player: pd.Series, action: pd.Series) -> set[str]:
+    """Vector form of ``_is_probable_goalie`` for every player in a game."""
+    shift_n = action.str.contains("shifts", case=False, regex=False, na=False).groupby(player).sum()
+    play_n = action.isin(PLAY_ACTIONS).groupby(player).sum()
+    return set(shift_n.index[(shift_n >= 5) & (play_n <= 2)])
+
+
 def _qoc_qot_game(df: pd.DataFrame, team_name: str, game_id: str, gs_game: dict, gs_season: dict) -> pd.DataFrame:
-    shifts = df[df["action"].isin(SHIFT_ACTIONS) & df["player"].notna() & (df["player"] != "")].copy()
+    """Per-player QOC/QOT over one game's shift-start blocks.
+
+    Shift rows sharing a (start, action) form one block. Every ``team_name``
+    skater in a block gets one shift event: QOC is the mean game score of the
+    opposing skaters in the block, QOT that of his teammates in it.
+    """
+    empty = pd.DataFrame(columns=["player", "qoc", "qot", "shift_events"])
+    shifts = df[df["action"].isin(SHIFT_ACTIONS) & df["player"].notna() & (df["player"] != "")]
     if shifts.empty:
-        return pd.DataFrame(columns=["player", "qoc", "qot", "shift_events"])
-
-    is_goalie_cache = {}
-    def check_goalie(p: str) -> bool:
-        if p not in is_goalie_cache:
-            is_goalie_cache[p] = _is_probable_goalie(p, df)
-        return is_goalie_cache[p]
-
-    rows: list[dict[str, Any]] = []
-    for (start, action), block in shifts.groupby(["start", "action"], sort=False):
-        team_players = block[block["team"] == team_name]["player"].unique().tolist()
-        if not team_players:
-            continue
-        opp_players = block[block["team"] != team_name]["player"].unique().tolist()
-        opp_players = [p for p in opp_players if not check_goalie(p)]
-        skaters = [p for p in team_players if not check_goalie(p)]
-
-        opp_gs = [_lookup_gs(p, game_id, gs_game, gs_season) for p in opp_players]
-        opp_gs = [g for g in opp_gs if np.isfinite(g)]
-        qoc_val = float(np.mean(opp_gs)) if opp_gs else float("nan")
-
-        for pl in skaters:
-            mates = [p for p in skaters if p != pl]
-            mate_gs = [_lookup_gs(p, game_id, gs_game, gs_season) for p in mates]
-            mate_gs = [g for g in mate_gs if np.isfinite(g)]
-            qot_val = float(np.mean(mate_gs)) if mate_gs else float("nan")
-            rows.append({"player": pl, "qoc": qoc_val, "qot": qot_val, "shift_events": 1})
-
-    if not rows:
-        return pd.DataFrame(columns=["player", "qoc", "qot", "shift_events"])
-
-    gdf = pd.DataFrame(rows)
-    out = []
-    for player, grp in gdf.groupby("player"):
-        def _wmean(col: str) -> float:
-            mask = np.isfinite(grp[col].values)
-            if not mask.any():
-                return float("nan")
-            w = grp.loc[mask, "shift_events"].values
-            return float(np.average(grp.loc[mask, col].values, weights=w))
-
-        out.append({
-            "player": player,
-            "qoc": _wmean("qoc"),
-            "qot": _wmean("qot"),
-            "shift_events": int(grp["shift_events"].sum()),
-        })
-    return pd.DataFrame(out)
+        return empty
+
+    # Rows with no start belong to no block (NaN or -1 depending on pandas).
+    block = shifts.groupby(["start", "action"], sort=False).ngroup().fillna(-1).astype(int).to_numpy()
+    rows = pd.DataFrame({
+        "block": block,
+        "own": (shifts["team"] == team_name).to_numpy(),
+        "player": shifts["player"].to_numpy(),
+    })
+    rows = rows[rows["block"] >= 0].drop_duplicates()
+    rows = rows[~rows["player"].isin(_probable_goalies(df["player"], df["action"]))]
+    if not rows["own"].any():
+        return empty
+
+    lut = {p: _lookup_gs(p, game_id, gs_game, gs_season) for p in rows["player"].unique()}
+    gs = rows["player"].map(lut).to_numpy(dtype=float)
+    ok = np.isfinite(gs)
+    rows["gs"] = np.where(ok, gs, 0.0)
+    rows["ok"] = ok
+    own = rows[rows["own"]]
+    opp = rows[~rows["own"]].groupby("block")[["gs", "ok"]].sum().reindex(own["block"])
+    mates = own.groupby("block")[["gs", "ok"]].sum().loc[own["block"]]
+    opp_n = opp["ok"].fillna(0).to_numpy()
+    mate_n = mates["ok"].to_numpy() - own["ok"].to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        qoc = np.where(opp_n > 0, opp["gs"].to_numpy() / opp_n, np.nan)
+        qot = np.where(mate_n > 0, (mates["gs"].to_numpy() - own["gs"].to_numpy()) / mate_n, np.nan)
+
+    out = pd.DataFrame({"player": own["player"].to_numpy(), "qoc": qoc, "qot": qot}).groupby(
+        "player", as_index=False
+    ).agg(qoc=("qoc", "mean"), qot=("qot", "mean"), shift_events=("qoc", "size"))
+    return out[["player", "qoc", "qot", "shift_events"]]
 
 
 def _resolve_team_name(df: pd.DataFrame, team_hint: str) -> str | None:
@@ -268,7 +268,7 @@ def compute_league_context(pbp_files: list[Path], team_hint: str) -> dict[str, A
     from .disk_cache import cache_path, load_json, pbp_files_fingerprint, save_json
 
     fp = pbp_files_fingerprint(pbp_files)
-    cache_file = cache_path("league_ctx", fp, "context.json")
+    cache_file = cache_path("league_ctx", fp, f"context-v{_CONTEXT_VERSION}.json")
     hit = load_json(cache_file, ttl_seconds=7 * 86_400)
     if isinstance(hit, dict) and hit.get("players") is not None:
         return hit
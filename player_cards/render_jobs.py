@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Persistent render job queue behind the async ``/cards/jobs`` API.
+
+Jobs live in a small SQLite file so they survive restarts and can be drained
+by worker processes on the same box (started by the API or standalone via
+``python -m player_cards.render_jobs``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+
+from .disk_cache import CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = Path(
+    os.getenv("PLAYER_CARDS_JOB_QUEUE", str(CACHE_ROOT / "render_jobs.db"))
+)
+RESULTS_DIR = CACHE_ROOT / "render_jobs"
+# Jobs stuck in "running" longer than this are assumed orphaned by a dead worker.
+STALE_RUNNING_SECONDS = 15 * 60
+MAX_ATTEMPTS = 2
+# Finished jobs (and their PNGs) are kept this long for clients to collect.
+RESULT_RETENTION_SECONDS = float(os.getenv("PLAYER_CARDS_JOB_RETENTION_HOURS", "24")) * 3600
+# How often an idle or busy worker requeues orphans and prunes old results.
+MAINTENANCE_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    batch_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    spec_json TEXT NOT NULL,
+    result_path TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs(batch_id);
+"""
+
+
+class JobQueue:
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = Path(path or DEFAULT_QUEUE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> JobQueue:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def submit(self, specs: list[dict[str, Any]]) -> tuple[str, list[str]]:
+        batch_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        job_ids = [uuid.uuid4().hex for _ in specs]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany(
+                """
+                INSERT INTO jobs(job_id, batch_id, status, spec_json, created_at)
+                VALUES(?, ?, 'queued', ?, ?)
+                """,
+                [(jid, batch_id, json.dumps(spec), now) for jid, spec in zip(job_ids, specs)],
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return batch_id, job_ids
+
+    def claim(self) -> dict[str, Any] | None:
+        """Atomically move the oldest queued job to ``running``."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._conn.execute("COMMIT")
+                return None
+            self._conn.execute(
+                """
+                UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1
+                WHERE job_id = ?
+                """,
+                (time.time(), row["job_id"]),
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return _row_dict(row)
+
+    def complete(self, job_id: str, result_path: Path) -> None:
+        self._conn.execute(
+            "UPDATE jobs SET status = 'done', result_path = ?, error = NULL, finished_at = ? WHERE job_id = ?",
+            (str(result_path), time.time(), job_id),
+        )
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._conn.execute(
+            "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE job_id = ?",
+            (error, time.time(), job_id),
+        )
+
+    def requeue_stale(self, *, older_than: float = STALE_RUNNING_SECONDS) -> int:
+        cutoff = time.time() - older_than
+        cur = self._conn.execute(
+            """
+            UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                error = CASE WHEN attempts >= ? THEN 'worker died' ELSE error END
+            WHERE status = 'running' AND started_at < ?
+            """,
+            (MAX_ATTEMPTS, MAX_ATTEMPTS, cutoff),
+        )
+        return cur.rowcount
+
+    def prune(
+        self,
+        *,
+        older_than: float = RESULT_RETENTION_SECONDS,
+        results_dir: Path | None = None,
+    ) -> int:
+        """Delete finished jobs older than ``older_than`` and their result PNGs.
+
+        PNGs in ``results_dir`` past the cutoff whose job is gone (e.g. the row
+        was pruned but the unlink failed) are removed too. Returns rows deleted.
+        """
+        results_dir = results_dir or RESULTS_DIR
+        cutoff = time.time() - older_than
+        rows = self._conn.execute(
+            "SELECT job_id, result_path FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (cutoff,),
+        ).fetchall()
+        for row in rows:
+            if row["result_path"]:
+                Path(row["result_path"]).unlink(missing_ok=True)
+        self._conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(r["job_id"],) for r in rows])
+        if results_dir.is_dir():
+            for png in results_dir.glob("*.png"):
+                try:
+                    if png.stat().st_mtime < cutoff and self.get(png.stem) is None:
+                        png.unlink()
+                except OSError:
+                    pass
+        return len(rows)
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _row_dict(row) if row else None
+
+    def batch(self, batch_id: str) -> list[dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT * FROM jobs WHERE batch_id = ? ORDER BY rowid", (batch_id,)
+        ).fetchall()
+        return [_row_dict(r) for r in rows]
+
+    def counts(self) -> dict[str, int]:
+        rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        return {str(r["status"]): int(r["n"]) for r in rows}
+
+    def pending(self) -> int:
+        row = self._conn.execute(
+            "SELECT COUNT(*) AS n FROM jobs WHERE status IN ('queued', 'running')"
+        ).fetchone()
+        return int(row["n"]) if row else 0
+
+
+def _row_dict(row: sqlite3.Row) -> dict[str, Any]:
+    out = dict(row)
+    out["spec"] = json.loads(out.pop("spec_json"))
+    return out
+
+
+def open_queue(path: Path | str | None = None) -> JobQueue:
+    return JobQueue(path)
+
+
+def _render_job(job: dict[str, Any]) -> Path:
+    from . import service
+
+    spec = job["spec"]
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    return service.render_card_png(
+        spec["player"],
+        team=spec.get("team"),
+        league=spec.get("league") or "nhl",
+        season=spec.get("season"),
+        output=RESULTS_DIR / f"{job['job_id']}.png",
+    )
+
+
+def run_worker(
+    queue_path: Path | str | None = None,
+    *,
+    poll_interval: float = 1.0,
+    max_jobs: int | None = None,
+    stop: threading.Event | None = None,
+) -> int:
+    """Drain the queue until ``stop`` is set (or ``max_jobs`` processed)."""
+    processed = 0
+    next_maintenance = 0.0
+    with open_queue(queue_path) as queue:
+        while not (stop and stop.is_set()):
+            if time.monotonic() >= next_maintenance:
+                # Jobs orphaned by a crashed or terminated worker go back to the queue.
+                requeued = queue.requeue_stale()
+                pruned = queue.prune()
+                if requeued or pruned:
+                    logger.info("Render queue: requeued %s stale jobs, pruned %s old jobs", requeued, pruned)
+                next_maintenance = time.monotonic() + MAINTENANCE_INTERVAL
+            job = queue.claim()
+            if job is None:
+                if max_jobs is not None:
+                    break
+                time.sleep(poll_interval)
+                continue
+            try:
+                path = _render_job(job)
+                queue.complete(job["job_id"], path)
+            except Exception as exc:
+                logger.warning("Render job %s failed: %s", job["job_id"], exc)
+                queue.fail(job["job_id"], str(exc))
+            processed += 1
+            if max_jobs is not None and processed >= max_jobs:
+                break
+    return processed
+
+
+def _worker_main(queue_path: str) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    run_worker(queue_path)
+
+
+def start_worker_processes(
+    count: int,
+    queue_path: Path | str | None = None,
+) -> list[multiprocessing.process.BaseProcess]:
+    ctx = multiprocessing.get_context("spawn")
+    procs = []
+    for i in range(count):
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(str(queue_path or DEFAULT_QUEUE_PATH),),
+            name=f"player-cards-render-{i}",
+            daemon=True,
+        )
+        proc.start()
+        procs.append(proc)
+    return procs
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Drain the player card render job queue")
+    parser.add_argument("--queue", default=str(DEFAULT_QUEUE_PATH))
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.workers <= 1:
+        run_worker(args.queue)
+        return
+    for proc in start_worker_processes(args.workers, args.queue):
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
 
@@ -12,7 +14,7 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response
 from pydantic import BaseModel, Field
 
-from . import service
+from . import api_warm, render_jobs, service, timing, workers
 from .pwhl_action_sync import action_photo_coverage, ensure_pwhl_action_index, sync_pwhl_action_photos
 from .pwhl_action_photos import resolve_pwhl_action_photo
 from .pwhl_actionshots import (
@@ -23,8 +25,33 @@ from .pwhl_actionshots import (
     resolve_actionshot,
 )
 from .pwhl_photos import lookup_pwhl_player
+from .single_flight import AsyncSingleFlight
+
+_JOB_WORKERS = int(os.getenv("PLAYER_CARDS_JOB_WORKERS", "1"))
+_MAX_QUEUED_JOBS = int(os.getenv("PLAYER_CARDS_MAX_QUEUED_JOBS", "2000"))
+_MAX_JOB_WAIT = 60.0
+
+# Concurrent identical cache misses share one build/render on the event loop.
+# POST /cards renders store-only and caches nothing, so it never joins a
+# card.png flight (live fallback + cache write) for the same player.
+_profile_flights = AsyncSingleFlight()
+_card_flights = AsyncSingleFlight()
+_store_card_flights = AsyncSingleFlight()
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Warm in the background so the server accepts requests immediately.
+    api_warm.start_background_warm()
+    job_workers = render_jobs.start_worker_processes(_JOB_WORKERS) if _JOB_WORKERS else []
+    yield
+    for proc in job_workers:
+        proc.terminate()
+    workers.shutdown_lanes()
+
 
 app = FastAPI(
+    lifespan=_lifespan,
     title="Player Cards API",
     version="1.0.0",
     description=(
@@ -42,7 +69,25 @@ class CardRequest(BaseModel):
     season: str | None = Field(None, description="e.g. 2025-26")
 
 
+class CardJobsRequest(BaseModel):
+    cards: list[CardRequest] = Field(..., min_length=1, max_length=500)
+
+
+def _timing_headers(timings: timing.Timings, **fields: Any) -> dict[str, str]:
+    """Log the request's stage breakdown and return it as a ``Server-Timing`` header."""
+    timing.log_timings(timings, **fields)
+    return {"Server-Timing": timings.server_timing()}
+
+
 def _err(exc: Exception) -> HTTPException:
+    if isinstance(exc, HTTPException):
+        return exc
+    if isinstance(exc, service.OverloadedError):
+        return HTTPException(
+            status_code=503,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        )
     if isinstance(exc, service.PlayerNotFoundError):
         return HTTPException(status_code=404, detail=str(exc))
     if isinstance(exc, service.DataNotReadyError):
@@ -51,7 +96,7 @@ def _err(exc: Exception) -> HTTPException:
 
 
 @app.get("/")
-def root() -> dict[str, Any]:
+async def root() -> dict[str, Any]:
     return {
         "service": "player-cards",
         "docs": "/docs",
@@ -67,13 +112,16 @@ def root() -> dict[str, Any]:
 
 
 @app.get("/health")
-def health() -> dict[str, Any]:
-    status = service.store_status()
+async def health() -> dict[str, Any]:
+    try:
+        status = await workers.io.run(service.store_status)
+        pwhl_photos = await workers.io.run(action_photo_coverage)
+    except Exception as exc:
+        raise _err(exc) from exc
     ready = bool(status.get("store_exists"))
     players = sum(
         lg.get("players_indexed", 0) for lg in (status.get("leagues") or {}).values()
     )
-    pwhl_photos = action_photo_coverage()
     return {
         "status": "ok" if ready and players > 0 else "degraded",
         "store_ready": ready,
@@ -88,147 +136,209 @@ def health() -> dict[str, Any]:
     }
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus stage histograms (``PLAYER_CARDS_METRICS=1`` + ``prometheus_client``)."""
+    payload = timing.metrics_payload()
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    body, content_type = payload
+    return Response(body, media_type=content_type)
+
+
 @app.get("/status")
-def status(season: str | None = None) -> dict[str, Any]:
-    return service.store_status(season=season)
+async def status(season: str | None = None) -> dict[str, Any]:
+    try:
+        out = await workers.io.run(service.store_status, season=season)
+    except Exception as exc:
+        raise _err(exc) from exc
+    out["warm"] = api_warm.get_scheduler().status()
+    out["queues"] = workers.lanes_status()
+    return out
 
 
 @app.get("/coverage")
-def coverage(season: str | None = None) -> dict[str, Any]:
-    return service.pbp_coverage(season=season)
+async def coverage(season: str | None = None) -> dict[str, Any]:
+    try:
+        return await workers.io.run(service.pbp_coverage, season=season)
+    except Exception as exc:
+        raise _err(exc) from exc
 
 
 @app.get("/players/search")
-def players_search(
+async def players_search(
     q: str = Query(..., min_length=2),
     league: str | None = None,
     season: str | None = None,
     limit: int = Query(25, ge=1, le=100),
 ) -> dict[str, Any]:
-    return {
-        "query": q,
-        "results": service.search_players(q, league=league, season=season, limit=limit),
-    }
+    try:
+        results = await workers.io.run(
+            service.search_players, q, league=league, season=season, limit=limit
+        )
+    except Exception as exc:
+        raise _err(exc) from exc
+    return {"query": q, "results": results}
 
 
 @app.get("/teams/{team}/roster")
-def team_roster(
+async def team_roster(
     team: str,
     league: str = "nhl",
     season: str | None = None,
 ) -> dict[str, Any]:
-    roster = service.list_team_roster(team, league=league, season=season)
+    try:
+        roster = await workers.io.run(service.list_team_roster, team, league=league, season=season)
+    except Exception as exc:
+        raise _err(exc) from exc
     if not roster:
         raise HTTPException(status_code=404, detail=f"No roster in store for {league}/{team}")
     return {"team": team.upper(), "league": league, "players": roster}
 
 
+async def _profile_or_live(
+    player_name: str,
+    *,
+    team: str | None,
+    league: str,
+    season: str | None,
+) -> dict[str, Any]:
+    # Store hits are cheap reads; only the live PBP build goes to the cpu lane.
+    try:
+        return await workers.io.run(
+            service.load_profile, player_name, team=team, league=league, season=season
+        )
+    except service.OverloadedError:
+        raise
+    except Exception:
+        res = await workers.cpu.run(service.build_live_profile, player_name, team=team, league=league)
+        return res.get("profile") or {}
+
+
 @app.get("/players/{player_name}/profile")
-def player_profile(
+async def player_profile(
     player_name: str,
+    response: Response,
     team: str | None = None,
     league: str = "nhl",
     season: str | None = None,
 ) -> dict[str, Any]:
+    api_warm.get_scheduler().record_request(team, league=league)
+    key = service.flight_key(player_name, team=team, league=league, season=season)
     try:
-        try:
-            return service.load_profile(player_name, team=team, league=league, season=season)
-        except Exception:
-            import logging
-            logging.info("Dynamic profile generation fallback for %s...", player_name)
-            from .profile import generate_player_card
-            res = generate_player_card(
-                player_name,
-                team=team,
-                league=league,
-                use_store=False,
-                pbp_source="cache"
+        with timing.collect("profile") as timings:
+            profile, shared = await _profile_flights.do(
+                key,
+                lambda: _profile_or_live(player_name, team=team, league=league, season=season),
             )
-            return res.get("profile") or {}
+        response.headers.update(
+            _timing_headers(timings, player=player_name, team=team, league=league, shared=shared)
+        )
+        return profile
     except Exception as exc:
         raise _err(exc) from exc
 
 
+def _card_cache_lookup(player_name: str) -> tuple[Path, bool]:
+    """Rendered-card cache path for ``player_name`` and whether it exists."""
+    cache_dir = Path.home() / ".cache" / "player-cards" / "rendered_cards"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    cached_png = cache_dir / f"{player_name.replace(' ', '_').lower()}.png"
+    return cached_png, cached_png.exists()
+
+
+def _save_to_card_cache(png_path: Path, cached_png: Path) -> Path:
+    # Copy to cache directory for future hits
+    import shutil
+    try:
+        shutil.copy2(png_path, cached_png)
+    except Exception as cache_err:
+        import logging
+        logging.warning("Failed to save card to PNG cache: %s", cache_err)
+    return png_path
+
+
+def _render_and_cache_png(profile: dict[str, Any], cached_png: Path) -> Path:
+    return _save_to_card_cache(service.render_profile_png(profile), cached_png)
+
+
+def _build_and_cache_png(player_name: str, cached_png: Path, *, team: str | None, league: str) -> Path:
+    import tempfile
+    tmp = tempfile.NamedTemporaryFile(suffix=".png", prefix="player-card-live-", delete=False)
+    png_path = Path(tmp.name)
+    tmp.close()
+    service.build_live_profile(player_name, team=team, league=league, output_png=png_path)
+    return _save_to_card_cache(png_path, cached_png)
+
+
+async def _card_or_live(
+    player_name: str,
+    cached_png: Path,
+    *,
+    team: str | None,
+    league: str,
+    season: str | None,
+) -> Path:
+    # The render lane only runs Playwright; a live PBP build goes to the cpu
+    # lane so one cold player doesn't hold up every other PNG request.
+    if league.lower() == "pwhl":
+        await workers.io.run(ensure_pwhl_action_index, min_coverage_pct=0.0)
+    try:
+        profile = await workers.io.run(
+            service.load_profile, player_name, team=team, league=league, season=season
+        )
+    except service.OverloadedError:
+        raise
+    except Exception:
+        return await workers.cpu.run(_build_and_cache_png, player_name, cached_png, team=team, league=league)
+    return await workers.render.run(_render_and_cache_png, profile, cached_png)
+
+
 @app.get("/players/{player_name}/card.png")
-def player_card_png(
+async def player_card_png(
     player_name: str,
     team: str | None = None,
     league: str = "nhl",
     season: str | None = None,
     force: bool = False,
 ) -> FileResponse:
+    api_warm.get_scheduler().record_request(team, league=league)
     try:
         t0 = time.perf_counter()
-        
-        # Check local PNG cache directory
-        cache_dir = Path.home() / ".cache" / "player-cards" / "rendered_cards"
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        cached_png = cache_dir / f"{player_name.replace(' ', '_').lower()}.png"
-        
-        if cached_png.exists() and not force:
-            elapsed_ms = int((time.perf_counter() - t0) * 1000)
-            return FileResponse(
-                cached_png,
-                media_type="image/png",
-                filename=f"{player_name.replace(' ', '-').lower()}.png",
-                headers={"X-Elapsed-Ms": str(elapsed_ms), "X-Cache": "HIT"},
-            )
-
-        if league.lower() == "pwhl":
-            ensure_pwhl_action_index(min_coverage_pct=0.0)
-
-        try:
-            png_path = service.render_card_png(
-                player_name, team=team, league=league, season=season
-            )
-        except Exception as exc:
-            import logging
-            logging.info("Dynamic card generation fallback for %s...", player_name)
-            from .profile import generate_player_card
-            import tempfile
-            tmp = tempfile.NamedTemporaryFile(suffix=".png", prefix="player-card-live-", delete=False)
-            png_path = Path(tmp.name)
-            tmp.close()
-            
-            # Generate the card dynamically
-            generate_player_card(
-                player_name,
-                team=team,
-                league=league,
-                output_png=png_path,
-                use_store=False,
-                pbp_source="cache"
-            )
-            
-        # Copy to cache directory for future hits
-        import shutil
-        try:
-            shutil.copy2(png_path, cached_png)
-        except Exception as cache_err:
-            import logging
-            logging.warning("Failed to save card to PNG cache: %s", cache_err)
+        with timing.collect("card.png") as timings:
+            # Check local PNG cache directory
+            cached_png, hit = await workers.io.run(_card_cache_lookup, player_name)
+
+            if hit and not force:
+                png_path, cache = cached_png, "HIT"
+            else:
+                key = service.flight_key(player_name, team=team, league=league, season=season)
+                png_path, shared = await _card_flights.do(
+                    key,
+                    lambda: _card_or_live(player_name, cached_png, team=team, league=league, season=season),
+                )
+                cache = "SHARED" if shared else "MISS"
 
         elapsed_ms = int((time.perf_counter() - t0) * 1000)
         return FileResponse(
             png_path,
             media_type="image/png",
             filename=f"{player_name.replace(' ', '-').lower()}.png",
-            headers={"X-Elapsed-Ms": str(elapsed_ms), "X-Cache": "MISS"},
+            headers={
+                "X-Elapsed-Ms": str(elapsed_ms),
+                "X-Cache": cache,
+                **_timing_headers(timings, player=player_name, team=team, league=league, cache=cache),
+            },
         )
     except Exception as exc:
         raise _err(exc) from exc
 
 
-@app.get("/pwhl/action-photos/coverage")
-def pwhl_action_photo_coverage() -> dict[str, Any]:
+def _pwhl_action_photo_coverage() -> dict[str, Any]:
     return action_photo_coverage()
 
 
-@app.get("/pwhl/actionshots")
-def pwhl_actionshots_manifest(
-    team: str | None = None,
-    discover: bool = Query(False, description="Run on-demand OSC lookup for missing players"),
-) -> dict[str, Any]:
+def _pwhl_actionshots_manifest(team: str | None, discover: bool) -> dict[str, Any]:
     """NHL actionshots-style manifest for the full PWHL roster."""
     if discover:
         ensure_pwhl_action_index(min_coverage_pct=0.0)
@@ -245,12 +355,7 @@ def pwhl_actionshots_manifest(
     return manifest
 
 
-@app.get("/pwhl/actionshots/{ht_player_id}")
-def pwhl_actionshot_metadata(
-    ht_player_id: str,
-    team: str | None = None,
-    discover: bool = Query(True),
-) -> dict[str, Any]:
+def _pwhl_actionshot_metadata(ht_player_id: str, team: str | None, discover: bool) -> dict[str, Any]:
     """JSON metadata for one player's PWHL action shot."""
     hit = resolve_actionshot(
         ht_player_id,
@@ -262,13 +367,7 @@ def pwhl_actionshot_metadata(
     return hit
 
 
-@app.get("/pwhl/actionshots/{size}/{ht_player_id}.jpg")
-def pwhl_actionshot_image(
-    size: str,
-    ht_player_id: str,
-    team: str | None = None,
-    redirect: bool = Query(False, description="302 redirect to source URL instead of proxying"),
-) -> Response:
+def _pwhl_actionshot_image(size: str, ht_player_id: str, team: str | None, redirect: bool) -> Response:
     """Serve in-game PWHL action shot (NHL /mugs/actionshots/{size}/{id}.jpg equivalent)."""
     hit = resolve_actionshot(
         ht_player_id,
@@ -300,21 +399,13 @@ def pwhl_actionshot_image(
     )
 
 
-@app.post("/pwhl/action-photos/sync")
-def pwhl_action_photo_sync(
-    full: bool = Query(False, description="Scan full OSC id ranges (slower)"),
-    workers: int = Query(20, ge=1, le=40),
-) -> dict[str, Any]:
+def _pwhl_action_photo_sync(full: bool, n_workers: int) -> dict[str, Any]:
     if full:
-        return sync_pwhl_action_photos(full=True, workers=workers)
+        return sync_pwhl_action_photos(full=True, workers=n_workers)
     return ensure_pwhl_action_index(force=True)
 
 
-@app.get("/pwhl/players/{player_name}/action-photo")
-def pwhl_player_action_photo(
-    player_name: str,
-    team: str | None = None,
-) -> dict[str, Any]:
+def _pwhl_player_action_photo(player_name: str, team: str | None) -> dict[str, Any]:
     meta = lookup_pwhl_player(player_name, team or "")
     if not meta and team:
         raise HTTPException(status_code=404, detail=f"PWHL player not found: {player_name!r}")
@@ -350,21 +441,85 @@ def pwhl_player_action_photo(
     }
 
 
+async def _io(fn, *args: Any, **kwargs: Any) -> Any:
+    try:
+        return await workers.io.run(fn, *args, **kwargs)
+    except Exception as exc:
+        raise _err(exc) from exc
+
+
+@app.get("/pwhl/action-photos/coverage")
+async def pwhl_action_photo_coverage() -> dict[str, Any]:
+    return await _io(_pwhl_action_photo_coverage)
+
+
+@app.get("/pwhl/actionshots")
+async def pwhl_actionshots_manifest(
+    team: str | None = None,
+    discover: bool = Query(False, description="Run on-demand OSC lookup for missing players"),
+) -> dict[str, Any]:
+    """NHL actionshots-style manifest for the full PWHL roster."""
+    return await _io(_pwhl_actionshots_manifest, team, discover)
+
+
+@app.get("/pwhl/actionshots/{ht_player_id}")
+async def pwhl_actionshot_metadata(
+    ht_player_id: str,
+    team: str | None = None,
+    discover: bool = Query(True),
+) -> dict[str, Any]:
+    """JSON metadata for one player's PWHL action shot."""
+    return await _io(_pwhl_actionshot_metadata, ht_player_id, team, discover)
+
+
+@app.get("/pwhl/actionshots/{size}/{ht_player_id}.jpg")
+async def pwhl_actionshot_image(
+    size: str,
+    ht_player_id: str,
+    team: str | None = None,
+    redirect: bool = Query(False, description="302 redirect to source URL instead of proxying"),
+) -> Response:
+    """Serve in-game PWHL action shot (NHL /mugs/actionshots/{size}/{id}.jpg equivalent)."""
+    return await _io(_pwhl_actionshot_image, size, ht_player_id, team, redirect)
+
+
+@app.post("/pwhl/action-photos/sync")
+async def pwhl_action_photo_sync(
+    full: bool = Query(False, description="Scan full OSC id ranges (slower)"),
+    n_workers: int = Query(20, ge=1, le=40, alias="workers"),
+) -> dict[str, Any]:
+    return await _io(_pwhl_action_photo_sync, full, n_workers)
+
+
+@app.get("/pwhl/players/{player_name}/action-photo")
+async def pwhl_player_action_photo(
+    player_name: str,
+    team: str | None = None,
+) -> dict[str, Any]:
+    return await _io(_pwhl_player_action_photo, player_name, team)
+
+
 @app.post("/cards")
-def card_from_body(body: CardRequest) -> JSONResponse:
+async def card_from_body(body: CardRequest) -> JSONResponse:
     try:
         if body.league.lower() == "pwhl":
-            ensure_pwhl_action_index(min_coverage_pct=0.0)
+            await workers.io.run(ensure_pwhl_action_index, min_coverage_pct=0.0)
         t0 = time.perf_counter()
-        png_path = service.render_card_png(
-            body.player,
-            team=body.team,
-            league=body.league,
-            season=body.season,
-        )
-        profile = service.load_profile(
-            body.player, team=body.team, league=body.league, season=body.season
-        )
+        with timing.collect("cards") as timings:
+            key = service.flight_key(body.player, team=body.team, league=body.league, season=body.season)
+            png_path, shared = await _store_card_flights.do(
+                key,
+                lambda: workers.render.run(
+                    service.render_card_png,
+                    body.player,
+                    team=body.team,
+                    league=body.league,
+                    season=body.season,
+                ),
+            )
+            profile = await workers.io.run(
+                service.load_profile, body.player, team=body.team, league=body.league, season=body.season
+            )
         elapsed_ms = int((time.perf_counter() - t0) * 1000)
         return JSONResponse(
             {
@@ -375,18 +530,130 @@ def card_from_body(body: CardRequest) -> JSONResponse:
                 "profile_url": f"/players/{body.player}/profile",
                 "elapsed_ms": elapsed_ms,
                 "sources": profile.get("sources"),
-            }
+            },
+            headers=_timing_headers(
+                timings, player=body.player, team=body.team, league=body.league, shared=shared
+            ),
         )
     except Exception as exc:
         raise _err(exc) from exc
 
 
+def _submit_jobs(specs: list[dict[str, Any]]) -> tuple[str, list[str]]:
+    with render_jobs.open_queue() as queue:
+        if queue.pending() + len(specs) > _MAX_QUEUED_JOBS:
+            raise service.OverloadedError(
+                f"render job queue full ({queue.pending()} pending)", retry_after=30
+            )
+        return queue.submit(specs)
+
+
+def _get_job(job_id: str) -> dict[str, Any] | None:
+    with render_jobs.open_queue() as queue:
+        return queue.get(job_id)
+
+
+def _get_batch(batch_id: str) -> list[dict[str, Any]]:
+    with render_jobs.open_queue() as queue:
+        return queue.batch(batch_id)
+
+
+def _job_view(job: dict[str, Any]) -> dict[str, Any]:
+    out = {
+        "job_id": job["job_id"],
+        "batch_id": job["batch_id"],
+        "status": job["status"],
+        "spec": job["spec"],
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "finished_at": job.get("finished_at"),
+        "status_url": f"/cards/jobs/{job['job_id']}",
+    }
+    if job["status"] == "done":
+        out["png_url"] = f"/cards/jobs/{job['job_id']}/card.png"
+    return out
+
+
+@app.post("/cards/jobs", status_code=202)
+async def submit_card_jobs(body: CardJobsRequest) -> dict[str, Any]:
+    """Queue card renders; poll ``status_url`` (``?wait=`` long-polls) then fetch ``png_url``."""
+    specs = [card.model_dump() for card in body.cards]
+    batch_id, job_ids = await _io(_submit_jobs, specs)
+    return {
+        "batch_id": batch_id,
+        "batch_url": f"/cards/batches/{batch_id}",
+        "jobs": [
+            {"job_id": jid, "status_url": f"/cards/jobs/{jid}", "player": spec["player"]}
+            for jid, spec in zip(job_ids, specs)
+        ],
+    }
+
+
+@app.get("/cards/jobs/{job_id}")
+async def card_job_status(
+    job_id: str,
+    wait: float = Query(0.0, ge=0.0, le=_MAX_JOB_WAIT, description="Long-poll seconds until finished"),
+) -> dict[str, Any]:
+    deadline = time.monotonic() + wait
+    while True:
+        job = await _io(_get_job, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown job {job_id!r}")
+        if job["status"] in ("done", "failed") or time.monotonic() >= deadline:
+            return _job_view(job)
+        await asyncio.sleep(0.5)
+
+
+@app.get("/cards/jobs/{job_id}/card.png")
+async def card_job_png(job_id: str) -> FileResponse:
+    job = await _io(_get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job {job_id!r}")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Job {job_id!r} is {job['status']}")
+    path = Path(str(job["result_path"]))
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail=f"Result for job {job_id!r} was removed")
+    player = str(job["spec"].get("player") or job_id)
+    return FileResponse(path, media_type="image/png", filename=f"{player.replace(' ', '-').lower()}.png")
+
+
+@app.get("/cards/batches/{batch_id}")
+async def card_batch_status(batch_id: str) -> dict[str, Any]:
+    jobs = await _io(_get_batch, batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail=f"Unknown batch {batch_id!r}")
+    counts: dict[str, int] = {}
+    for job in jobs:
+        counts[job["status"]] = counts.get(job["status"], 0) + 1
+    return {
+        "batch_id": batch_id,
+        "total": len(jobs),
+        "counts": counts,
+        "complete": counts.get("done", 0) + counts.get("failed", 0) == len(jobs),
+        "jobs": [_job_view(job) for job in jobs],
+    }
+
+
 def main() -> None:
     import uvicorn
 
     host = os.getenv("PLAYER_CARDS_API_HOST", "127.0.0.1")
     port = int(os.getenv("PLAYER_CARDS_API_PORT", "8250"))
-    uvicorn.run("player_cards.server:app", host=host, port=port, reload=False)
+    api_workers = int(os.getenv("PLAYER_CARDS_API_WORKERS", "1"))
+    job_workers: list[Any] = []
+    if api_workers > 1:
+        # Workers map one on-disk copy of each PBP game instead of each parsing its own.
+        os.environ.setdefault("PLAYER_CARDS_PBP_SHARED", "1")
+        # Every API worker runs the lifespan: start the render job workers once,
+        # here, so PLAYER_CARDS_JOB_WORKERS stays the total, not a per-worker count.
+        job_workers = render_jobs.start_worker_processes(_JOB_WORKERS) if _JOB_WORKERS else []
+        os.environ["PLAYER_CARDS_JOB_WORKERS"] = "0"
+    try:
+        uvicorn.run("player_cards.server:app", host=host, port=port, reload=False, workers=api_workers)
+    finally:
+        for proc in job_workers:
+            proc.terminate()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import logging
 import os
 import subprocess
 import sys
@@ -13,9 +14,12 @@ from .a3z_source import resolve_a3z_season
 from .card_store import DEFAULT_STORE_PATH, open_store
 from .html_renderer import write_player_card_html
 from .leagues import LEAGUES, get_league, player_cards_work_root
+from .nhl_bio import _norm
 from .png_export import html_to_png
 from .profile import _display_usable, _enrich_stored_profile, _store_profile_stale, load_stored_profile
 
+logger = logging.getLogger(__name__)
+
 
 class PlayerNotFoundError(LookupError):
     pass
@@ -25,6 +29,14 @@ class DataNotReadyError(RuntimeError):
     """Store or PBP cache missing — run sync_player_cards_ci.py first."""
 
 
+class OverloadedError(RuntimeError):
+    """A work queue is full; retry after ``retry_after`` seconds."""
+
+    def __init__(self, message: str, *, retry_after: int = 5) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 def _store_path() -> Path:
     return Path(os.getenv("PLAYER_CARDS_STORE", str(DEFAULT_STORE_PATH)))
 
@@ -34,6 +46,17 @@ def _season(league: str, season: str | None) -> str:
     return resolve_a3z_season(season or cfg.default_season, None)
 
 
+def flight_key(
+    player_name: str,
+    *,
+    team: str | None = None,
+    league: str = "nhl",
+    season: str | None = None,
+) -> tuple[str, str, str, str]:
+    league = (league or "nhl").lower()
+    return (league, _norm(player_name), (team or "").upper(), _season(league, season))
+
+
 def store_status(*, season: str | None = None) -> dict[str, Any]:
     """Summary of indexed teams/players and on-disk PBP layout."""
     store_path = _store_path()
@@ -163,6 +186,30 @@ def load_profile(
     return profile
 
 
+def build_live_profile(
+    player_name: str,
+    *,
+    team: str | None = None,
+    league: str = "nhl",
+    output_png: Path | str | None = None,
+) -> dict[str, Any]:
+    """Live build from cached PBP for a player the store could not serve.
+
+    Callers try :func:`load_profile` first; this never reads the store.
+    Returns the ``generate_player_card`` result (``profile`` and ``png``).
+    """
+    logger.info("Dynamic profile generation fallback for %s...", player_name)
+    from .profile import generate_player_card
+    return generate_player_card(
+        player_name,
+        team=team,
+        league=league,
+        output_png=output_png,
+        use_store=False,
+        pbp_source="cache"
+    )
+
+
 def render_card_png(
     player_name: str,
     *,
@@ -172,6 +219,11 @@ def render_card_png(
     output: Path | str | None = None,
 ) -> Path:
     profile = load_profile(player_name, team=team, league=league, season=season)
+    return render_profile_png(profile, output=output)
+
+
+def render_profile_png(profile: dict[str, Any], *, output: Path | str | None = None) -> Path:
+    """Render an already-loaded profile (HTML + Playwright PNG)."""
     if output:
         png_path = Path(output)
         png_path.parent.mkdir(parents=True, exist_ok=True)
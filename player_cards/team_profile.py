@@ -86,13 +86,17 @@ def build_team_card_profile(
 
     percentiles: dict[str, float | None] = {}
     if league_team_averages:
-        percentiles = compute_team_percentiles(skater_data.get("averages") or {}, league_team_averages)
+        percentiles = compute_team_percentiles(
+            skater_data.get("averages") or {}, league_team_averages, league=league, season=season,
+        )
 
     season_id = int(f"{season.split('-')[0]}{int(season.split('-')[0]) + 1}") if "-" in season else 20252026
     league_official = fetch_league_team_official_stats(season_id)
     official_row = league_official.get(tri, {})
     official_percentiles = (
-        compute_official_stat_percentiles(official_row, league_official, OFFICIAL_STAT_KEYS)
+        compute_official_stat_percentiles(
+            official_row, league_official, OFFICIAL_STAT_KEYS, league=league, season=str(season_id),
+        )
         if official_row else {}
     )
 
@@ -16,7 +16,7 @@ import pandas as pd
 from .build_store import ROSTER_SEASON
 from .instat_pbp_fetch import ensure_team_pbp_files, team_pbp_dir
 from .leagues import team_full_name
-from .pbp_display import _pbp_values, _pct_rank
+from .pbp_display import _pbp_values
 from .pbp_metrics import (
     SHOT_MAP_ACTIONS,
     SHOT_MAP_PRIORITY,
@@ -26,7 +26,15 @@ from .pbp_metrics import (
     _xg,
     aggregate_player_pbp,
 )
-from .pbp_team_cache import get_team_frames, warm_team_pbp
+from .pbp_shared_store import enable_shared_frames, shared_frames_enabled
+from .pbp_team_cache import get_team_frames, publish_team_pbp, warm_team_pbp
+from .percentile_index import (
+    PercentileIndex,
+    build_percentile_index,
+    files_fingerprint,
+    percentile_index,
+    rows_fingerprint,
+)
 from .pwhl_bio import _is_team_match
 
 logger = logging.getLogger(__name__)
@@ -99,7 +107,9 @@ def aggregate_team_skater_averages(
     
     args_list = [(p, team, files, team_games, league) for p in skaters]
 
-    with concurrent.futures.ProcessPoolExecutor() as pool:
+    # With the shared store on, parse each game once here; pool workers map it.
+    shared = shared_frames_enabled() and publish_team_pbp(files) > 0
+    with concurrent.futures.ProcessPoolExecutor(initializer=enable_shared_frames if shared else None) as pool:
         results = pool.map(_process_team_skater, args_list)
         for name, res in results:
             if res:
@@ -420,16 +430,25 @@ def fetch_league_team_official_stats(season_id: int = 20252026) -> dict[str, dic
 
 
 def compute_official_stat_percentiles(
-    team_row: dict[str, Any], league_rows: dict[str, dict[str, Any]], keys: list[str],
+    team_row: dict[str, Any],
+    league_rows: dict[str, dict[str, Any]],
+    keys: list[str],
+    *,
+    league: str = "nhl",
+    season: str = "current",
 ) -> dict[str, float | None]:
+    pops = {tri: {k: r.get(k) for k in keys} for tri, r in league_rows.items()}
+    index = percentile_index(
+        "team-official",
+        season,
+        rows_fingerprint(pops),
+        lambda: build_percentile_index(league_rows.values(), {k: (k,) for k in keys}),
+        league=league,
+    )
     out: dict[str, float | None] = {}
     for k in keys:
-        pop = [r[k] for r in league_rows.values() if r.get(k) is not None]
         val = team_row.get(k)
-        if val is None or not pop:
-            out[k] = None
-            continue
-        pct = _pct_rank(float(val), [float(v) for v in pop])
+        pct = index.rank(k, float(val)) if val is not None else None
         out[k] = (1.0 - pct) if k in _LOWER_IS_BETTER and pct is not None else pct
     return out
 
@@ -458,18 +477,36 @@ def fetch_team_scoring_leaders(team: str, season_id: int = 20252026, limit: int
     ]
 
 
+def team_average_percentile_index(
+    league_team_averages: dict[str, dict[str, Any]],
+    *,
+    league: str = "nhl",
+    season: str = "current",
+) -> PercentileIndex:
+    """Sorted league team-average populations, rebuilt when the league PBP changes."""
+    averages = {tri: t.get("averages") or {} for tri, t in league_team_averages.items()}
+    files = [p for t in league_team_averages.values() for p in t.get("files") or []]
+    fp = f"{files_fingerprint(files)}-{rows_fingerprint(averages)}" if files else rows_fingerprint(averages)
+    keys = sorted({k for a in averages.values() for k in a})
+    return percentile_index(
+        "team-averages",
+        season,
+        fp,
+        lambda: build_percentile_index(averages.values(), {k: (k,) for k in keys}),
+        league=league,
+    )
+
+
 def compute_team_percentiles(
-    team_averages: dict[str, float | None], league_team_averages: dict[str, dict[str, Any]],
+    team_averages: dict[str, float | None],
+    league_team_averages: dict[str, dict[str, Any]],
+    *,
+    league: str = "nhl",
+    season: str = "current",
 ) -> dict[str, float | None]:
-    keys: set[str] = set()
-    for t in league_team_averages.values():
-        keys.update((t.get("averages") or {}).keys())
+    index = team_average_percentile_index(league_team_averages, league=league, season=season)
     out: dict[str, float | None] = {}
-    for k in keys:
-        pop = [
-            t["averages"][k] for t in league_team_averages.values()
-            if t.get("averages", {}).get(k) is not None
-        ]
+    for k in index.metrics:
         val = team_averages.get(k)
-        out[k] = _pct_rank(float(val), [float(v) for v in pop]) if val is not None and pop else None
+        out[k] = index.rank(k, float(val)) if val is not None else None
     return out
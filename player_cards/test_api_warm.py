@@ -0,0 +1,79 @@
+"""Guards for the background warm scheduler (ordering, wakeups, disabled mode)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from player_cards import api_warm
+
+
+def _wait_for(cond, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def fake_league(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    schedule_released = threading.Event()
+    warmed: list[str] = []
+    results: dict[str, bool] = {}
+
+    def todays_teams() -> set[str]:
+        schedule_released.wait(5)
+        return {"BBB"}
+
+    def warm_team(tri: str, *, league: str, season: str) -> bool:
+        warmed.append(tri)
+        return results.get(tri, True)
+
+    leagues = {"nhl": SimpleNamespace(teams={"AAA": "A", "BBB": "B", "CCC": "C"}, default_season="2025")}
+    monkeypatch.setattr(api_warm, "LEAGUES", leagues)
+    monkeypatch.setattr(api_warm, "_todays_nhl_teams", todays_teams)
+    monkeypatch.setattr(api_warm, "warm_team", warm_team)
+    monkeypatch.setattr(api_warm, "_REQUEST_COUNTS_PATH", tmp_path / "request_counts.json")
+    return SimpleNamespace(release=schedule_released, warmed=warmed, results=results)
+
+
+def test_start_does_not_block_and_promotions_go_first(fake_league) -> None:
+    scheduler = api_warm.WarmScheduler()
+    scheduler.start()  # returns while the schedule lookup is still blocked
+    scheduler.record_request("ccc")
+    fake_league.release.set()
+    _wait_for(lambda: scheduler.status()["finished_at"] is not None)
+    # Promoted first, then "plays today", then the rest.
+    assert fake_league.warmed == ["CCC", "BBB", "AAA"]
+    assert scheduler.is_warm("AAA")
+
+
+def test_promote_after_idle_wakes_and_resets_finished(fake_league) -> None:
+    fake_league.results["AAA"] = False
+    fake_league.release.set()
+    scheduler = api_warm.WarmScheduler()
+    scheduler.start()
+    _wait_for(lambda: scheduler.status()["finished_at"] is not None)
+    assert scheduler.status()["states"] == {"warm": 2, "no_cache": 1}
+
+    fake_league.results["AAA"] = True
+    scheduler.promote("AAA")
+    scheduler.promote("BBB")  # already warm: ignored
+    _wait_for(lambda: scheduler.is_warm("AAA"))
+    _wait_for(lambda: scheduler.status()["finished_at"] is not None)
+    assert fake_league.warmed.count("AAA") == 2
+    assert fake_league.warmed.count("BBB") == 1
+
+
+def test_disabled_scheduler_never_queues(fake_league) -> None:
+    scheduler = api_warm.WarmScheduler()
+    scheduler.record_request("AAA")
+    scheduler.promote("BBB")
+    status = scheduler.status()
+    assert status["running"] is False
+    assert status["teams"] == 0 and status["next"] == []
+    assert fake_league.warmed == []
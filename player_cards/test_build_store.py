@@ -0,0 +1,87 @@
+"""Guards for incremental store builds (which roster players get rebuilt)."""
+
+from __future__ import annotations
+
+import copy
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from player_cards import build_store, disk_cache
+from player_cards.build_store import (
+    _current_player_count,
+    _dirty_players,
+    _roster_key,
+    fetch_nhl_roster,
+    player_input_fingerprint,
+)
+
+ROSTER_JSON = {
+    "forwards": [
+        {"id": 8470001, "firstName": {"default": "Emile"}, "lastName": {"default": "Dupont"}, "sweaterNumber": 12},
+        {"id": 8470002, "firstName": {"default": "Sam"}, "lastName": {"default": "Smith"}, "sweaterNumber": 19},
+    ],
+    "defensemen": [],
+    "goalies": [],
+}
+
+
+class _Store:
+    def __init__(self, roster: list[dict], pbp_fingerprint: str) -> None:
+        self.inputs = {
+            _roster_key(e): {"input_fingerprint": player_input_fingerprint(e, pbp_fingerprint), "built_at": time.time()}
+            for e in roster
+        }
+
+    def player_inputs(self, team: str, season: str, *, league: str) -> dict[str, dict]:
+        return self.inputs
+
+
+def _roster(monkeypatch: pytest.MonkeyPatch, data: dict) -> list[dict]:
+    response = SimpleNamespace(json=lambda: data, raise_for_status=lambda: None)
+    monkeypatch.setattr(build_store.httpx, "get", lambda *a, **k: response)
+    return fetch_nhl_roster("bos")
+
+
+def _dirty(store: _Store, roster: list[dict]) -> list[str]:
+    out = _dirty_players(
+        store, roster, league="nhl", team="BOS", season="2025", pbp_fingerprint="3:100", max_age=3600
+    )
+    return [e["name"] for e in out]
+
+
+@pytest.fixture(autouse=True)
+def cache_root(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    monkeypatch.setattr(disk_cache, "CACHE_ROOT", tmp_path)
+    return tmp_path
+
+
+def test_refetched_cap_rebuilds_only_that_player(monkeypatch: pytest.MonkeyPatch, cache_root: Path) -> None:
+    roster = _roster(monkeypatch, ROSTER_JSON)
+    caps = [cache_root / "cap" / f"{e['player_id']}.json" for e in roster]
+    for path in caps:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}", encoding="utf-8")
+        os.utime(path, (1_000_000, 1_000_000))
+    store = _Store(roster, "3:100")
+    assert _dirty(store, _roster(monkeypatch, ROSTER_JSON)) == []
+
+    os.utime(caps[1], (2_000_000, 2_000_000))
+    assert _dirty(store, roster) == ["Sam Smith"]
+
+
+def test_changed_roster_bio_fields_rebuild_only_that_player(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = _Store(_roster(monkeypatch, ROSTER_JSON), "3:100")
+    changed = copy.deepcopy(ROSTER_JSON)
+    changed["forwards"][0]["sweaterNumber"] = 91
+    assert _dirty(store, _roster(monkeypatch, changed)) == ["Emile Dupont"]
+
+
+def test_player_count_ignores_departed_players(monkeypatch: pytest.MonkeyPatch) -> None:
+    roster = _roster(monkeypatch, ROSTER_JSON)
+    store = _Store(roster + [{"player_id": 8479999, "name": "Gone Player", "team": "BOS", "league": "nhl"}], "3:100")
+    assert _current_player_count(store, roster, "BOS", "2025", league="nhl") == 2
+    assert _current_player_count(store, roster[:1], "BOS", "2025", league="nhl") == 1
@@ -0,0 +1,77 @@
+"""Guards: percentile tables in the card store rank like the live computation."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from player_cards.card_store import metric_populations, open_store
+from player_cards.pbp_display import _pbp_values, compute_team_metric_percentiles
+from player_cards.profile import (
+    _lookup_player_pcts,
+    _stored_player_percentiles,
+    _team_percentiles_from_store,
+)
+
+SEASON = "20252026"
+POSITIONS = ["C", "L", "R", "D", "RD", "LW", "G"]
+
+
+def _players(seed: int = 0, n: int = 14) -> dict[str, dict]:
+    rng = np.random.default_rng(seed)
+    out: dict[str, dict] = {}
+    for i in range(n):
+        per_game = {k: float(rng.integers(0, 4)) for k in ("Shots", "Chances", "Passes", "Zone Exits")}
+        if i % 5 == 0:
+            del per_game["Passes"]  # a metric some players lack
+        out[f"Player {i}"] = {"id": 100 + i, "position": POSITIONS[i % len(POSITIONS)], "per_game": per_game}
+    return out
+
+
+def _metrics(players: dict[str, dict]) -> dict[str, dict[str, float]]:
+    return {
+        name: {k: v for k, v in _pbp_values(p["per_game"]).items() if not k.startswith("_")}
+        for name, p in players.items()
+    }
+
+
+@pytest.fixture
+def store_path(tmp_path: Path) -> Path:
+    path = tmp_path / "store.db"
+    players = _players()
+    with open_store(path) as store:
+        store.replace_percentiles(
+            "nhl", SEASON, "team:BOS", metric_populations(_metrics(players)), pbp_fingerprint="14:100"
+        )
+        for name, p in players.items():
+            profile = {
+                "league": "nhl",
+                "bio": {"player_id": p["id"], "name": name, "team": "BOS", "position": p["position"]},
+                "pbp": {"per_game": p["per_game"]},
+            }
+            store.upsert_profile(profile, season=SEASON, pbp_fingerprint="14:100")
+    return path
+
+
+def test_stored_team_ranks_match_compute_team_metric_percentiles(store_path: Path) -> None:
+    players = _players()
+    want = compute_team_metric_percentiles(_metrics(players))
+    for name, p in players.items():
+        got = _stored_player_percentiles(
+            "BOS", SEASON, p["per_game"], pbp_fingerprint="14:100", store_path=store_path
+        )
+        assert got == want[name], name
+
+
+def test_fingerprint_mismatch_falls_back_to_profile_scan(store_path: Path) -> None:
+    players = _players()
+    want = compute_team_metric_percentiles(_metrics(players))
+    for name, p in players.items():
+        stale = _stored_player_percentiles(
+            "BOS", SEASON, p["per_game"], pbp_fingerprint="15:200", store_path=store_path
+        )
+        assert stale is None
+        fallback = _team_percentiles_from_store("BOS", SEASON, store_path=store_path)
+        assert _lookup_player_pcts(fallback, name) == want[name]
@@ -0,0 +1,115 @@
+"""Guards for request coalescing and the API's bounded work lanes."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from player_cards.service import OverloadedError
+from player_cards.single_flight import AsyncSingleFlight, SingleFlight
+from player_cards.workers import Lane
+
+
+def _wait_for(cond, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_single_flight_runs_once_for_concurrent_callers() -> None:
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def build() -> str:
+        calls.append(1)
+        release.wait(5)
+        return "card"
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "k", build) for _ in range(4)]
+        _wait_for(lambda: "k" in flight._calls and flight._calls["k"].waiters == 3)
+        release.set()
+        results = [f.result(5) for f in futures]
+    assert len(calls) == 1
+    assert [r for r, _ in results] == ["card"] * 4
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert flight.in_flight() == 0
+
+
+def test_single_flight_shares_the_leader_error() -> None:
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def build() -> str:
+        started.set()
+        release.wait(5)
+        raise ValueError("no pbp")
+
+    with ThreadPoolExecutor(2) as pool:
+        leader = pool.submit(flight.do, "k", build)
+        started.wait(5)
+        waiter = pool.submit(flight.do, "k", build)
+        _wait_for(lambda: flight._calls["k"].waiters == 1)
+        release.set()
+        for fut in (leader, waiter):
+            with pytest.raises(ValueError, match="no pbp"):
+                fut.result(5)
+
+
+def test_async_single_flight_survives_leader_cancel() -> None:
+    async def main() -> None:
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def build() -> str:
+            calls.append(1)
+            await release.wait()
+            return "card"
+
+        leader = asyncio.create_task(flight.do("k", build))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("k", build))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        assert await waiter == ("card", True)
+        assert leader.cancelled()
+        assert calls == [1]
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_lane_overload_maps_to_503() -> None:
+    from player_cards.server import _err
+
+    async def main() -> None:
+        lane = Lane(
+            "test",
+            lambda: ThreadPoolExecutor(max_workers=1),
+            workers=1,
+            max_pending=1,
+            retry_after=7,
+        )
+        release = threading.Event()
+        busy = asyncio.create_task(lane.run(release.wait, 5))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError) as exc_info:
+            await lane.run(lambda: None)
+        release.set()
+        assert await busy is True
+        assert lane.status()["rejected"] == 1
+        lane.shutdown()
+        http = _err(exc_info.value)
+        assert http.status_code == 503
+        assert http.headers == {"Retry-After": "7"}
+
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Guards for the SQLite PBP game catalog (incremental rescans, fallback)."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from player_cards import pbp_game_index
+from player_cards.instat_source import discover_team_pbp_files
+from player_cards.pbp_game_index import PbpGameIndex
+
+
+def _csv(path: Path, team: str = "Boston Bruins") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"player,team,action\nA,{team},Shots\n", encoding="utf-8")
+    return path
+
+
+def test_rescan_skips_unchanged_dirs_and_forgets_removed_files(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    keep = _csv(root / "BOS" / "game_1_pbp.csv")
+    gone = _csv(root / "BOS" / "game_2_pbp.csv")
+    _csv(root / "game_3_pbp.csv")
+    with PbpGameIndex(tmp_path / "games.db") as index:
+        first = index.rescan([root])
+        assert first["dirs_listed"] == 2 and first["files_recorded"] == 3
+
+        again = index.rescan([root])
+        assert again == {"dirs_listed": 0, "dirs_skipped": 2, "files_recorded": 0, "files_removed": 0}
+
+        gone.unlink()
+        os.utime(gone.parent, (1, 1))  # don't depend on the fs mtime granularity
+        third = index.rescan([root])
+        assert third["dirs_listed"] == 1 and third["dirs_skipped"] == 1
+        assert third["files_removed"] == 1
+        assert [Path(r["path"]) for r in index.games(roots=[root / "BOS"])] == [keep]
+        assert [Path(r["path"]).name for r in index.games(team="boston bruins")] == ["game_1_pbp.csv", "game_3_pbp.csv"]
+
+
+def test_discovery_walks_the_disk_when_the_index_fails(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    work = tmp_path / "work"
+    monkeypatch.setenv("PLAYER_CARDS_WORK_ROOT", str(work))
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    ours = _csv(work / "Boston Bruins" / "Instat_API_Downloads" / "game_1_pbp.csv")
+    _csv(work / "Boston Bruins" / "Instat_API_Downloads" / "game_2_pbp.csv", team="Ottawa Senators")
+
+    def locked(*_args: object, **_kwargs: object) -> PbpGameIndex:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(pbp_game_index, "open_game_index", locked)
+    assert discover_team_pbp_files("BOS") == [ours]
+
+
+def test_harvest_scans_files_when_the_index_fails(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from player_cards.pbp_harvest import find_player_pbp_files, player_appearances
+
+    monkeypatch.setattr(pbp_game_index, "DEFAULT_INDEX_PATH", tmp_path / "games.db")
+    root = tmp_path / "Prospects"
+    games = [("Dupont Emile", "Moncton"), ("Emile Dupont", "Halifax"), ("Sam Smith", "Moncton")]
+    for i, (player, team) in enumerate(games):
+        path = root / team / f"game_2025-01-0{i + 1}_10{i}_pbp.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"player,team,action\n{player},{team},Shots\nOther Guy,{team},Passes\n", encoding="utf-8")
+    indexed = find_player_pbp_files("Emile Dupont", root=root)
+    by_file = player_appearances("Emile Dupont", files=sorted(root.rglob("*.csv")))
+    assert sorted(indexed) == ["Halifax", "Moncton"]
+
+    def locked(*_args: object, **_kwargs: object) -> PbpGameIndex:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(pbp_game_index, "open_game_index", locked)
+    assert find_player_pbp_files("Emile Dupont", root=root) == indexed
+    assert player_appearances("Emile Dupont", files=sorted(root.rglob("*.csv"))) == by_file
+
+
+def test_fast_cache_writes_manifest_without_games_when_the_index_fails(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    from player_cards import instat_pbp_fetch
+
+    team_dir = tmp_path / "BOS"
+    files = [_csv(team_dir / f"game_2025-01-0{i}_10{i}_pbp.csv") for i in (1, 2)]
+
+    def locked(*_args: object, **_kwargs: object) -> PbpGameIndex:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(pbp_game_index, "DEFAULT_INDEX_PATH", tmp_path / "games.db")
+    monkeypatch.setattr(instat_pbp_fetch, "min_season_games", lambda league: 2)
+    monkeypatch.setattr(instat_pbp_fetch, "open_game_index", locked)
+    meta = instat_pbp_fetch.try_fast_pbp_cache("BOS", team_dir, season_id=36)
+    assert meta is not None and meta["files"] == files
+    manifest = instat_pbp_fetch._load_manifest(team_dir, 36)
+    assert manifest is not None and manifest["match_ids"] == [101, 102]
+    assert "games" not in manifest
@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from player_cards.goalie_pbp_metrics import _counted_shot_rows, build_goalie_shots, shot_context_flags
 from player_cards.pbp_metrics import (
     SHOT_MAP_ACTIONS,
     _is_assist_shot,
@@ -32,7 +38,58 @@ def test_shot_map_actions_cover_instat_variants() -> None:
     assert "Blocked shots" not in SHOT_MAP_ACTIONS  # defensive/blocked attempts stay off OZ map
 
 
+def test_goal_and_its_sog_twin_count_once() -> None:
+    actions = np.array(["Shots on goal", "Goals", "Goals", "Shots", "Shots on goal"])
+    starts = np.array([10.0, 10.0, 20.0, 30.0, np.nan])
+    players = np.array(["a", "a", "b", "c", "d"])
+    counted, is_goal = _counted_shot_rows(actions, starts, players)
+    assert counted.tolist() == [True, False, True, False, True]
+    assert is_goal[counted].tolist() == [True, True, False]
+
+
+def test_goalie_shot_context_flags() -> None:
+    rows = [
+        ("A", "Entries via pass", 15.0, 0.0),
+        ("A", "Even strength shifts", 15.0, 1.0),  # neutral, skipped
+        ("A", "Passes", 20.0, 2.0),
+        ("A", "Shots on goal", 10.0, 3.0),  # rush (entry 3 rows back) + royal road (20 -> 10)
+        ("B", "Puck recoveries in OZ", 5.0, 4.0),
+        ("B", "Faceoffs won", 5.0, 5.0),
+        ("B", "Passes", 25.0, 6.0),
+        ("B", "Shots on goal", 10.0, 12.0),  # cycle; pass is > 4s old, no royal road
+    ]
+    teams, actions, pos_y, starts = (np.array(c) for c in zip(*rows))
+    flags = shot_context_flags(actions, teams, pos_y.astype(float), starts.astype(float), "B")
+    assert flags["is_rush"][[3, 7]].tolist() == [True, False]
+    assert flags["is_royal_road"][[3, 7]].tolist() == [True, False]
+    assert flags["is_cycle"][[3, 7]].tolist() == [False, True]
+    # Row 3 is followed by no "A" shot; "B" rows are the goalie's own team.
+    assert not flags["is_rebound"][3]
+
+
+def test_goalie_shots_include_games_outside_the_warm_set(tmp_path: Path) -> None:
+    paths = []
+    for mid in (1, 2):
+        path = tmp_path / f"game_{mid}_pbp.csv"
+        pd.DataFrame({
+            "team": ["Home", "Away", "Away"],
+            "player": ["h1", "a1", "a2"],
+            "action": ["Passes", "Shots on goal", "Goals"],
+            "half": 1,
+            "start": [1.0, 5.0 + mid, 30.0],
+            "pos_x": [50.0, 170.0, 180.0],
+            "pos_y": [40.0, 30.0, 42.0],
+        }).to_csv(path, index=False)
+        paths.append(path)
+    # Game 2 is not in the team's warm file list; it must still be counted.
+    shots = build_goalie_shots(paths, "Home", all_files=paths[:1])
+    assert [s["game_file"] for s in shots] == ["game_1_pbp.csv"] * 2 + ["game_2_pbp.csv"] * 2
+    assert [s["is_goal"] for s in shots] == [False, True] * 2
+
+
 if __name__ == "__main__":
     test_shots_blocking_never_offensive_shot()
     test_shot_map_actions_cover_instat_variants()
+    test_goal_and_its_sog_twin_count_once()
+    test_goalie_shot_context_flags()
     print("OK: pbp invariant tests")
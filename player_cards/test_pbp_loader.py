@@ -0,0 +1,42 @@
+"""Guards for the compact PBP loader and the catalog's cold load path."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+
+from player_cards.pbp_catalog import load_dataframe
+from player_cards.pbp_loader import concat_frames, load_pbp
+
+
+def _write(path: Path, rows: list[dict]) -> Path:
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+def test_concat_frames_leaves_callers_parts_alone() -> None:
+    a = pd.DataFrame({"player": pd.Categorical(["A"]), "start": [1.0]})
+    b = pd.DataFrame({"player": pd.Categorical(["B"]), "start": [2.0]})
+    parts = [a, b]
+    out = concat_frames(parts)
+    assert parts[0] is a and parts[1] is b
+    assert list(a["player"].cat.categories) == ["A"]
+    assert list(out["player"].cat.categories) == ["A", "B"]
+
+
+def test_cold_catalog_load_drops_csvs_without_player_or_action(tmp_path: Path) -> None:
+    game = _write(
+        tmp_path / "game_2025-01-02_101_pbp.csv",
+        [{"player": "A", "action": "Shots", "team": "X", "start": 5, "pos_x": 10.25}],
+    )
+    other = _write(tmp_path / "game_2025-01-03_102_pbp.csv", [{"team": "X", "start": 1}])
+    out = load_dataframe([game, other])
+    assert out["game_id"].astype(str).tolist() == ["101"]
+    assert out["player"].astype(str).tolist() == ["A"]
+
+
+def test_required_columns_are_checked_but_not_returned(tmp_path: Path) -> None:
+    game = _write(tmp_path / "a.csv", [{"player": "A", "action": "Shots", "start": 5}])
+    out = load_pbp([game], columns=["player", "start"], require=("player", "action"))
+    assert list(out.columns) == ["player", "start"]
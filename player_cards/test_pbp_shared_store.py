@@ -0,0 +1,66 @@
+"""Guards for the memory-mapped shared PBP store (round trip and pruning)."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from player_cards.pbp_loader import _STR_DTYPE
+from player_cards.pbp_shared_store import load_frame, prune_store, store_frame
+
+
+@pytest.fixture
+def store_root(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    root = tmp_path / "shared"
+    monkeypatch.setenv("PLAYER_CARDS_PBP_SHARED_DIR", str(root))
+    return root
+
+
+def _game(tmp_path: Path, name: str = "game_1_pbp.csv") -> Path:
+    path = tmp_path / name
+    path.write_text("player,action\nA,Shots\n", encoding="utf-8")
+    return path
+
+
+def test_round_trip_keeps_dtypes_and_missing_strings(store_root: Path, tmp_path: Path) -> None:
+    df = pd.DataFrame({
+        "player": pd.Series(["A", None, "B", "A"], dtype=_STR_DTYPE),
+        "action": pd.Categorical(["Shots", "Passes", None, "Shots"]),
+        "start": np.array([1.5, np.nan, 3.0, 4.0]),
+        "pos_x": np.array([10.0, 20.0, np.nan, 30.0], dtype=np.float32),
+        "half": np.array([1, 1, 2, 2], dtype=np.int64),
+    })
+    path = _game(tmp_path)
+    assert store_frame(path, df)
+    out = load_frame(path)
+    assert out is not None
+    assert out.dtypes.to_dict() == df.dtypes.to_dict()
+    # Compare values as objects: categorical codes come back as a memmap, not an ndarray.
+    pd.testing.assert_frame_equal(out.astype(object), df.astype(object))
+    assert out["player"].isna().tolist() == [False, True, False, False]
+    # Numeric columns are the read-only mapped arrays themselves.
+    assert not out["start"].to_numpy().flags.writeable
+    with pytest.raises(ValueError):
+        out["start"].to_numpy()[0] = 0.0
+
+
+def test_changed_source_misses_and_prune_drops_stale_entries(store_root: Path, tmp_path: Path) -> None:
+    df = pd.DataFrame({"player": pd.Categorical(["A"]), "start": [1.0]})
+    kept, changed, gone = (_game(tmp_path, f"game_{i}_pbp.csv") for i in (1, 2, 3))
+    for path in (kept, changed, gone):
+        assert store_frame(path, df)
+    changed.write_text("player,action\nA,Shots\nB,Goals\n", encoding="utf-8")
+    gone.unlink()
+    orphan_tmp = store_root / ".tmp-dead"
+    orphan_tmp.mkdir()
+    os.utime(orphan_tmp, (0, 0))
+
+    assert load_frame(changed) is None
+    assert prune_store() == 3
+    assert load_frame(kept) is not None
+    assert len(list(store_root.iterdir())) == 1
+    assert prune_store(keep=[]) == 1
@@ -0,0 +1,50 @@
+"""Guards: bisected percentile ranks match the linear ``_pct_rank`` scan."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from player_cards import disk_cache, percentile_index as pi
+from player_cards.pbp_display import _pct_rank
+from player_cards.percentile_index import PercentileIndex, percentile_index
+from player_cards.team_source import _LOWER_IS_BETTER, compute_official_stat_percentiles
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rank_matches_pct_rank_with_ties_and_nan(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    pop = rng.integers(0, 8, size=40).astype(float).tolist()  # lots of ties
+    pop[3] = float("nan")
+    index = PercentileIndex(metrics={"m": pop})
+    for value in [*set(pop), -1.0, 0.5, 99.0, float("nan")]:
+        assert index.rank("m", value) == _pct_rank(value, pop), value
+    assert index.rank("m", None) is None and _pct_rank(None, pop) is None
+    assert index.rank("missing", 1.0) is None and _pct_rank(1.0, []) is None
+
+
+def test_lower_is_better_keys_invert_the_same_rank(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(disk_cache, "CACHE_ROOT", tmp_path)
+    keys = ["goalsAgainstPerGame", "goalsForPerGame"]
+    rows = {f"T{i}": {k: float(v) for k, v in zip(keys, (i % 4, i % 3))} for i in range(12)}
+    for tri, row in rows.items():
+        got = compute_official_stat_percentiles(row, rows, keys, season="2024")
+        for k in keys:
+            want = _pct_rank(row[k], [r[k] for r in rows.values()])
+            assert got[k] == ((1.0 - want) if k in _LOWER_IS_BETTER else want), (tri, k)
+
+
+def test_leagues_do_not_share_files_and_memo_is_bounded(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(disk_cache, "CACHE_ROOT", tmp_path)
+    monkeypatch.setattr(pi, "_indexes", type(pi._indexes)())
+    nhl = percentile_index("team-averages", "2025", "a", lambda: PercentileIndex({"m": [1.0]}), league="nhl")
+    pwhl = percentile_index("team-averages", "2025", "b", lambda: PercentileIndex({"m": [2.0]}), league="pwhl")
+    assert nhl is not pwhl
+    assert sorted(p.name for p in (tmp_path / "percentiles" / "2025").iterdir()) == [
+        "nhl-team-averages-a.npz", "pwhl-team-averages-b.npz",
+    ]
+    for i in range(pi.MEMO_SIZE + 5):
+        percentile_index("goalies", "2025", str(i), lambda: PercentileIndex({"m": [0.0]}), league="nhl")
+    assert len(pi._indexes) == pi.MEMO_SIZE
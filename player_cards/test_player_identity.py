@@ -0,0 +1,49 @@
+"""Guards: identity-table player masks match the fuzzy string matcher."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from player_cards import player_identity
+from player_cards.instat_source import _match_player_name
+from player_cards.player_identity import PlayerIdentity, player_rows
+
+NAMES = [
+    "Emile Dupont", "Dupont Emile", "Émile Dupont", "DUPONT Émile", "Emil Dupont",
+    "Jean Dupont", "Emile Durand", None, "Dupont Emile (C)", "Sam Smith", "Smith Sam",
+]
+
+
+def _reference(values: pd.Series, name: str) -> np.ndarray:
+    """The per-row string match the PBP masks used before name ids."""
+    return np.array([v is not None and _match_player_name(str(v), name) for v in values], dtype=bool)
+
+
+@pytest.mark.parametrize("name", ["Emile Dupont", "Dupont Emile", "Sam Smith", "Smith Sam"])
+@pytest.mark.parametrize("categorical", [False, True])
+def test_player_rows_match_string_matcher(tmp_path: Path, name: str, categorical: bool) -> None:
+    values = pd.Series(NAMES * 3, dtype="category" if categorical else object)
+    with_ids = PlayerIdentity(tmp_path / "identity.db")
+    try:
+        got = with_ids.player_rows(values, name)
+        assert got.any()
+        np.testing.assert_array_equal(got, _reference(values, name))
+        # New spellings interned later are still picked up (watermark path).
+        later = pd.Series(["Dupont  Emile", "Smith, Sam", "Other Guy"])
+        np.testing.assert_array_equal(with_ids.player_rows(later, name), _reference(later, name))
+    finally:
+        with_ids.close()
+
+
+def test_player_rows_fall_back_to_string_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    def broken() -> PlayerIdentity:
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(player_identity, "identity_table", broken)
+    values = pd.Series(NAMES, dtype="category")
+    np.testing.assert_array_equal(player_rows(values, "Dupont Emile"), _reference(values, "Dupont Emile"))
@@ -0,0 +1,83 @@
+"""QOC/QOT parity: the block-vectorized game pass matches the per-block loop."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from player_cards.qoc_qot import _is_probable_goalie, _lookup_gs, _qoc_qot_game
+
+SHIFTS = ("Even strength shifts", "Power play shifts", "Penalty kill shifts")
+
+
+def _reference_qoc_qot_game(df: pd.DataFrame, team_name: str, game_id: str, gs_game: dict, gs_season: dict) -> pd.DataFrame:
+    """The per-(start, action) block loop that shipped before the vectorized pass."""
+    shifts = df[df["action"].isin(SHIFTS) & df["player"].notna() & (df["player"] != "")].copy()
+    rows: list[dict[str, Any]] = []
+    for (_start, _action), block in shifts.groupby(["start", "action"], sort=False):
+        team_players = block[block["team"] == team_name]["player"].unique().tolist()
+        if not team_players:
+            continue
+        opp_players = [p for p in block[block["team"] != team_name]["player"].unique() if not _is_probable_goalie(p, df)]
+        skaters = [p for p in team_players if not _is_probable_goalie(p, df)]
+        opp_gs = [g for g in (_lookup_gs(p, game_id, gs_game, gs_season) for p in opp_players) if np.isfinite(g)]
+        qoc_val = float(np.mean(opp_gs)) if opp_gs else float("nan")
+        for pl in skaters:
+            mate_gs = [_lookup_gs(p, game_id, gs_game, gs_season) for p in skaters if p != pl]
+            mate_gs = [g for g in mate_gs if np.isfinite(g)]
+            qot_val = float(np.mean(mate_gs)) if mate_gs else float("nan")
+            rows.append({"player": pl, "qoc": qoc_val, "qot": qot_val})
+    if not rows:
+        return pd.DataFrame(columns=["player", "qoc", "qot", "shift_events"])
+    gdf = pd.DataFrame(rows)
+    out = []
+    for player, grp in gdf.groupby("player"):
+        out.append({
+            "player": player,
+            "qoc": grp["qoc"].dropna().mean() if grp["qoc"].notna().any() else float("nan"),
+            "qot": grp["qot"].dropna().mean() if grp["qot"].notna().any() else float("nan"),
+            "shift_events": len(grp),
+        })
+    return pd.DataFrame(out)
+
+
+def _game(seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = []
+    rosters = {team: [f"{team[0]}{k}" for k in range(10)] for team in ("Home", "Away")}
+    for team, roster in rosters.items():
+        # Goalie: many shift rows, no play actions.
+        for t in range(0, 3600, 600):
+            rows.append((team, f"{team[0]}G", "Even strength shifts", float(t)))
+        t = 0
+        while t < 3600:
+            action = str(rng.choice(SHIFTS, p=[0.8, 0.1, 0.1]))
+            start = float(t if rng.random() < 0.7 else t + rng.integers(1, 3))
+            for p in rng.choice(roster, 5, replace=False):
+                rows.append((team, str(p), action, start))
+            t += int(rng.integers(30, 60))
+        # Skaters need a few play rows or they look like goalies.
+        for p in roster[:-1]:
+            for _ in range(3):
+                rows.append((team, p, "Passes", float(rng.integers(0, 3600))))
+    rows.append(("Home", "H1", "Even strength shifts", np.nan))
+    rows.append(("Home", "H1", "Even strength shifts", 0.0))  # duplicate row in a block
+    return pd.DataFrame(rows, columns=["team", "player", "action", "start"])
+
+
+def test_block_qoc_qot_matches_reference_loop() -> None:
+    for seed in range(4):
+        df = _game(seed)
+        rng = np.random.default_rng(100 + seed)
+        players = sorted(set(df["player"]))
+        gs_game = {(p, "g1"): float(rng.normal(2, 1)) for p in players[::2]}
+        gs_season = {p: float(rng.normal(2, 1)) for p in players[1::3]}
+        for team in ("Home", "Away"):
+            got = _qoc_qot_game(df, team, "g1", gs_game, gs_season)
+            want = _reference_qoc_qot_game(df, team, "g1", gs_game, gs_season)
+            assert len(got) > 5
+            pd.testing.assert_frame_equal(
+                got.reset_index(drop=True), want.reset_index(drop=True), check_dtype=False
+            )
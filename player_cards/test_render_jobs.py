@@ -0,0 +1,72 @@
+"""Guards for the persistent render job queue (claim, requeue, prune)."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from player_cards.render_jobs import MAX_ATTEMPTS, JobQueue
+
+
+def test_submit_claim_complete(tmp_path: Path) -> None:
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        batch_id, job_ids = queue.submit([{"player": "A"}, {"player": "B"}])
+        assert queue.pending() == 2
+
+        first = queue.claim()
+        assert first is not None and first["job_id"] == job_ids[0]
+        assert first["spec"] == {"player": "A"}
+        assert queue.get(job_ids[0])["status"] == "running"
+
+        png = tmp_path / f"{job_ids[0]}.png"
+        queue.complete(job_ids[0], png)
+        second = queue.claim()
+        queue.fail(second["job_id"], "boom")
+        assert queue.claim() is None
+        assert queue.pending() == 0
+        assert [j["status"] for j in queue.batch(batch_id)] == ["done", "failed"]
+        assert queue.get(job_ids[0])["result_path"] == str(png)
+
+
+def test_stale_running_jobs_requeue_then_fail(tmp_path: Path) -> None:
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        _, (job_id,) = queue.submit([{"player": "A"}])
+        queue.claim()
+        # A fresh claim is not stale.
+        assert queue.requeue_stale(older_than=60) == 0
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            time.sleep(0.01)
+            assert queue.requeue_stale(older_than=0) == 1
+            job = queue.get(job_id)
+            if attempt < MAX_ATTEMPTS:
+                assert job["status"] == "queued"
+                assert queue.claim()["job_id"] == job_id
+        assert job["status"] == "failed"
+        assert job["error"] == "worker died"
+        assert queue.pending() == 0
+
+
+def test_prune_drops_old_finished_jobs_and_pngs(tmp_path: Path) -> None:
+    results = tmp_path / "results"
+    results.mkdir()
+    with JobQueue(tmp_path / "jobs.db") as queue:
+        _, (done_id, live_id) = queue.submit([{"player": "A"}, {"player": "B"}])
+        queue.claim()
+        png = results / f"{done_id}.png"
+        png.write_bytes(b"png")
+        queue.complete(done_id, png)
+        queue.claim()
+        orphan = results / "gone.png"
+        orphan.write_bytes(b"png")
+        old = time.time() - 3600
+        os.utime(orphan, (old, old))
+
+        # Recent results are kept; the orphan is past the cutoff.
+        assert queue.prune(older_than=60, results_dir=results) == 0
+        assert png.exists() and not orphan.exists()
+
+        time.sleep(0.01)
+        assert queue.prune(older_than=0, results_dir=results) == 1
+        assert queue.get(done_id) is None and not png.exists()
+        assert queue.get(live_id)["status"] == "running"
@@ -0,0 +1,160 @@
+"""Per-request stage timings for card builds and renders.
+
+``collect()`` opens a collector for the current request (a context variable,
+so concurrent requests never mix). ``span(name)`` / ``@timed(name)`` add
+wall-clock milliseconds to it. Repeated stages are summed and nested stages
+overlap. Code that has no collector open pays only a ``perf_counter`` pair.
+Thread-pool work records into the caller's collector when it is submitted
+through ``propagate``.
+
+A finished collector renders as a ``Server-Timing`` header and a one-line JSON
+log. With ``PLAYER_CARDS_METRICS=1`` and ``prometheus_client`` installed, every
+span is also observed in the ``player_cards_stage_seconds`` histogram served
+on ``/metrics``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_current: contextvars.ContextVar[Timings | None] = contextvars.ContextVar("player_cards_timings", default=None)
+_metrics_on = os.getenv("PLAYER_CARDS_METRICS", "").strip().lower() in {"1", "true", "yes", "on"}
+_histogram: Any = None
+_histogram_lock = threading.Lock()
+
+
+@dataclass(eq=False)
+class Timings:
+    label: str = ""
+    stages: dict[str, float] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, name: str, ms: float) -> None:
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + ms
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            stages = {k: round(v, 1) for k, v in self.stages.items()}
+        return {"label": self.label, "total_ms": round(self.total_ms(), 1), "stages_ms": stages}
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value (stages plus ``total``)."""
+        with self._lock:
+            parts = [f"{name};dur={ms:.1f}" for name, ms in self.stages.items()]
+        parts.append(f"total;dur={self.total_ms():.1f}")
+        return ", ".join(parts)
+
+
+def current() -> Timings | None:
+    return _current.get()
+
+
+@contextmanager
+def collect(label: str = "") -> Iterator[Timings]:
+    """Collect spans recorded inside the block (and in work it ``propagate``s)."""
+    timings = Timings(label=label)
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def record(name: str, ms: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, ms)
+    if _metrics_on:
+        _observe(name, ms)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - t0) * 1000)
+
+
+def timed(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator form of ``span``."""
+
+    def wrap(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def inner(*args: Any, **kwargs: Any) -> T:
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return inner
+
+    return wrap
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """Bind ``fn`` to the caller's context so thread-pool spans reach its collector."""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def log_timings(timings: Timings, **fields: Any) -> None:
+    logger.info("timings %s", json.dumps({**timings.as_dict(), **fields}, default=str, sort_keys=True))
+
+
+# ── Prometheus (optional) ────────────────────────────────────────────────
+
+
+def enable_metrics(on: bool = True) -> None:
+    global _metrics_on
+    _metrics_on = on
+
+
+def _observe(name: str, ms: float) -> None:
+    global _histogram, _metrics_on
+    if _histogram is None:
+        with _histogram_lock:
+            if _histogram is None:
+                try:
+                    from prometheus_client import Histogram
+                except ImportError:
+                    logger.warning("PLAYER_CARDS_METRICS set but prometheus_client is not installed")
+                    _metrics_on = False
+                    return
+                _histogram = Histogram(
+                    "player_cards_stage_seconds",
+                    "Wall time of card pipeline stages",
+                    ["stage"],
+                    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+                )
+    _histogram.labels(stage=name).observe(ms / 1000)
+
+
+def metrics_payload() -> tuple[bytes, str] | None:
+    """Prometheus exposition (body, content type), or None when metrics are off."""
+    if not _metrics_on:
+        return None
+    try:
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+    except ImportError:
+        return None
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,142 @@
+"""Bounded execution lanes for the async API.
+
+Three lanes keep slow work from starving cheap requests:
+
+* ``io``     — thread pool for store reads, disk and HTTP lookups
+* ``cpu``    — thread pool for live profile / card builds from cached PBP
+* ``render`` — small thread pool feeding Playwright (already serialized)
+
+Live builds run in this process on purpose: they read the team frames and
+aggregates that ``api_warm`` already holds instead of each pool process
+re-parsing every CSV. Scale across cores with ``PLAYER_CARDS_API_WORKERS``
+(those workers share PBP frames through ``pbp_shared_store``).
+
+Each lane admits at most ``max_pending`` queued + running jobs; beyond that
+``run`` raises :class:`~player_cards.service.OverloadedError` so the server can
+answer 503 with ``Retry-After`` instead of piling up requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, TypeVar
+
+from .service import OverloadedError
+from .timing import propagate, span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, "")))
+    except ValueError:
+        return default
+
+
+class Lane:
+    def __init__(
+        self,
+        name: str,
+        make_executor: Callable[[], Executor],
+        *,
+        workers: int,
+        max_pending: int,
+        retry_after: int,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._make_executor = make_executor
+        self._executor: Executor | None = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._make_executor()
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        # Counter is only touched from the event loop thread.
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise OverloadedError(
+                f"{self.name} queue full ({self._pending}/{self.max_pending})",
+                retry_after=self.retry_after,
+            )
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            job = partial(fn, *args, **kwargs)
+            if isinstance(self.executor, ThreadPoolExecutor):
+                # Thread jobs record their spans into the request's collector;
+                # process-pool jobs only show up as the lane's wall time.
+                job = propagate(job)
+            with span(f"{self.name}_lane"):
+                return await loop.run_in_executor(self.executor, job)
+        finally:
+            self._pending -= 1
+            self.completed += 1
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_CPU_WORKERS = _env_int("PLAYER_CARDS_CPU_WORKERS", min(4, os.cpu_count() or 1))
+_RENDER_WORKERS = _env_int("PLAYER_CARDS_RENDER_WORKERS", 1)
+_IO_WORKERS = _env_int("PLAYER_CARDS_IO_WORKERS", 32)
+
+io = Lane(
+    "io",
+    lambda: ThreadPoolExecutor(max_workers=_IO_WORKERS, thread_name_prefix="cards-io"),
+    workers=_IO_WORKERS,
+    max_pending=_env_int("PLAYER_CARDS_IO_QUEUE", _IO_WORKERS * 4),
+    retry_after=1,
+)
+cpu = Lane(
+    "cpu",
+    lambda: ThreadPoolExecutor(max_workers=_CPU_WORKERS, thread_name_prefix="cards-cpu"),
+    workers=_CPU_WORKERS,
+    max_pending=_env_int("PLAYER_CARDS_CPU_QUEUE", _CPU_WORKERS * 4),
+    retry_after=10,
+)
+render = Lane(
+    "render",
+    lambda: ThreadPoolExecutor(max_workers=_RENDER_WORKERS, thread_name_prefix="cards-render"),
+    workers=_RENDER_WORKERS,
+    max_pending=_env_int("PLAYER_CARDS_RENDER_QUEUE", 8),
+    retry_after=15,
+)
+
+LANES = {lane.name: lane for lane in (io, cpu, render)}
+
+
+def lanes_status() -> dict[str, dict[str, Any]]:
+    return {name: lane.status() for name, lane in LANES.items()}
+
+
+def shutdown_lanes() -> None:
+    for lane in LANES.values():
+        lane.shutdown()
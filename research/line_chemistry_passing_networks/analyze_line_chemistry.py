@@ -14,7 +14,7 @@ import os
 import re
 import sys
 import unicodedata
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -39,6 +39,7 @@ if _GH_PBP_ROOT.is_dir() and not os.environ.get("PLAYER_CARDS_WORK_ROOT"):
 
 from player_cards.instat_source import NHL_TEAM_SEARCH, _match_player_name  # noqa: E402
 from player_cards.leagues import player_cards_work_root  # noqa: E402
+from player_cards.pbp_loader import load_pbp as load_pbp_frames  # noqa: E402
 
 from pipeline.line_pairing_engine import (  # noqa: E402
     UnitKey,
@@ -81,16 +82,19 @@ def _norm(s: str) -> str:
     return re.sub(r"\s+", " ", s.lower().strip())
 
 
+def _xg_model(px: Any, py: Any) -> Any:
+    """Distance/angle logistic xG for shot coordinates (floats or arrays)."""
+    dx = np.maximum(0.0, NET_X - px)
+    dy = np.abs(NET_Y - py)
+    z = -1.12 - 0.09 * np.hypot(dx, dy) - 1.6 * np.arctan2(dy, dx + 1e-9)
+    return 1.0 / (1.0 + np.exp(-z))
+
+
 def _xg(px: float, py: float) -> float:
     try:
-        dx = max(0.0, NET_X - float(px))
-        dy = abs(NET_Y - float(py))
+        return float(_xg_model(float(px), float(py)))
     except (TypeError, ValueError):
         return 0.0
-    dist = math.hypot(dx, dy)
-    ang = math.atan2(dy, dx + 1e-9)
-    z = -1.12 - 0.09 * dist - 1.6 * ang
-    return 1.0 / (1.0 + math.exp(-z))
 
 
 def discover_nhl_pbp_files() -> list[Path]:
@@ -114,41 +118,33 @@ def _game_id_from_path(p: Path) -> str:
     return m.group(1) if m else p.stem
 
 
+PBP_COLUMNS = (
+    "half", "start", "end", "duration", "team", "player", "action", "pos_x", "pos_y", "Result",
+)
+
+
 def load_pbp(files: list[Path]) -> pd.DataFrame:
-    parts: list[pd.DataFrame] = []
-    for fp in files:
-        try:
-            df = pd.read_csv(fp)
-        except Exception:
-            continue
-        if df.empty:
-            continue
-        gid = _game_id_from_path(fp)
-        df = df.copy()
-        df["game_id"] = gid
-        df["pos_x"] = pd.to_numeric(df.get("pos_x"), errors="coerce")
-        df["pos_y"] = pd.to_numeric(df.get("pos_y"), errors="coerce")
-        if "start" in df.columns:
-            df["start"] = pd.to_numeric(df["start"], errors="coerce")
-        parts.append(df)
-    if not parts:
-        return pd.DataFrame()
-    out = pd.concat(parts, ignore_index=True)
-    sort_cols = [c for c in ("game_id", "half", "start") if c in out.columns]
-    return out.sort_values(sort_cols).reset_index(drop=True)
+    df = load_pbp_frames(
+        [(fp, {"game_id": _game_id_from_path(fp)}) for fp in files],
+        columns=PBP_COLUMNS,
+        coord_dtype=np.float64,
+    )
+    if df.empty:
+        return df
+    sort_cols = [c for c in ("game_id", "half", "start") if c in df.columns]
+    return df.sort_values(sort_cols).reset_index(drop=True)
 
 
 def attach_xg(df: pd.DataFrame) -> pd.DataFrame:
+    """``xG_final`` per row: the ``_xg`` distance/angle model for located shots, else 0."""
     out = df.copy()
-    xgs: list[float] = []
-    for _, row in out.iterrows():
-        act = str(row.get("action", ""))
-        if act in SHOT_ACTIONS and act != "Blocked shots":
-            px, py = row.get("pos_x"), row.get("pos_y")
-            xgs.append(_xg(px, py) if pd.notna(px) and pd.notna(py) else 0.0)
-        else:
-            xgs.append(0.0)
-    out["xG_final"] = xgs
+    act = out["action"].astype(str)
+    missing = pd.Series(np.nan, index=out.index)
+    px = pd.to_numeric(out.get("pos_x", missing), errors="coerce").to_numpy(dtype=float)
+    py = pd.to_numeric(out.get("pos_y", missing), errors="coerce").to_numpy(dtype=float)
+    shot = (act.isin(SHOT_ACTIONS) & (act != "Blocked shots")).to_numpy() & ~np.isnan(px) & ~np.isnan(py)
+    with np.errstate(invalid="ignore", over="ignore"):
+        out["xG_final"] = np.where(shot, _xg_model(px, py), 0.0)
     return out
 
 
@@ -181,86 +177,111 @@ def fetch_nhl_positions() -> dict[str, str]:
 
 def _es_seconds_by_player(df: pd.DataFrame) -> dict[tuple[str, str], float]:
     """Approximate ES TOI from shift rows (player, team) -> seconds."""
-    secs: dict[tuple[str, str], float] = defaultdict(float)
     shifts = df[df["action"] == "Even strength shifts"]
-    for _, row in shifts.iterrows():
-        st, en = row.get("start"), row.get("end")
-        if pd.isna(st) or pd.isna(en):
-            continue
-        dt = float(en) - float(st)
-        if dt <= 0:
-            continue
-        key = (str(row["player"]), str(row["team"]))
-        secs[key] += dt
-    return dict(secs)
+    dt = pd.to_numeric(shifts["end"], errors="coerce") - pd.to_numeric(shifts["start"], errors="coerce")
+    keep = (dt > 0).to_numpy()
+    if not keep.any():
+        return {}
+    shifts, dt = shifts[keep], dt[keep]
+    secs = dt.groupby([shifts["player"].astype(str), shifts["team"].astype(str)], sort=False).sum()
+    return {(str(p), str(t)): float(v) for (p, t), v in secs.items()}
+
+
+EXIT_ACTIONS = frozenset({"Breakouts via pass", "Breakouts via stickhandling", "Breakouts"})
 
 
 def build_player_skills(df: pd.DataFrame) -> dict[str, dict[str, float]]:
-    """Per-player per-60 skill rates keyed by InStat name."""
+    """Per-player per-60 skill rates keyed by InStat name.
+
+    Only events logged while the (player, team) has 5+ ES minutes count; rates
+    use the ES minutes of the player's first team with positive ES time.
+    """
     es_secs = _es_seconds_by_player(df)
-    counts: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
-    xg_sum: dict[str, float] = defaultdict(float)
+    if not es_secs or df.empty:
+        return {}
+    es = pd.Series(es_secs, dtype=float)
 
     play = df[~df["action"].isin(NEUTRAL_ACTIONS)]
-    for _, row in play.iterrows():
-        player = str(row["player"])
-        act = str(row["action"])
-        team = str(row["team"])
-        mins = es_secs.get((player, team), 0) / 60.0
-        if mins < 5:
-            continue
-        if act in ENTRY_ACTIONS:
-            counts[player]["entries"] += 1
-        if act in RETRIEVAL_ACTIONS:
-            counts[player]["retrievals"] += 1
-        if act in ("Breakouts via pass", "Breakouts via stickhandling", "Breakouts"):
-            counts[player]["exits"] += 1
-        if act in PASS_ACTIONS:
-            counts[player]["passes"] += 1
-        if act in SHOT_ACTIONS and act != "Blocked shots":
-            xg_sum[player] += float(row.get("xG_final") or 0)
+    player = play["player"].astype(str).to_numpy()
+    act = play["action"].astype(str)
+    keys = pd.MultiIndex.from_arrays([player, play["team"].astype(str).to_numpy()])
+    mins = es.reindex(keys).fillna(0.0).to_numpy() / 60.0
+    is_shot = act.isin(SHOT_ACTIONS) & (act != "Blocked shots")
+    xg = (
+        pd.to_numeric(play["xG_final"], errors="coerce").fillna(0.0)
+        if "xG_final" in play.columns else pd.Series(0.0, index=play.index)
+    )
+    ev = pd.DataFrame({
+        "player": player,
+        "entries": act.isin(ENTRY_ACTIONS).to_numpy(),
+        "retrievals": act.isin(RETRIEVAL_ACTIONS).to_numpy(),
+        "exits": act.isin(EXIT_ACTIONS).to_numpy(),
+        "passes": act.isin(PASS_ACTIONS).to_numpy(),
+        "xg": xg.where(is_shot, 0.0).to_numpy(dtype=float),
+    })[mins >= 5]
+    counted = ev[["entries", "retrievals", "exits", "passes"]].any(axis=1)
+    order = pd.unique(ev.loc[counted, "player"])
+    totals = ev.groupby("player", sort=False).sum().reindex(order)
+
+    positive = es[es > 0]
+    first_team = pd.Series(
+        positive.to_numpy(), index=positive.index.get_level_values(0)
+    ).groupby(level=0, sort=False).first()
+    mins = first_team.reindex(order).fillna(0.0).to_numpy() / 60.0
 
     skills: dict[str, dict[str, float]] = {}
-    for player, c in counts.items():
-        team = next((t for (p, t), s in es_secs.items() if p == player and s > 0), "")
-        mins = es_secs.get((player, team), 0) / 60.0
-        if mins < 20:
+    for player, m, row in zip(order, mins.tolist(), totals.itertuples(index=False)):
+        if m < 20:
             continue
         skills[player] = {
-            "entry_rate": round(60 * c.get("entries", 0) / mins, 3),
-            "retrieval_rate": round(60 * c.get("retrievals", 0) / mins, 3),
-            "exit_rate": round(60 * c.get("exits", 0) / mins, 3),
-            "pass_rate": round(60 * c.get("passes", 0) / mins, 3),
-            "shot_xg_rate": round(60 * xg_sum.get(player, 0) / mins, 3),
-            "es_min": round(mins, 1),
+            "entry_rate": round(60 * int(row.entries) / m, 3),
+            "retrieval_rate": round(60 * int(row.retrievals) / m, 3),
+            "exit_rate": round(60 * int(row.exits) / m, 3),
+            "pass_rate": round(60 * int(row.passes) / m, 3),
+            "shot_xg_rate": round(60 * float(row.xg) / m, 3),
+            "es_min": round(m, 1),
         }
     return skills
 
 
+PASS_LOOKAHEAD = 3
+
+
 def infer_pass_edges(df: pd.DataFrame) -> list[tuple[str, str, str, str]]:
-    """Return (game_id, passer, receiver, team) for inferred completed passes."""
-    edges: list[tuple[str, str, str, str]] = []
-    sort_cols = [c for c in ("half", "start") if c in df.columns]
-    for gid, game in df.groupby("game_id"):
-        g = game.sort_values(sort_cols) if sort_cols else game
-        actions = g["action"].astype(str).tolist()
-        teams = g["team"].astype(str).tolist()
-        players = g["player"].astype(str).tolist()
-        n = len(actions)
-        for i in range(n):
-            if actions[i] not in PASS_ACTIONS:
-                continue
-            passer, team = players[i], teams[i]
-            for j in range(i + 1, min(i + 4, n)):
-                if teams[j] != team:
-                    break
-                if actions[j] in NEUTRAL_ACTIONS:
-                    continue
-                recv = players[j]
-                if recv != passer:
-                    edges.append((str(gid), passer, recv, team))
-                break
-    return edges
+    """Return (game_id, passer, receiver, team) for inferred completed passes.
+
+    The receiver is the next non-shift event within ``PASS_LOOKAHEAD`` rows of
+    the same game, provided the passing team keeps the puck until then and the
+    event belongs to someone other than the passer.
+    """
+    g = df[df["game_id"].notna()]
+    sort_cols = ["game_id", *(c for c in ("half", "start") if c in g.columns)]
+    g = g.sort_values(sort_cols, kind="stable")
+    game = pd.factorize(g["game_id"])[0]
+    actions = g["action"].astype(str)
+    teams = g["team"].astype(str).to_numpy()
+    players = g["player"].astype(str).to_numpy()
+    neutral = actions.isin(NEUTRAL_ACTIONS).to_numpy()
+    n = len(g)
+
+    passes = np.flatnonzero(actions.isin(PASS_ACTIONS).to_numpy())
+    receiver = np.full(len(passes), -1, dtype=np.int64)
+    alive = np.ones(len(passes), dtype=bool)
+    for k in range(1, PASS_LOOKAHEAD + 1):
+        j = passes + k
+        alive &= j < n
+        j = np.minimum(j, n - 1)
+        alive &= (game[j] == game[passes]) & (teams[j] == teams[passes])
+        hit = alive & ~neutral[j]
+        receiver[hit] = j[hit]
+        alive &= ~hit
+
+    ok = receiver >= 0
+    src, dst = passes[ok], receiver[ok]
+    keep = players[dst] != players[src]
+    src, dst = src[keep], dst[keep]
+    gids = g["game_id"].astype(str).to_numpy()
+    return list(zip(gids[src], players[src], players[dst], teams[src]))
 
 
 def _zscore(vals: dict[str, float]) -> dict[str, float]:
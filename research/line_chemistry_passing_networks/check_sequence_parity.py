@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Parity check: array sequence engine vs. reference per-event scans.
+
+Runs ``pipeline.sequence_engine.parity_report`` over every game in a PBP
+directory (``game_*_pbp.csv``) or, without ``--pbp-dir``, over synthetic
+games that exercise shifts, possession changes and missing coordinates.
+Exits non-zero on any mismatch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "vendor"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.analytics_engine import load_pbp_files  # noqa: E402
+from pipeline.sequence_engine import HAS_NUMBA, parity_report  # noqa: E402
+
+SYNTHETIC_ACTIONS = (
+    "Passes", "Passes", "Passes", "Shots", "Shots on goal", "Goals", "Missed shots",
+    "Power play shots", "Short-handed shots", "Entries", "Entries via pass",
+    "Entries via stickhandling", "Entries via dump in", "Breakouts", "Breakouts via pass",
+    "Breakouts via stickhandling", "Puck recoveries", "Puck recoveries in DZ",
+    "Puck recoveries in NZ", "Puck recoveries in OZ", "Puck losses", "Puck losses in DZ",
+    "Inaccurate passes", "Hits", "Puck battles won", "Faceoffs won", "Even strength shifts",
+    "Power play shifts", "Goalie shifts", "Dump outs",
+)
+
+
+def synthetic_game(n: int = 600, *, seed: int = 0, game_id: str = "synthetic") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    teams = np.array(["Team A", "Team B"])
+    # Possession runs so same-team windows actually occur.
+    team_idx = np.cumsum(rng.random(n) < 0.25) % 2
+    players = [f"P{t}{k}" for t, k in zip(team_idx, rng.integers(0, 6, n))]
+    pos_x = rng.uniform(0, 61, n).round(2)
+    pos_y = rng.uniform(0, 30, n).round(2)
+    pos_x[rng.random(n) < 0.05] = np.nan
+    pos_y[rng.random(n) < 0.05] = np.nan
+    half = np.sort(rng.integers(1, 4, n))
+    start = np.zeros(n)
+    for h in np.unique(half):
+        m = half == h
+        start[m] = np.cumsum(rng.exponential(2.0, m.sum())).round(0)
+    return pd.DataFrame({
+        "game_id": game_id,
+        "half": half,
+        "start": start,
+        "team": teams[team_idx],
+        "player": players,
+        "action": rng.choice(SYNTHETIC_ACTIONS, n),
+        "pos_x": pos_x,
+        "pos_y": pos_y,
+    })
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pbp-dir", type=Path, default=None)
+    parser.add_argument("--games", type=int, default=20, help="Synthetic games when no --pbp-dir")
+    parser.add_argument("--events", type=int, default=600)
+    parser.add_argument("--numba", choices=("auto", "on", "off"), default="auto")
+    args = parser.parse_args(argv)
+
+    use_numba = {"auto": None, "on": True, "off": False}[args.numba]
+    if args.pbp_dir:
+        df = load_pbp_files(args.pbp_dir)
+        games = [g for _, g in df.groupby("game_id", sort=False)]
+    else:
+        games = [synthetic_game(args.events, seed=s, game_id=f"syn{s}") for s in range(args.games)]
+
+    totals: dict[str, int] = {}
+    t0 = time.perf_counter()
+    for g in games:
+        for key, bad in parity_report(g, use_numba=use_numba).items():
+            totals[key] = totals.get(key, 0) + bad
+    elapsed = time.perf_counter() - t0
+
+    bad_total = sum(totals.values())
+    print(f"games={len(games)} numba={'yes' if HAS_NUMBA and use_numba is not False else 'no'} seconds={elapsed:.2f}")
+    for key in sorted(totals):
+        print(f"  {key:20s} mismatches={totals[key]}")
+    print("OK" if bad_total == 0 else f"FAIL ({bad_total} mismatches)")
+    return 0 if bad_total == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
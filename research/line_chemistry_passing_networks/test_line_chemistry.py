@@ -0,0 +1,249 @@
+"""Regression guards: vectorized skill / pass-edge builders match the row loops."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+import analyze_line_chemistry as alc
+from pipeline import line_pairing_engine as lpe
+
+ACTIONS = (
+    "Passes", "Passes", "Accurate passes", "Passes to the slot", "Shots", "Shots on goal", "Goals",
+    "Entries via pass", "Entries via stickhandling", "Breakouts via pass", "Breakouts",
+    "Puck recoveries", "Puck recoveries in DZ", "Hits", "Puck losses",
+)
+
+
+def _league(n_games: int = 6, seed: int = 7, shift_len: tuple[int, int] = (30, 60)) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    parts = []
+    for g in range(n_games):
+        teams = np.array([f"Team {g % 3}", f"Team {(g + 1) % 3}"])
+        rows = []
+        for side, team in enumerate(teams):
+            roster = [f"P{team[-1]}{k}" for k in range(8)]
+            t = 0.0
+            while t < 3600:
+                length = float(rng.integers(*shift_len))
+                for p in rng.choice(roster, 5, replace=False):
+                    rows.append((team, p, "Even strength shifts", t, t + length))
+                t += length
+        n = 900
+        team_idx = np.cumsum(rng.random(n) < 0.3) % 2
+        starts = np.sort(rng.uniform(0, 3600, n)).round(0)
+        for ti, st in zip(team_idx, starts):
+            team = teams[ti]
+            rows.append((team, f"P{team[-1]}{rng.integers(0, 8)}", str(rng.choice(ACTIONS)), st, np.nan))
+        # Shift rows interleaved with play, so the neutral-skip path is exercised.
+        frame = pd.DataFrame(rows, columns=["team", "player", "action", "start", "end"])
+        frame["game_id"] = f"g{g}"
+        frame["half"] = 1 + (frame["start"] >= 1800)
+        frame["xG_final"] = rng.uniform(0, 0.3, len(frame)).round(3)
+        parts.append(frame)
+    df = pd.concat(parts, ignore_index=True)
+    return df.sort_values(["game_id", "half", "start"]).reset_index(drop=True)
+
+
+def _reference_skills(df: pd.DataFrame, es_secs: dict[tuple[str, str], float]) -> dict[str, dict[str, float]]:
+    counts: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    xg_sum: dict[str, float] = defaultdict(float)
+    for _, row in df[~df["action"].isin(alc.NEUTRAL_ACTIONS)].iterrows():
+        player, act, team = str(row["player"]), str(row["action"]), str(row["team"])
+        if es_secs.get((player, team), 0) / 60.0 < 5:
+            continue
+        if act in alc.ENTRY_ACTIONS:
+            counts[player]["entries"] += 1
+        if act in alc.RETRIEVAL_ACTIONS:
+            counts[player]["retrievals"] += 1
+        if act in ("Breakouts via pass", "Breakouts via stickhandling", "Breakouts"):
+            counts[player]["exits"] += 1
+        if act in alc.PASS_ACTIONS:
+            counts[player]["passes"] += 1
+        if act in alc.SHOT_ACTIONS and act != "Blocked shots":
+            xg_sum[player] += float(row.get("xG_final") or 0)
+    skills = {}
+    for player, c in counts.items():
+        team = next((t for (p, t), s in es_secs.items() if p == player and s > 0), "")
+        mins = es_secs.get((player, team), 0) / 60.0
+        if mins < 20:
+            continue
+        skills[player] = {
+            "entry_rate": round(60 * c.get("entries", 0) / mins, 3),
+            "retrieval_rate": round(60 * c.get("retrievals", 0) / mins, 3),
+            "exit_rate": round(60 * c.get("exits", 0) / mins, 3),
+            "pass_rate": round(60 * c.get("passes", 0) / mins, 3),
+            "shot_xg_rate": round(60 * xg_sum.get(player, 0) / mins, 3),
+            "es_min": round(mins, 1),
+        }
+    return skills
+
+
+def _reference_edges(df: pd.DataFrame) -> list[tuple[str, str, str, str]]:
+    edges = []
+    for gid, game in df.groupby("game_id"):
+        g = game.sort_values(["half", "start"])
+        actions = g["action"].astype(str).tolist()
+        teams = g["team"].astype(str).tolist()
+        players = g["player"].astype(str).tolist()
+        for i in range(len(actions)):
+            if actions[i] not in alc.PASS_ACTIONS:
+                continue
+            for j in range(i + 1, min(i + 4, len(actions))):
+                if teams[j] != teams[i]:
+                    break
+                if actions[j] in alc.NEUTRAL_ACTIONS:
+                    continue
+                if players[j] != players[i]:
+                    edges.append((str(gid), players[i], players[j], teams[i]))
+                break
+    return edges
+
+
+def _reference_team_units(
+    df: pd.DataFrame, team: str, defense_players: set[str], position_by_player: dict[str, str]
+) -> dict[str, list[dict]]:
+    """The dict-of-segments ``_build_team_units`` that shipped before the interval index."""
+    goalies = lpe._identify_goalies(df[df["team"] == team], set())
+    goalie_names = lpe.load_goalie_name_set() | goalies
+
+    def is_forward(name: str) -> bool:
+        return not lpe.is_goalie_player(name, position_by_player.get(name, ""), goalie_names) and name not in defense_players
+
+    def is_defense(name: str) -> bool:
+        if lpe.is_goalie_player(name, position_by_player.get(name, ""), goalie_names):
+            return False
+        return name in defense_players or lpe._is_defense(position_by_player.get(name, ""))
+
+    trio_secs: dict = defaultdict(int)
+    pair_secs: dict = defaultdict(int)
+    all_segments = []
+    for _gid, gdf in df.groupby("game_id"):
+        gteam = gdf[gdf["team"] == team]
+        if gteam.empty:
+            continue
+        segs = lpe._sweep_segments(gteam, goalies, team, position_by_player)
+        all_segments.extend(segs)
+        for uk, sec in lpe._unit_seconds(segs, 3).items():
+            trio_secs[uk] += sec
+        for uk, sec in lpe._unit_seconds(segs, 2).items():
+            pair_secs[uk] += sec
+    trios = sorted(
+        ((uk, sec) for uk, sec in trio_secs.items() if sec >= 45 and all(is_forward(p) for p in uk.players)),
+        key=lambda x: x[1], reverse=True,
+    )
+    pairs = sorted(
+        ((uk, sec) for uk, sec in pair_secs.items() if sec >= 90 and all(is_defense(p) for p in uk.players)),
+        key=lambda x: x[1], reverse=True,
+    )
+    events = df[df["game_id"].isin(df.loc[df["team"] == team, "game_id"].unique())]
+    trio_counts = lpe._event_counts_for_units(all_segments, events, team=team, unit_keys={u for u, _ in trios}, k=3)
+    pair_counts = lpe._event_counts_for_units(all_segments, events, team=team, unit_keys={u for u, _ in pairs}, k=2)
+    all_trios = [lpe._pack_unit(uk, sec, trio_counts.get(uk, lpe._empty_counts()), "line") for uk, sec in trios]
+    all_pairs = [lpe._pack_unit(uk, sec, pair_counts.get(uk, lpe._empty_counts()), "pairing") for uk, sec in pairs]
+    return {
+        "lines": lpe._pick_unique(all_trios, 4),
+        "pairings": lpe._pick_unique(all_pairs, 3),
+        "all_lines": all_trios,
+        "all_pairings": all_pairs,
+    }
+
+
+def test_team_units_match_reference_including_ties() -> None:
+    # Fixed-length shifts so many units tie on TOI.
+    df = _league(n_games=3, seed=2, shift_len=(45, 46))
+    df["duration"] = (df["end"] - df["start"]).fillna(0)
+    ties = 0
+    for gid, game in df.groupby("game_id"):
+        game = game.reset_index(drop=True)
+        for team in game["team"].unique():
+            defense = {p for p in game.loc[game["team"] == team, "player"].unique() if p.endswith(("0", "1", "2"))}
+            got = lpe._build_team_units(game, team, defense, set(), {})
+            want = _reference_team_units(game, team, defense, {})
+            # xG sums are added in a different order, so a rounded value can differ by one cent.
+            for key in want:
+                assert [u["players"] for u in got[key]] == [u["players"] for u in want[key]], (gid, team, key)
+                for g, w in zip(got[key], want[key]):
+                    assert abs(g["xgf"] - w["xgf"]) <= 0.011 and abs(g["xga"] - w["xga"]) <= 0.011
+                    assert abs(g["xgf_pct"] - w["xgf_pct"]) <= 0.11
+                    exact = {f: v for f, v in g.items() if not f.startswith("xg")}
+                    assert exact == {f: v for f, v in w.items() if not f.startswith("xg")}, (gid, team, key)
+            secs = [u["toi_sec"] for u in got["all_pairings"] + got["all_lines"]]
+            ties += len(secs) - len(set(secs))
+    assert ties, "fixture should produce TOI ties"
+
+
+def _reference_es_seconds(df: pd.DataFrame) -> dict[tuple[str, str], float]:
+    """The shift-row sum ``_es_seconds_by_player`` used before the on-ice index."""
+    secs: dict[tuple[str, str], float] = defaultdict(float)
+    for _, row in df[df["action"] == "Even strength shifts"].iterrows():
+        st, en = row.get("start"), row.get("end")
+        if pd.isna(st) or pd.isna(en):
+            continue
+        dt = float(en) - float(st)
+        if dt <= 0:
+            continue
+        secs[(str(row["player"]), str(row["team"]))] += dt
+    return dict(secs)
+
+
+def test_es_seconds_match_shift_row_sum() -> None:
+    df = _league()
+    assert alc._es_seconds_by_player(df) == _reference_es_seconds(df)
+    # Overlapping, inverted, fractional and open shifts count exactly as before.
+    edge = pd.DataFrame({
+        "team": "X",
+        "player": ["p1", "p1", "p1", "p2", "p2", "p3"],
+        "action": "Even strength shifts",
+        "start": [0, 10, 50, 5.5, 30, 0],
+        "end": [20, 25, 40, 9.25, np.nan, 0],
+    })
+    assert alc._es_seconds_by_player(edge) == _reference_es_seconds(edge) == {("p1", "X"): 35.0, ("p2", "X"): 3.75}
+
+
+def test_attach_xg_matches_row_model() -> None:
+    df = _league(n_games=2)
+    rng = np.random.default_rng(3)
+    df["pos_x"] = rng.uniform(0, 200, len(df))
+    df["pos_y"] = rng.uniform(0, 85, len(df))
+    df.loc[df.index[::7], "pos_x"] = np.nan
+    got = alc.attach_xg(df)["xG_final"].to_numpy()
+    want = [
+        alc._xg(r.pos_x, r.pos_y)
+        if r.action in alc.SHOT_ACTIONS and r.action != "Blocked shots" and pd.notna(r.pos_x) and pd.notna(r.pos_y)
+        else 0.0
+        for r in df.itertuples()
+    ]
+    assert (got > 0).sum() > 50
+    np.testing.assert_allclose(got, want, rtol=1e-12, atol=0)
+
+
+def test_player_skills_match_row_loop() -> None:
+    df = _league()
+    es_secs = _reference_es_seconds(df)
+    skills = alc.build_player_skills(df)
+    assert skills, "fixture should produce skill rows"
+    assert skills == _reference_skills(df, es_secs)
+
+
+def test_pass_edges_match_row_loop() -> None:
+    df = _league()
+    edges = alc.infer_pass_edges(df)
+    assert edges
+    assert edges == _reference_edges(df)
+
+
+def test_pass_edges_stop_at_possession_change_and_game_end() -> None:
+    df = pd.DataFrame({
+        "game_id": ["a", "a", "a", "a", "b", "b"],
+        "half": 1,
+        "start": [1, 2, 3, 4, 1, 2],
+        "team": ["X", "X", "X", "Y", "X", "X"],
+        "player": ["p1", "s1", "p2", "q1", "p3", "p1"],
+        "action": ["Passes", "Even strength shifts", "Hits", "Passes", "Passes", "Passes"],
+    })
+    # p1 -> p2 skips the shift row; q1's pass has no later row in game "a";
+    # p3 -> p1 stays inside game "b"; the last pass in "b" has no receiver.
+    assert alc.infer_pass_edges(df) == [("a", "p1", "p2", "X"), ("b", "p3", "p1", "X")]
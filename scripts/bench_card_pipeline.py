@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""Stage-by-stage benchmark of the card pipeline on synthetic InStat PBP.
+
+Generates InStat-shaped ``game_<date>_<match>_pbp.csv`` files for a
+configurable league (teams × games per team, same columns and action
+vocabulary as real exports), then times each stage on its own:
+
+  warm            warm_team_pbp over every team's files (cold in-memory cache)
+  aggregate       aggregate_player_pbp for the top players of each team
+  league_context  compute_league_context per team (disk cache cleared)
+  build_store     team PBP metrics + percentile tables + profile upserts
+  profile_load    load_stored_profile + percentile enrichment per player
+  render          render_player_card_html per player
+  search          CardStore.search_players over the built store
+
+Everything runs offline under a throwaway cache root. Each stage keeps the best
+of ``--repeat`` runs. Results are compared with the stored baseline for the
+same league size in ``bench_baselines.json`` (machine-specific: re-save after
+changing hardware). A stage more than ``--tolerance`` slower than its baseline
+(and more than ``--min-delta-ms``) is flagged, and ``--check`` turns flags into
+a non-zero exit.
+
+    python scripts/bench_card_pipeline.py                    # compare
+    python scripts/bench_card_pipeline.py --save-baseline    # record
+    python scripts/bench_card_pipeline.py --teams 32 --games 82
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINES = Path(__file__).resolve().with_name("bench_baselines.json")
+STAGES = ("warm", "aggregate", "league_context", "build_store", "profile_load", "render", "search")
+
+SEASON = "2025-26"
+FIRST_NAMES = ("Alex", "Ben", "Carl", "Dylan", "Erik", "Filip", "Gabe", "Henri", "Ivan", "Jonas", "Kirill", "Lukas")
+LAST_NAMES = (
+    "Anders", "Brodin", "Carlsson", "Dahlin", "Ekholm", "Forsberg", "Granlund", "Hedman",
+    "Ivanov", "Johansson", "Kempe", "Lindholm", "Makar", "Nylander", "Olofsson", "Pettersson",
+)
+# (action, weight, has coordinates) — InStat's vocabulary as the metrics code reads it.
+PLAY_ACTIONS = (
+    ("Passes", 30, True), ("Accurate passes", 18, True), ("Inaccurate passes", 6, True),
+    ("Puck recoveries", 8, True), ("Puck recoveries in DZ", 5, True), ("Forecheck recoveries", 2, True),
+    ("Puck losses", 5, True), ("Entries", 3, True), ("Entries via pass", 2, True),
+    ("Entries via stickhandling", 2, True), ("Entries via dump in", 1, True), ("Breakouts", 3, True),
+    ("Breakouts via pass", 2, True), ("Breakouts via stickhandling", 1, True), ("Dump ins", 1, True),
+    ("Shots", 4, True), ("Shots on goal", 3, True), ("Missed shots", 1, True), ("Scoring chances", 2, True),
+    ("Blocked shots", 1, True), ("Shots blocking", 1, True), ("Hits", 3, True), ("Takeaways", 1, True),
+    ("Faceoffs won", 2, True), ("Faceoffs lost", 2, True), ("Faceoffs in OZ", 1, True),
+    ("Faceoffs in NZ", 1, True), ("Faceoffs in DZ", 1, True),
+)
+
+
+def _roster(league: str, tri: str, size: int = 20) -> list[str]:
+    seed = sum(ord(c) for c in f"{league}{tri}")
+    return [
+        f"{FIRST_NAMES[(seed + i) % len(FIRST_NAMES)]} {LAST_NAMES[(seed * 3 + i) % len(LAST_NAMES)]}{tri.title()}"
+        for i in range(size)
+    ]
+
+
+def _game_rows(rng: Any, home: str, away: str, rosters: dict[str, list[str]], events: int) -> list[tuple]:
+    import numpy as np
+
+    rows: list[tuple] = []
+    for team in (home, away):
+        roster = rosters[team]
+        for half in (1, 2, 3):
+            t = 0.0
+            while t < 1200:
+                length = float(rng.integers(35, 55))
+                for player in rng.choice(roster[:18], 5, replace=False):
+                    rows.append((half, t, t + length, team, player, "Even strength shifts", np.nan, np.nan, np.nan))
+                t += length
+    names = [a for a, _w, _c in PLAY_ACTIONS]
+    weights = np.array([w for _a, w, _c in PLAY_ACTIONS], dtype=float)
+    acts = rng.choice(names, events, p=weights / weights.sum())
+    halves = rng.integers(1, 4, events)
+    starts = rng.uniform(0, 1200, events).round(1)
+    sides = rng.random(events) < 0.5
+    xs = rng.uniform(0, 60, events).round(2)
+    ys = rng.uniform(0, 30, events).round(2)
+    for act, half, start, side, x, y in zip(acts, halves, starts, sides, xs, ys):
+        team = home if side else away
+        player = rosters[team][int(rng.integers(0, 18))]
+        xg = round(float(rng.uniform(0.01, 0.3)), 3) if "Shot" in act and "block" not in act.lower() else np.nan
+        rows.append((int(half), float(start), np.nan, team, player, str(act), x, y, xg))
+        if act == "Shots on goal" and rng.random() < 0.1:
+            rows.append((int(half), float(start), np.nan, team, player, "Goals", x, y, xg))
+    return rows
+
+
+def make_league(root: Path, *, league: str, teams: int, games: int, events: int, seed: int) -> dict[str, list[Path]]:
+    """Write a round-robin schedule of synthetic games; returns tri → that team's PBP files."""
+    import numpy as np
+    import pandas as pd
+
+    from player_cards.leagues import get_league, team_full_name
+
+    rng = np.random.default_rng(seed)
+    tris = list(get_league(league).teams)[:teams]
+    full = {tri: team_full_name(league, tri) for tri in tris}
+    rosters = {full[tri]: _roster(league, tri) for tri in tris}
+    files: dict[str, list[Path]] = {tri: [] for tri in tris}
+    opening = date(2025, 10, 7)
+    match_id = 900_000
+    # Each round pairs every team once, so every team plays ``games`` games.
+    for rnd in range(games):
+        order = list(rng.permutation(tris))
+        for home, away in zip(order[::2], order[1::2]):
+            match_id += 1
+            df = pd.DataFrame(
+                _game_rows(rng, full[home], full[away], rosters, events),
+                columns=["half", "start", "end", "team", "player", "action", "pos_x", "pos_y", "xG"],
+            )
+            name = f"game_{(opening + timedelta(days=rnd * 2)).isoformat()}_{match_id}_pbp.csv"
+            for tri in (home, away):
+                path = root / full[tri] / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                df.to_csv(path, index=False)
+                files[tri].append(path)
+    return {tri: sorted(paths) for tri, paths in files.items() if paths}
+
+
+def _best(fn: Callable[[], Any], repeat: int, reset: Callable[[], None] | None = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if reset:
+            reset()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 1)
+
+
+def run(
+    *, league: str, teams: int, games: int, events: int, players: int, roster: int, repeat: int, seed: int
+) -> dict[str, Any]:
+    work = Path(tempfile.mkdtemp(prefix="card-bench-"))
+    # Point every cache and store at the scratch root before player_cards loads.
+    os.environ.update(
+        {
+            "HOME": str(work / "home"),
+            "PLAYER_CARDS_STORE": str(work / "card_store.db"),
+            "PLAYER_CARDS_IDENTITY_DB": str(work / "identity.db"),
+            "PLAYER_CARDS_PBP_INDEX": str(work / "pbp_index.db"),
+            "PLAYER_CARDS_WORK_ROOT": str(work / "pbp"),
+            "SKIP_PHOTO_PREWARM": "1",
+        }
+    )
+    sys.path.insert(0, str(ROOT))
+    try:
+        return _run_stages(
+            work, league=league, teams=teams, games=games, events=events,
+            players=players, roster=roster, repeat=repeat, seed=seed,
+        )
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def _run_stages(
+    work: Path, *, league: str, teams: int, games: int, events: int, players: int, roster: int, repeat: int, seed: int
+) -> dict[str, Any]:
+    from player_cards import pbp_team_cache
+    from player_cards.build_store import _team_pbp_metrics
+    from player_cards.card_store import load_stored_profile, metric_populations, open_store
+    from player_cards.disk_cache import cache_path
+    from player_cards.html_renderer import render_player_card_html
+    from player_cards.leagues import team_full_name
+    from player_cards.pbp_display import build_pbp_display_profile
+    from player_cards.pbp_metrics import aggregate_player_pbp
+    from player_cards.profile import _enrich_stored_profile
+    from player_cards.qoc_qot import compute_league_context
+
+    t0 = time.perf_counter()
+    files = make_league(work / "pbp", league=league, teams=teams, games=games, events=events, seed=seed)
+    fixture_s = round(time.perf_counter() - t0, 2)
+    rosters = {tri: [{"name": n} for n in _roster(league, tri)[:roster]] for tri in files}
+    focus = {tri: [e["name"] for e in roster[:players]] for tri, roster in rosters.items()}
+    store_path = work / "card_store.db"
+    stages: dict[str, float] = {}
+
+    def _cold() -> None:
+        pbp_team_cache._frames.clear()
+
+    def _warm_all() -> None:
+        for paths in files.values():
+            pbp_team_cache.warm_team_pbp(paths)
+
+    stages["warm"] = _best(_warm_all, repeat, _cold)
+    _warm_all()
+
+    aggregates: dict[tuple[str, str], dict[str, Any]] = {}
+
+    def _aggregate() -> None:
+        for tri, names in focus.items():
+            for name in names:
+                agg = aggregate_player_pbp(name, tri, files=files[tri], team_games=len(files[tri]), league=league)
+                if agg:
+                    aggregates[(tri, name)] = agg
+
+    stages["aggregate"] = _best(_aggregate, repeat)
+
+    def _league_context() -> None:
+        for tri, paths in files.items():
+            compute_league_context(paths, team_full_name(league, tri))
+
+    stages["league_context"] = _best(
+        _league_context, repeat, lambda: shutil.rmtree(cache_path("league_ctx"), ignore_errors=True)
+    )
+
+    def _build_store() -> None:
+        with open_store(store_path) as store:
+            player_id = 1
+            for tri, paths in files.items():
+                metrics = _team_pbp_metrics(rosters[tri], paths, tri, league=league, team_games=len(paths))
+                index = store.replace_percentiles(league, SEASON, f"team:{tri}", metric_populations(metrics))
+                for name, vals in metrics.items():
+                    pbp = aggregates.get((tri, name)) or {"per_game": {}}
+                    profile = {
+                        "league": league,
+                        "bio": {"name": name, "team": tri, "player_id": player_id, "position": "C"},
+                        "pbp": pbp,
+                        "a3z": build_pbp_display_profile(pbp, None, season=SEASON, percentiles=index.ranks(vals)),
+                        "sources": {"a3z": False, "a3z_season": SEASON},
+                    }
+                    store.upsert_profile(profile, season=SEASON, pbp_fingerprint=None)
+                    player_id += 1
+
+    stages["build_store"] = _best(_build_store, repeat)
+
+    loaded: list[dict[str, Any]] = []
+
+    def _profile_load() -> None:
+        loaded.clear()
+        for tri, names in focus.items():
+            for name in names:
+                stored = load_stored_profile(name, team=tri, season=SEASON, league=league, store_path=store_path)
+                if stored:
+                    stored["a3z"] = None
+                    loaded.append(_enrich_stored_profile(stored))
+
+    stages["profile_load"] = _best(_profile_load, repeat)
+
+    def _render() -> None:
+        for profile in loaded:
+            render_player_card_html(profile)
+
+    stages["render"] = _best(_render, repeat)
+
+    queries = [n.split()[1][:5] for names in focus.values() for n in names][:20] or ["an"]
+
+    def _search() -> None:
+        with open_store(store_path) as store:
+            for q in queries:
+                store.search_players(q, league=league, season=SEASON)
+
+    stages["search"] = _best(_search, repeat)
+    return {
+        "config": {
+            "league": league, "teams": len(files), "games": games, "events": events,
+            "players": players, "roster": roster,
+        },
+        "fixture_seconds": fixture_s,
+        "pbp_files": sum(len(p) for p in files.values()),
+        "profiles_rendered": len(loaded),
+        "stages": stages,
+    }
+
+
+def _baseline_key(config: dict[str, Any]) -> str:
+    return (
+        f"{config['league']}-{config['teams']}x{config['games']}"
+        f"-e{config['events']}-p{config['players']}-r{config['roster']}"
+    )
+
+
+def _load_baselines() -> dict[str, Any]:
+    try:
+        return json.loads(BASELINES.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark card pipeline stages on synthetic PBP")
+    parser.add_argument("--league", default="nhl", choices=["nhl", "pwhl"])
+    parser.add_argument("--teams", type=int, default=4, help="Teams in the synthetic league")
+    parser.add_argument("--games", type=int, default=4, help="Games per team")
+    parser.add_argument("--events", type=int, default=800, help="Play events per game (shifts come on top)")
+    parser.add_argument("--players", type=int, default=2, help="Players per team aggregated/loaded/rendered")
+    parser.add_argument("--roster", type=int, default=8, help="Skaters per team ranked in the build_store stage")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown vs baseline (0.5 = 50%%)")
+    parser.add_argument(
+        "--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this (timer noise)"
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Exit 1 when a stage regresses")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = run(
+        league=args.league,
+        teams=args.teams,
+        games=args.games,
+        events=args.events,
+        players=args.players,
+        roster=args.roster,
+        repeat=args.repeat,
+        seed=args.seed,
+    )
+    key = _baseline_key(result["config"])
+    baselines = _load_baselines()
+    base = (baselines.get(key) or {}).get("stages") or {}
+    regressions = [
+        stage for stage, ms in result["stages"].items()
+        if base.get(stage) and ms > base[stage] * (1 + args.tolerance) and ms - base[stage] > args.min_delta_ms
+    ]
+    result["baseline"] = key if base else None
+    result["regressions"] = regressions
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{key}: {result['pbp_files']} PBP files (fixtures {result['fixture_seconds']}s)")
+        for stage in STAGES:
+            ms = result["stages"][stage]
+            ref = base.get(stage)
+            delta = f"{(ms / ref - 1) * 100:+6.1f}% vs {ref:.1f} ms" if ref else "no baseline"
+            flag = "  REGRESSION" if stage in regressions else ""
+            print(f"  {stage:<15} {ms:>9.1f} ms   {delta}{flag}")
+
+    if args.save_baseline:
+        baselines[key] = {
+            "stages": result["stages"],
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "saved": date.today().isoformat(),
+        }
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Saved baseline {key} -> {BASELINES.name}")
+    if args.check and regressions:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Cold-start import budget for the player_cards CLI and API entry points.
+
+Each target runs in a fresh interpreter under ``-X importtime``. The script
+reports wall time (best of ``--repeat``) and the slowest imports by cumulative
+time. It fails when a target runs over its budget or loads a module from the
+heavy PBP/render stack (pandas, numpy, PIL, ...) that should load only once a
+card is actually built.
+
+    python scripts/import_budget.py            # table + top imports
+    python scripts/import_budget.py --json     # machine-readable
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that must not load before a card build needs them.
+HEAVY = ("pandas", "numpy", "PIL", "bs4", "playwright", "matplotlib")
+
+# name -> (python snippet, budget in ms of wall time above a bare interpreter)
+TARGETS: dict[str, tuple[str, float]] = {
+    "cli": ("import player_cards.__main__", 150.0),
+    "api": ("import player_cards.server", 900.0),
+    # Store-only requests (/status, /players/search) on a cold process.
+    "status_search": (
+        "from player_cards import service\n"
+        "service.store_status()\n"
+        "service.search_players('mc', limit=5)",
+        500.0,
+    ),
+}
+
+_PROBE = "\nimport sys\nprint(','.join(m for m in {heavy!r} if m in sys.modules))"
+
+
+def _run(code: str, env: dict[str, str]) -> tuple[float, str, str]:
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+    return elapsed, proc.stdout, proc.stderr
+
+
+def _imports(importtime: str) -> list[tuple[str, float]]:
+    """(module, cumulative ms) rows of ``-X importtime`` output."""
+    rows: list[tuple[str, float]] = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(cumulative) / 1000))
+    return rows
+
+
+def _top_imports(importtime: str, top: int, *, skip: set[str]) -> list[tuple[str, float]]:
+    """Slowest packages (player_cards modules individually) not already in ``skip``."""
+    best: dict[str, float] = {}
+    for name, ms in _imports(importtime):
+        if name in skip or name == "player_cards":
+            continue
+        key = name if name.startswith("player_cards.") else name.split(".")[0]
+        best[key] = max(best.get(key, 0.0), ms)
+    return sorted(best.items(), key=lambda kv: -kv[1])[:top]
+
+
+def measure(repeat: int = 3, top: int = 8) -> list[dict[str, object]]:
+    # Isolated cache root so a missing or populated store doesn't skew timings.
+    with tempfile.TemporaryDirectory(prefix="import-budget-") as home:
+        env = {
+            **os.environ,
+            "HOME": home,
+            "PLAYER_CARDS_STORE": str(Path(home) / "card_store.db"),
+            "PYTHONPATH": str(ROOT),
+        }
+        bare = [_run("pass", env) for _ in range(repeat)]
+        baseline = min(r[0] for r in bare)
+        preloaded = {name for name, _ms in _imports(bare[0][2])}
+        results: list[dict[str, object]] = []
+        for name, (code, budget) in TARGETS.items():
+            runs = [_run(code + _PROBE.format(heavy=HEAVY), env) for _ in range(repeat)]
+            elapsed, stdout, importtime = min(runs, key=lambda r: r[0])
+            ms = round(elapsed - baseline, 1)
+            heavy = [m for m in stdout.strip().splitlines()[-1].split(",") if m] if stdout.strip() else []
+            results.append(
+                {
+                    "target": name,
+                    "ms": ms,
+                    "budget_ms": budget,
+                    "heavy_modules": heavy,
+                    "ok": ms <= budget and not heavy,
+                    "top_imports": _top_imports(importtime, top, skip=preloaded),
+                }
+            )
+    return results
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Check player_cards cold-start import budgets")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per target (best is kept)")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list per target")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = measure(repeat=args.repeat, top=args.top)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            flag = "ok" if r["ok"] else "OVER"
+            print(f"{r['target']:<14} {r['ms']:>7.1f} ms / {r['budget_ms']:.0f} ms  {flag}")
+            if r["heavy_modules"]:
+                print(f"  heavy imports loaded: {', '.join(r['heavy_modules'])}")
+            for mod, ms in r["top_imports"]:
+                print(f"    {mod:<28} {ms:>7.1f} ms")
+    if not all(r["ok"] for r in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
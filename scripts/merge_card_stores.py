@@ -5,8 +5,14 @@ from __future__ import annotations
 
 import argparse
 import sqlite3
+import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from player_cards.card_store import _SCHEMA  # noqa: E402
+
 
 def merge_stores(target: Path, sources: list[Path]) -> dict[str, int]:
     target.parent.mkdir(parents=True, exist_ok=True)
@@ -25,6 +31,8 @@ def merge_stores(target: Path, sources: list[Path]) -> dict[str, int]:
             backup = sqlite3.connect(src)
             backup.backup(main)
             backup.close()
+            # Shards built before newer tables existed.
+            main.executescript(_SCHEMA)
             first = False
         else:
             main.execute("ATTACH DATABASE ? AS shard", (str(src.resolve()),))
@@ -33,6 +41,12 @@ def merge_stores(target: Path, sources: list[Path]) -> dict[str, int]:
                     f"INSERT OR REPLACE INTO {table} SELECT * FROM shard.{table}"
                 )
             main.execute("INSERT OR IGNORE INTO meta SELECT * FROM shard.meta")
+            if main.execute(
+                "SELECT 1 FROM shard.sqlite_master WHERE type = 'table' AND name = 'percentiles'"
+            ).fetchone():
+                main.execute(
+                    "INSERT OR REPLACE INTO percentiles SELECT * FROM shard.percentiles"
+                )
             main.commit()
             main.execute("DETACH DATABASE shard")
 